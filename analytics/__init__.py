@@ -0,0 +1,9 @@
+"""
+Tender analytics shared by connectors, the store and dashboards
+"""
+from .aggregates import TenderAggregates, aggregate, aggregate_sql
+from .downsample import DOWNSAMPLE_METHODS, downsample
+from .table import CATEGORY_COLUMNS, as_datetimes, days_until, tender_table
+
+__all__ = ['TenderAggregates', 'aggregate', 'aggregate_sql', 'DOWNSAMPLE_METHODS', 'downsample',
+           'CATEGORY_COLUMNS', 'as_datetimes', 'days_until', 'tender_table']
@@ -0,0 +1,252 @@
+"""
+Single-pass aggregation engine
+Computes every dashboard KPI and group-by once and hands the result to all consumers
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .table import as_datetimes
+
+
+# Group-by dimensions used by statistics and dashboard charts
+DIMENSIONS = ('country_name', 'cpv_description', 'published_date', 'procedure_type')
+
+# Contract values are binned on a log scale, BINS_PER_DECADE bins per power
+# of ten from 10**VALUE_LOG_MIN to 10**VALUE_LOG_MAX EUR; values outside
+# land in the first or last bin
+VALUE_LOG_MIN = 3
+VALUE_LOG_MAX = 10
+BINS_PER_DECADE = 8
+VALUE_BINS = (VALUE_LOG_MAX - VALUE_LOG_MIN) * BINS_PER_DECADE
+VALUE_BIN_EDGES = np.logspace(VALUE_LOG_MIN, VALUE_LOG_MAX, VALUE_BINS + 1)
+
+
+def value_bins(values: np.ndarray) -> np.ndarray:
+    """Histogram bin index for each value (NaN in, -1 out)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bins = np.floor((np.log10(np.maximum(values, 1.0)) - VALUE_LOG_MIN) * BINS_PER_DECADE)
+    return np.where(np.isnan(values), -1, np.clip(bins, 0, VALUE_BINS - 1)).astype(np.int64)
+
+
+def value_bin_sql(column: str) -> str:
+    """SQL expression equivalent to value_bins (NULL in, NULL out)"""
+    # DuckDB's greatest() skips NULLs, so they must be kept out explicitly
+    return (f"CASE WHEN {column} IS NOT NULL THEN "
+            f"CAST(least(greatest(floor((log10(greatest({column}, 1)) - {VALUE_LOG_MIN}) "
+            f"* {BINS_PER_DECADE}), 0), {VALUE_BINS - 1}) AS INTEGER) END")
+
+
+def histogram_frame(counts: np.ndarray) -> pd.DataFrame:
+    """Per-bin counts with their EUR bounds"""
+    return pd.DataFrame({
+        'low': VALUE_BIN_EDGES[:-1],
+        'high': VALUE_BIN_EDGES[1:],
+        'count': np.asarray(counts, dtype=np.int64)
+    })
+
+
+@dataclass
+class TenderAggregates:
+    """
+    Totals plus per-dimension counts and value sums for a set of tenders
+
+    groups maps each of DIMENSIONS to a frame with columns
+    [dimension, 'count', 'value']; published_date keys are Timestamps
+    sorted by day, the others are in no particular order. Sources that do
+    not track a dimension (e.g. the rollup cube and procedure_type) leave
+    it out. histogram holds log-scale value bins (see histogram_frame).
+    """
+    total_tenders: int = 0
+    total_value: float = 0.0
+    min_value: float = float('nan')
+    max_value: float = float('nan')
+    valued_tenders: int = 0
+    countries: int = 0
+    groups: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    histogram: Optional[pd.DataFrame] = None
+
+    @property
+    def average_value(self) -> float:
+        return self.total_value / self.valued_tenders if self.valued_tenders else float('nan')
+
+    def by(self, dimension: str, sort: Optional[str] = 'count', top: Optional[int] = None) -> pd.DataFrame:
+        """
+        One dimension's groups
+
+        Args:
+            dimension: One of DIMENSIONS
+            sort: 'count' or 'value' (descending), or None to keep the
+                natural order (chronological for published_date)
+            top: Keep only the first rows after sorting
+        """
+        frame = self.groups.get(dimension, pd.DataFrame(columns=[dimension, 'count', 'value']))
+        if sort:
+            # Ties broken by key so every engine returns the same order
+            frame = frame.sort_values([sort, dimension], ascending=[False, True])
+        if top:
+            frame = frame.head(top)
+        return frame.reset_index(drop=True)
+
+    def statistics(self) -> Dict:
+        """Summary in the shape returned by ProcurementConnector.get_statistics"""
+        if self.total_tenders == 0:
+            return {}
+
+        top_countries = self.by('country_name', sort='value', top=5)
+        top_categories = self.by('cpv_description', sort='count', top=5)
+        return {
+            'total_tenders': int(self.total_tenders),
+            'total_value': float(self.total_value),
+            'average_value': float(self.average_value),
+            'min_value': float(self.min_value),
+            'max_value': float(self.max_value),
+            'countries': int(self.countries),
+            'top_countries': {str(k): float(v) for k, v in zip(top_countries['country_name'], top_countries['value'])},
+            'top_categories': {str(k): int(v) for k, v in zip(top_categories['cpv_description'], top_categories['count'])}
+        }
+
+
+def _codes(column: pd.Series):
+    """Integer codes (-1 for missing) and their distinct values"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    return pd.factorize(column)
+
+
+def _group(column: pd.Series, weights: np.ndarray) -> pd.DataFrame:
+    """Counts and value sums per distinct value via np.bincount"""
+    codes, uniques = _codes(column)
+    keep = codes >= 0
+    codes = codes[keep]
+    counts = np.bincount(codes, minlength=len(uniques))
+    sums = np.bincount(codes, weights=weights[keep], minlength=len(uniques))
+    frame = pd.DataFrame({column.name: uniques, 'count': counts, 'value': sums})
+    return frame[frame['count'] > 0]
+
+
+def fold_days(frame: pd.DataFrame) -> pd.DataFrame:
+    """Fold date keys onto calendar days, parsing each distinct value once"""
+    frame = frame.assign(published_date=as_datetimes(frame['published_date']).dt.normalize())
+    frame = frame.dropna(subset=['published_date'])
+    return frame.groupby('published_date', as_index=False, sort=True)[['count', 'value']].sum()
+
+
+def aggregate(tenders: pd.DataFrame, engine: str = 'numpy') -> TenderAggregates:
+    """
+    Aggregate a tender frame in one scan per dimension
+
+    The frame is only read, never modified. Dates may be strings or
+    datetimes; only their distinct values are parsed.
+
+    Args:
+        tenders: Frame in the connector schema
+        engine: 'numpy' (bincount over factorized or categorical codes) or
+            'duckdb' (one GROUPING SETS query)
+    """
+    if engine == 'duckdb':
+        # DuckDB scans Arrow zero-copy but converts pandas string columns
+        # on every pass, so hand it just the needed columns as Arrow
+        columns = [c for c in ('country', 'value_eur') + DIMENSIONS if c in tenders]
+        connection = duckdb.connect()
+        try:
+            connection.register('tenders_frame', pa.Table.from_pandas(tenders[columns], preserve_index=False))
+            return aggregate_sql(connection, 'tenders_frame')
+        finally:
+            connection.close()
+    if engine != 'numpy':
+        raise ValueError(f"Unknown aggregation engine: {engine}")
+
+    if tenders is None or len(tenders) == 0:
+        return TenderAggregates()
+
+    values = pd.to_numeric(tenders['value_eur'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    valued = ~np.isnan(values)
+    weights = np.where(valued, values, 0.0)
+
+    groups = {dimension: _group(tenders[dimension], weights) for dimension in DIMENSIONS if dimension in tenders}
+    if 'published_date' in groups:
+        groups['published_date'] = fold_days(groups['published_date'])
+
+    bins = value_bins(values)
+    histogram = histogram_frame(np.bincount(bins[bins >= 0], minlength=VALUE_BINS))
+
+    return TenderAggregates(
+        total_tenders=len(tenders),
+        total_value=float(weights.sum()),
+        min_value=float(values[valued].min()) if valued.any() else float('nan'),
+        max_value=float(values[valued].max()) if valued.any() else float('nan'),
+        valued_tenders=int(valued.sum()),
+        countries=int(tenders['country'].nunique()) if 'country' in tenders else 0,
+        groups=groups,
+        histogram=histogram
+    )
+
+
+def aggregate_sql(cursor: duckdb.DuckDBPyConnection, source: str, where: str = '',
+                  params: Optional[List] = None) -> TenderAggregates:
+    """
+    Aggregate a DuckDB table or registered frame in a single query
+
+    Args:
+        cursor: DuckDB connection or cursor
+        source: Table or view name
+        where: Optional ' WHERE ...' clause (see query.compile_sql)
+        params: Parameters for where
+    """
+    dimensions = ', '.join(DIMENSIONS)
+    rows = cursor.execute(f"""
+        WITH src AS (
+            SELECT country, country_name, cpv_description, procedure_type,
+                   TRY_CAST(published_date AS DATE) AS published_date,
+                   TRY_CAST(value_eur AS DOUBLE) AS value_eur
+            FROM {source}{where}
+        )
+        SELECT {dimensions},
+               GROUPING({dimensions}) AS grouping_id,
+               count(*), coalesce(sum(value_eur), 0), count(value_eur),
+               min(value_eur), max(value_eur), count(DISTINCT country)
+        FROM src
+        GROUP BY GROUPING SETS ({', '.join(f'({d})' for d in DIMENSIONS)}, ())
+    """, params or []).fetchall()
+
+    result = TenderAggregates()
+    grouped = {dimension: [] for dimension in DIMENSIONS}
+    # GROUPING() sets a bit for every dimension not grouped on
+    full_mask = (1 << len(DIMENSIONS)) - 1
+    for row in rows:
+        keys, grouping_id = row[:len(DIMENSIONS)], row[len(DIMENSIONS)]
+        count, total, valued, minimum, maximum, countries = row[len(DIMENSIONS) + 1:]
+        if grouping_id == full_mask:
+            if count:
+                result = TenderAggregates(
+                    total_tenders=count, total_value=float(total),
+                    min_value=float('nan') if minimum is None else float(minimum),
+                    max_value=float('nan') if maximum is None else float(maximum),
+                    valued_tenders=valued, countries=countries
+                )
+            continue
+        for position, dimension in enumerate(DIMENSIONS):
+            if not grouping_id & (1 << (len(DIMENSIONS) - 1 - position)) and keys[position] is not None:
+                grouped[dimension].append((keys[position], count, float(total)))
+
+    if result.total_tenders:
+        result.groups = {
+            # Sorted by key so equal data always yields equal frames
+            dimension: pd.DataFrame(sorted(entries, key=lambda e: str(e[0])), columns=[dimension, 'count', 'value'])
+            for dimension, entries in grouped.items()
+        }
+        result.groups['published_date'] = fold_days(result.groups['published_date'])
+        counts = np.zeros(VALUE_BINS, dtype=np.int64)
+        for bin_index, count in cursor.execute(f"""
+            SELECT {value_bin_sql('TRY_CAST(value_eur AS DOUBLE)')} AS bin, count(*)
+            FROM {source}{where}
+            GROUP BY bin HAVING bin IS NOT NULL
+        """, params or []).fetchall():
+            counts[bin_index] = count
+        result.histogram = histogram_frame(counts)
+    return result
@@ -0,0 +1,66 @@
+"""
+Typed tender table for the dashboard pipeline
+Dates are parsed and dimensions categorized once, then the frame is only read
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Columns held as pandas categoricals: few distinct values, many rows
+CATEGORY_COLUMNS = ('country', 'country_name', 'cpv_code', 'cpv_description',
+                    'procedure_type', 'currency', 'source')
+
+DATE_COLUMNS = ('published_date', 'deadline')
+
+
+def as_datetimes(column: pd.Series) -> pd.Series:
+    """
+    Dates as datetime64, from strings, dates or integer day offsets
+    since 1970-01-01 (the compact tender representation)
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    if pd.api.types.is_integer_dtype(column):
+        days = column.to_numpy(dtype='float64', na_value=np.nan)
+        return pd.Series(pd.to_datetime(days, unit='D'), index=column.index, name=column.name)
+    # Parse each distinct value once; tender dates repeat heavily
+    codes, uniques = pd.factorize(column)
+    # A trailing NaT is what the -1 codes of missing values pick up
+    parsed = pd.to_datetime(pd.Series([*uniques, None], dtype=object), format='mixed', errors='coerce')
+    return pd.Series(parsed.to_numpy()[codes], index=column.index, name=column.name)
+
+
+def tender_table(tenders: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Typed, read-only view of a tender frame
+
+    published_date and deadline become datetime64, value_eur float64 and
+    the CATEGORY_COLUMNS categoricals. Columns already typed are reused
+    as-is, so calling this on its own output returns it unchanged. The
+    input is never modified. Untyped columns are shared with it, which is
+    safe because pandas >= 3 always copies on write: writing to either
+    frame (or anything derived from them) never shows up in the other.
+    """
+    if tenders is None:
+        return pd.DataFrame()
+    typed = {}
+    for name in tenders.columns:
+        column = tenders[name]
+        if name in DATE_COLUMNS and not pd.api.types.is_datetime64_any_dtype(column):
+            typed[name] = as_datetimes(column)
+        elif name == 'value_eur' and column.dtype != 'float64':
+            typed[name] = pd.to_numeric(column, errors='coerce').astype('float64')
+        elif name in CATEGORY_COLUMNS and not isinstance(column.dtype, pd.CategoricalDtype):
+            typed[name] = column.astype('category')
+    if not typed:
+        return tenders
+    # Copy-on-write: untouched columns stay shared with the input
+    return tenders.assign(**typed)
+
+
+def days_until(dates: pd.Series, today: Optional[pd.Timestamp] = None) -> pd.Series:
+    """Whole days from today until each date (negative once passed)"""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    return (as_datetimes(dates) - today).dt.days
@@ -3,18 +3,18 @@ Procurement Intelligence Platform - Main Application
 FastAPI web server for procurement analytics dashboards
 """
 from fastapi import FastAPI, Query, Request, Depends, HTTPException, status
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import sys
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
-import jwt
+from datetime import timedelta
+import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-import httpx
 
 # Load environment variables
 load_dotenv()
@@ -22,10 +22,28 @@ load_dotenv()
 # Add connectors to path
 sys.path.append(str(Path(__file__).parent))
 
-from connectors.ted_eu import TEDConnector
+from config import load_config
+from connectors.http import create_http_client
+from connectors.registry import ConnectorRegistry, FederatedConnector
+from connectors.sync import TenderSync
+from analytics import TenderAggregates, tender_table
+from auth import (
+    ClientThrottled, CurrentUser, GoogleOAuth, GoogleOAuthError, HashingRejected, InvalidToken,
+    PasswordHasher, TokenVerifier, TrustedProxies, request_token
+)
+from storage.locks import FileLock
+from storage.tender_store import TenderStore
+from storage.favorites import SQLiteFavoriteStore
+from storage.users import SQLiteUserStore, User
+from storage.export import EXPORT_FORMATS, iter_export
 from dashboards.generator import DashboardGenerator
-from dashboards.powerbi_layout import PowerBIDashboard
-from user_dashboard import UserDashboard, add_favorite, remove_favorite, get_favorites
+from dashboards.assets import (
+    PLOTLY_BUNDLE_PATH, PLOTLY_BUNDLE_URL, IMMUTABLE_CACHE_CONTROL, PLOTLY_VERSION,
+    STATIC_DIR, STATIC_URL, TEMPLATE_DIR, StaticAssets, directory_digest, page_environment
+)
+from dashboards.render_cache import RenderCache, fingerprint
+from dashboards.render_pool import RenderPool, RenderRejected, RenderTimeout
+from dashboards.powerbi_layout import TABS, PowerBIDashboard
 from user_dashboard_enhanced import generate_enhanced_dashboard
 
 # Configuration
@@ -44,13 +62,39 @@ else:
     # Local development
     GOOGLE_REDIRECT_URI = "http://localhost:8002/auth/google/callback"
 
+google_oauth = GoogleOAuth(GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, GOOGLE_REDIRECT_URI)
+
 print(f"Google OAuth Redirect URI: {GOOGLE_REDIRECT_URI}")
-print(f"Google OAuth Configured: {bool(GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET)}")
+print(f"Google OAuth Configured: {google_oauth.configured}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    # One pooled client for every outbound call (connectors, Google OAuth)
+    app.state.http_client = create_http_client(**config.get('http', {}))
+    registry.use_client(app.state.http_client)
+    if sync_config.get('enabled', True):
+        for tender_sync in tender_syncs.values():
+            tender_sync.start()
+    yield
+    for tender_sync in tender_syncs.values():
+        await tender_sync.stop()
+    # Release pooled upstream connections
+    await registry.aclose()
+    await app.state.http_client.aclose()
+    render_pool.shutdown()
+    password_hasher.shutdown()
+    tender_store.close()
+    user_store.close()
+    favorite_store.close()
+
 
 app = FastAPI(
     title="Procurement Intelligence Platform",
     description="Multi-source government procurement analytics with AI insights",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for API access
@@ -62,24 +106,222 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Dashboard pages, figure JSON and the Plotly bundle compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files from _site directory (if it exists)
 site_libs_path = Path(__file__).parent / "site" / "_site" / "site_libs"
 if site_libs_path.exists():
     app.mount("/site_libs", StaticFiles(directory="site/_site/site_libs"), name="site_libs")
 
 # Initialize connectors
-ted_connector = TEDConnector()
-dashboard_gen = DashboardGenerator()
-powerbi_dashboard = PowerBIDashboard()
+config = load_config()
+storage_config = config.get('storage', {})
+sync_config = config.get('sync', {})
+
+# Local DuckDB warehouse answering searches and statistics
+tender_store = TenderStore(
+    Path(__file__).parent / storage_config.get('directory', 'data') / storage_config.get('tenders_db', 'tenders.duckdb')
+)
+
+# Every enabled source from config.yml, each behind its on-disk cache.
+# Set TED_LIVE_API=1 to query the live APIs instead of sample data.
+registry = ConnectorRegistry.from_config(
+    config,
+    store=tender_store,
+    live=os.getenv("TED_LIVE_API", "").lower() in ("1", "true", "yes"),
+    base_dir=Path(__file__).parent
+)
+
+# Searches fan out to all sources concurrently
+tender_source = FederatedConnector(registry, store=tender_store)
+
+# Background delta sync into the store per source (bypasses the cache on purpose).
+# Every worker process starts one; the worker holding the source's lock file runs it.
+tender_syncs = {
+    name: TenderSync(
+        connector,
+        tender_store,
+        interval_minutes=sync_config.get('interval_minutes', 30),
+        overlap_days=sync_config.get('overlap_days', 1),
+        initial_days=sync_config.get('initial_days', 30),
+        batch_limit=sync_config.get('batch_limit', 1000),
+        leader_lock=FileLock(f"{tender_store.path}.sync-{name}.lock")
+    )
+    for name, connector in registry.sources.items()
+}
+
+# Rendered charts and pages, keyed by a content hash of their tenders
+render_cache = RenderCache(
+    max_bytes=int(config.get('cache', {}).get('render_max_size_mb', 64) * 1024 * 1024)
+)
+# Page templates are compiled once per process; their CSS and JS are
+# separate, fingerprinted static files
+static_assets = StaticAssets(STATIC_DIR)
+templates = Jinja2Templates(env=page_environment(static_assets))
+
+# Part of every page ETag, so a deploy never revalidates an old page
+RENDER_VERSION = (f"{config.get('app', {}).get('version', '')}-{PLOTLY_VERSION}"
+                  f"-{directory_digest(TEMPLATE_DIR, STATIC_DIR)}")
+dashboard_config = config.get('dashboards', {})
+dashboard_gen = DashboardGenerator(
+    cache=render_cache,
+    max_points=dashboard_config.get('max_points', 500),
+    downsample_method=dashboard_config.get('downsample_method', 'lttb')
+)
+powerbi_dashboard = PowerBIDashboard(generator=dashboard_gen, cache=render_cache)
+
+# Dashboards are built on these threads so one heavy page never stalls
+# the event loop; beyond render_queue waiting renders requests get a 503
+render_pool = RenderPool(
+    workers=dashboard_config.get('render_workers'),
+    max_queue=dashboard_config.get('render_queue', 32),
+    timeout=dashboard_config.get('render_timeout_seconds', 30.0)
+)
+
+# Session tokens; recently verified ones are cached until they expire
+# (at most token_cache_seconds), so page loads skip the HMAC check
+auth_config = config.get('auth', {})
+token_verifier = TokenVerifier(
+    SECRET_KEY, ALGORITHM,
+    lifetime=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    max_entries=auth_config.get('token_cache_size', 10_000),
+    cache_seconds=auth_config.get('token_cache_seconds', 300)
+)
+
+# Per-client limits key on the real client, not the reverse proxy in front
+trusted_proxies = TrustedProxies(auth_config.get('trusted_proxies', []))
+
+# bcrypt runs on its own threads, one per core, so a burst of logins
+# never blocks the event loop; raising bcrypt_rounds rehashes each
+# account on its next login
+password_hasher = PasswordHasher(
+    rounds=auth_config.get('bcrypt_rounds', 12),
+    workers=auth_config.get('hash_workers'),
+    max_pending=auth_config.get('hash_max_pending', 64),
+    per_client=auth_config.get('hash_per_client', 2)
+)
+
+# Accounts and their favorites, in a SQLite file every worker process shares
+users_db_path = Path(__file__).parent / storage_config.get('directory', 'data') / storage_config.get('users_db', 'users.sqlite3')
+user_store = SQLiteUserStore(users_db_path, pool_size=storage_config.get('users_pool_size', 4))
+favorite_store = SQLiteFavoriteStore(users_db_path, pool_size=storage_config.get('users_pool_size', 4))
+
+
+def cached_page(request: Request, data, *key_parts, media_type: str = 'text/html'):
+    """
+    Look up a dashboard page (or a tab's chart JSON) by the content of the
+    tenders (or their aggregates) it shows
+    
+    Returns:
+        (etag, response) where response is a 304 when the client already
+        has this version, the cached page when another client rendered
+        it, or None when the page has to be rendered
+    """
+    etag = f'"{fingerprint(data, request.url.path, RENDER_VERSION, *key_parts)}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(',')):
+        return etag, Response(status_code=304, headers=headers)
+    
+    html = render_cache.get(etag)
+    if html is not None:
+        return etag, Response(html, media_type=media_type, headers=headers)
+    return etag, None
 
-# Security
-security = HTTPBearer()
 
-# In-memory storage (replace with database in production)
-users_db = {}
+def render_page(name: str, **context) -> str:
+    """Render one of the compiled page templates to a string"""
+    return templates.get_template(name).render(**context)
+
+
+# create_tender_overview KPI keys, in display order
+DASHBOARD_KPIS = ('total_tenders', 'total_value', 'average_value')
+
+
+def render_dashboard(source, title: str, icon: str, subtitle: str,
+                     kpi_labels: tuple, charts: tuple) -> str:
+    """
+    Build the tender overview of source and render it with the shared
+    dashboard.html; CPU-bound, so routes run it on render_pool
+    
+    Args:
+        source: TenderAggregates, or a tender frame to aggregate
+        kpi_labels: Labels for DASHBOARD_KPIS
+        charts: Keys of dashboard['charts'] to show, in order
+    """
+    if isinstance(source, TenderAggregates):
+        dashboard = dashboard_gen.create_tender_overview(aggregates=source)
+    else:
+        dashboard = dashboard_gen.create_tender_overview(source)
+    kpis, chart_html = [], []
+    if 'error' not in dashboard:
+        kpis = [(dashboard['kpis'][key], label) for key, label in zip(DASHBOARD_KPIS, kpi_labels)]
+        chart_html = [dashboard['charts'][name] for name in charts]
+    return render_page('dashboard.html', title=title, heading=f'{icon} {title}', subtitle=subtitle,
+                       kpis=kpis, charts=chart_html)
+
+
+def page_response(etag: str, html: str, media_type: str = 'text/html') -> Response:
+    """Cache a freshly rendered dashboard page and send it with its ETag"""
+    render_cache.put(etag, html)
+    return Response(html, media_type=media_type, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+
+async def current_user(request: Request, token: str = Query(None)) -> CurrentUser:
+    """
+    The signed-in user, from ?token= or a Bearer Authorization header
+    
+    Every protected route depends on this; failures raise InvalidToken,
+    which invalid_token answers the same way for all of them.
+    """
+    return token_verifier.verify(request_token(request, token))
+
+
+def client_address(request: Request) -> str:
+    return trusted_proxies.client_address(request)
+
+
+def hashing_rejected(exc: HashingRejected) -> JSONResponse:
+    """429 for a client over its own limit, 503 when the hasher is saturated"""
+    status_code = 429 if isinstance(exc, ClientThrottled) else 503
+    return JSONResponse({
+        'success': False,
+        'error': 'Too many login attempts, please retry in a moment'
+    }, status_code=status_code, headers={'Retry-After': '1'})
+
+
+async def load_aggregates(filters: dict):
+    """
+    Roll up the stored tenders matching filters for a dashboard
+    
+    The store is topped up from upstream first when it holds fewer than
+    filters['limit'] matches; the rollup itself covers every stored match
+    and is answered from the cube where the filters allow.
+    """
+    await top_up(filters)
+    rollup_filters = {k: v for k, v in filters.items() if k != 'limit'}
+    return await asyncio.to_thread(tender_store.aggregates, rollup_filters)
+
 
-# Templates
-templates = Jinja2Templates(directory="site")
+async def load_table(filters: dict):
+    """The newest filters['limit'] stored matches as a typed tender table"""
+    await top_up(filters)
+    return await asyncio.to_thread(tender_store.table, filters)
+
+
+async def top_up(filters: dict):
+    """Fetch from upstream when the store holds fewer than filters['limit'] matches"""
+    if await asyncio.to_thread(tender_store.count, filters) < filters.get('limit', 100):
+        await fetch_tenders(filters)
+
+
+async def fetch_tenders(filters: dict):
+    """Fetch tenders from upstream (through the cache) and ingest them locally"""
+    tenders = await tender_source.asearch_tenders(filters)
+    await asyncio.to_thread(tender_store.ingest, tenders)
+    return tenders
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -87,15 +329,11 @@ async def home(request: Request):
     """Homepage - redirect to dashboard if logged in, otherwise show landing page"""
     
     # Check if user is already logged in
-    auth_header = request.headers.get('Authorization')
-    if auth_header and auth_header.startswith('Bearer '):
-        token = auth_header.replace('Bearer ', '')
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            # User is logged in, redirect to dashboard
-            return RedirectResponse(url="/user/dashboard", status_code=302)
-        except:
-            pass  # Invalid token, show landing page
+    try:
+        token_verifier.verify(request_token(request))
+        return RedirectResponse(url="/user/dashboard", status_code=302)
+    except InvalidToken:
+        pass  # Invalid token, show landing page
     
     # Serve the Quarto-rendered index.html
     index_path = Path(__file__).parent / "site" / "_site" / "index.html"
@@ -138,8 +376,8 @@ async def report_page():
 async def google_config():
     """Return Google OAuth configuration"""
     return JSONResponse({
-        'client_id': GOOGLE_CLIENT_ID,
-        'configured': bool(GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET)
+        'client_id': google_oauth.client_id,
+        'configured': google_oauth.configured
     })
 
 
@@ -158,40 +396,45 @@ async def login(request: Request):
             }, status_code=400)
         
         # Check if user exists
-        if email not in users_db:
+        user = await asyncio.to_thread(user_store.get, email)
+        if user is None:
             return JSONResponse({
                 'success': False,
                 'error': 'Invalid email or password'
             }, status_code=401)
         
-        user = users_db[email]
-        
-        # Verify password - EXACT SAME AS EUROSTAT PROJECT
-        import bcrypt as bcrypt_lib
+        # Verify password off the event loop
+        valid, new_hash = False, None
+        if user.hashed_password:
+            valid, new_hash = await password_hasher.verify(
+                password, user.hashed_password, client=client_address(request)
+            )
         
-        if "hashed_password" not in user or not bcrypt_lib.checkpw(password.encode('utf-8'), user["hashed_password"].encode('utf-8')):
+        if not valid:
             return JSONResponse({
                 'success': False,
                 'error': 'Invalid email or password'
             }, status_code=401)
         
+        # Stored with an outdated cost factor
+        if new_hash:
+            await asyncio.to_thread(user_store.set_password_hash, user.email, new_hash)
+        
         # Create JWT token
-        token_payload = {
-            "email": email,
-            "username": user.get("username", email.split("@")[0]),
-            "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        }
-        token = jwt.encode(token_payload, SECRET_KEY, algorithm=ALGORITHM)
+        token = token_verifier.issue(user.email, user.username)
         
         return JSONResponse({
             'success': True,
             'token': token,
             'user': {
-                'email': email,
-                'username': user.get("username", email.split("@")[0])
+                'email': user.email,
+                'username': user.username
             }
         })
     
+    except HashingRejected as e:
+        return hashing_rejected(e)
+    
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -252,33 +495,23 @@ async def signup(request: Request):
             }, status_code=400)
         
         # Check if user already exists
-        if email in users_db:
-            return JSONResponse({
-                'success': False,
-                'error': 'You already have an account! Please login instead.'
-            }, status_code=400)
+        account_exists = JSONResponse({
+            'success': False,
+            'error': 'You already have an account! Please login instead.'
+        }, status_code=400)
+        if await asyncio.to_thread(user_store.get, email) is not None:
+            return account_exists
         
-        # Hash password - EXACT SAME AS EUROSTAT PROJECT
-        import bcrypt as bcrypt_lib
-        salt = bcrypt_lib.gensalt()
-        hashed_password = bcrypt_lib.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        # Hash password off the event loop
+        hashed_password = await password_hasher.hash(password, client=client_address(request))
         
-        # Create user
-        users_db[email] = {
-            "email": email,
-            "username": username,
-            "hashed_password": hashed_password,
-            "provider": "email",
-            "created_at": datetime.now().isoformat()
-        }
+        # Create user; the unique email index settles concurrent signups
+        user = User(email=email, username=username, hashed_password=hashed_password)
+        if not await asyncio.to_thread(user_store.create, user):
+            return account_exists
         
         # Create JWT token
-        token_payload = {
-            "email": email,
-            "username": username,
-            "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        }
-        token = jwt.encode(token_payload, SECRET_KEY, algorithm=ALGORITHM)
+        token = token_verifier.issue(email, username)
         
         return JSONResponse({
             'success': True,
@@ -289,6 +522,9 @@ async def signup(request: Request):
             }
         })
     
+    except HashingRejected as e:
+        return hashing_rejected(e)
+    
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -321,15 +557,63 @@ async def search_tenders(
         filters['max_value'] = max_value
     filters['limit'] = min(limit, 1000)
     
-    tenders = ted_connector.search_tenders(filters)
+    # Answer from the local store, topping it up from upstream when it is short
+    sources = None
+    if await asyncio.to_thread(tender_store.count, filters) < filters['limit']:
+        fetched, sources = await tender_source.asearch_with_status(filters)
+        await asyncio.to_thread(tender_store.ingest, fetched)
+    tenders = await asyncio.to_thread(tender_store.search, filters)
     
     return JSONResponse({
         'total': len(tenders),
         'filters': filters,
+        'sources': sources,
         'tenders': tenders.to_dict('records')
     })
 
 
+@app.get("/api/export")
+async def export_tenders(
+    format: str = Query('ndjson', description="ndjson, csv or arrow"),
+    country: str = Query(None, description="ISO 2-letter country code(s), comma-separated"),
+    cpv_code: str = Query(None, description="CPV code prefix(es), comma-separated"),
+    min_value: int = Query(None, description="Minimum tender value in EUR"),
+    max_value: int = Query(None, description="Maximum tender value in EUR"),
+    published_from: str = Query(None, description="Earliest publication date (YYYY-MM-DD)"),
+    published_to: str = Query(None, description="Latest publication date (YYYY-MM-DD)"),
+    keywords: str = Query(None),
+    limit: int = Query(None, description="Maximum rows (default: everything)")
+):
+    """
+    Stream matching tenders from the local store for bulk pulls
+    
+    Rows are encoded batch by batch as they come out of DuckDB, so memory
+    stays flat for million-row exports. Unlike /api/search there is no
+    row cap and no upstream top-up: the store is kept current by the
+    background sync. Rows are unordered unless a limit is given, in
+    which case the newest come first.
+    """
+    
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    
+    filters = {
+        key: value for key, value in {
+            'country': country, 'cpv_code': cpv_code,
+            'min_value': min_value, 'max_value': max_value,
+            'published_from': published_from, 'published_to': published_to,
+            'keywords': keywords, 'limit': limit
+        }.items() if value is not None
+    }
+    media_type, extension = EXPORT_FORMATS[format]
+    
+    return StreamingResponse(
+        iter_export(tender_store.iter_batches(filters), format, schema=tender_store.arrow_schema()),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="tenders.{extension}"'}
+    )
+
+
 @app.get("/api/stats")
 async def get_statistics(
     country: str = Query(None),
@@ -343,13 +627,82 @@ async def get_statistics(
     if cpv_code:
         filters['cpv_code'] = cpv_code
     
-    stats = ted_connector.get_statistics(filters)
+    stats = await tender_source.aget_statistics(filters)
     
     return JSONResponse(stats)
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Operational metrics"""
+    
+    return JSONResponse({
+        'sync': {
+            name: await asyncio.to_thread(tender_sync.status)
+            for name, tender_sync in tender_syncs.items()
+        },
+        'upstream': registry.transport.status() if registry.transport else {},
+        'render_cache': render_cache.status(),
+        'render_pool': render_pool.status(),
+        'password_hasher': password_hasher.status(),
+        'token_cache': token_verifier.status()
+    })
+
+
+@app.get("/api/health")
+async def health():
+    """Liveness probe; answered on the event loop, never behind a render"""
+    return JSONResponse({'status': 'ok', 'render_queue': render_pool.status()['queued']})
+
+
+@app.exception_handler(RenderRejected)
+async def render_rejected(request: Request, exc: RenderRejected):
+    """Render queue full: ask the client to come back shortly"""
+    return JSONResponse({'detail': 'Dashboards are busy, please retry'}, status_code=503,
+                        headers={'Retry-After': '1'})
+
+
+@app.exception_handler(InvalidToken)
+async def invalid_token(request: Request, exc: InvalidToken):
+    """401 for API calls; pages send the browser to the login page instead"""
+    if request.url.path.startswith('/api/'):
+        error = {'missing': 'Not authenticated', 'expired': 'Token expired'}.get(exc.reason, 'Invalid token')
+        return JSONResponse({'success': False, 'error': error}, status_code=401,
+                            headers={'WWW-Authenticate': 'Bearer'})
+    if exc.reason == 'missing':
+        return RedirectResponse(url="/login.html", status_code=302)
+    error = 'token_expired' if exc.reason == 'expired' else 'invalid_token'
+    return RedirectResponse(url=f"/login.html?error={error}", status_code=302)
+
+
+@app.exception_handler(RenderTimeout)
+async def render_timeout(request: Request, exc: RenderTimeout):
+    return JSONResponse({'detail': str(exc)}, status_code=504)
+
+
+@app.get(PLOTLY_BUNDLE_URL)
+async def plotly_bundle():
+    """Versioned Plotly.js bundle shared by every dashboard page"""
+    
+    return FileResponse(
+        PLOTLY_BUNDLE_PATH,
+        media_type='application/javascript',
+        headers={'Cache-Control': IMMUTABLE_CACHE_CONTROL}
+    )
+
+
+@app.get(STATIC_URL + "/{path:path}")
+async def static_asset(path: str):
+    """Fingerprinted page CSS/JS (see StaticAssets); cacheable forever"""
+    file_path = static_assets.resolve(path)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return FileResponse(file_path, headers={'Cache-Control': IMMUTABLE_CACHE_CONTROL})
+
+
 @app.get("/dashboard/tenders", response_class=HTMLResponse)
 async def tender_dashboard(
+    request: Request,
     country: str = Query(None),
     cpv_code: str = Query(None),
     limit: int = Query(100)
@@ -362,1145 +715,251 @@ async def tender_dashboard(
     if cpv_code:
         filters['cpv_code'] = cpv_code
     
-    tenders = ted_connector.search_tenders(filters)
-    dashboard = dashboard_gen.create_tender_overview(tenders)
+    aggregates = await load_aggregates(filters)
+    etag, cached = cached_page(request, aggregates, filters)
+    if cached is not None:
+        return cached
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Tender Overview Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .kpi-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .kpi-value {{
-                font-size: 2em;
-                font-weight: bold;
-                color: #667eea;
-            }}
-            .kpi-label {{
-                color: #666;
-                margin-top: 5px;
-            }}
-            .chart {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>📊 Tender Overview Dashboard</h1>
-            <p>EU Procurement Intelligence</p>
-            <a href="/user/dashboard" style="color: white;">← Back to My Dashboard</a>
-        </div>
-        
-        <div class="kpi-grid">
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_tenders']}</div>
-                <div class="kpi-label">Total Tenders</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_value']}</div>
-                <div class="kpi-label">Total Value</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['average_value']}</div>
-                <div class="kpi-label">Average Value</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['timeline']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['geography']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['value_dist']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['categories']}
-        </div>
-    </body>
-    </html>
-    """
+    html = await render_pool.run(
+        render_dashboard, aggregates, 'Tender Overview Dashboard', '📊', 'EU Procurement Intelligence',
+        kpi_labels=('Total Tenders', 'Total Value', 'Average Value'),
+        charts=('timeline', 'geography', 'value_dist', 'categories')
+    )
     
-    return html
+    return page_response(etag, html)
 
 
 @app.get("/dashboard/it-tenders", response_class=HTMLResponse)
-async def it_dashboard():
+async def it_dashboard(request: Request):
     """IT-specific tender dashboard"""
     
-    tenders = ted_connector.search_tenders({'cpv_code': '48', 'limit': 100})
-    dashboard = dashboard_gen.create_tender_overview(tenders)
+    aggregates = await load_aggregates({'cpv_code': '48', 'limit': 100})
+    etag, cached = cached_page(request, aggregates)
+    if cached is not None:
+        return cached
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>IT Tenders Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .kpi-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .kpi-value {{
-                font-size: 2em;
-                font-weight: bold;
-                color: #667eea;
-            }}
-            .kpi-label {{
-                color: #666;
-                margin-top: 5px;
-            }}
-            .chart {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>💻 IT Tenders Dashboard</h1>
-            <p>Software, Cloud Computing & IT Services</p>
-            <a href="/user/dashboard" style="color: white;">← Back to My Dashboard</a>
-        </div>
-        
-        <div class="kpi-grid">
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_tenders']}</div>
-                <div class="kpi-label">IT Tenders</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_value']}</div>
-                <div class="kpi-label">Total IT Spend</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['average_value']}</div>
-                <div class="kpi-label">Average Contract</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['timeline']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['geography']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['categories']}
-        </div>
-    </body>
-    </html>
-    """
+    html = await render_pool.run(
+        render_dashboard, aggregates, 'IT Tenders Dashboard', '💻', 'Software, Cloud Computing & IT Services',
+        kpi_labels=('IT Tenders', 'Total IT Spend', 'Average Contract'),
+        charts=('timeline', 'geography', 'categories')
+    )
     
-    return html
+    return page_response(etag, html)
 
 
 @app.get("/dashboard/countries", response_class=HTMLResponse)
-async def countries_dashboard():
+async def countries_dashboard(request: Request):
     """Geographic analysis dashboard"""
-    tenders = ted_connector.search_tenders({'limit': 100})
-    dashboard = dashboard_gen.create_tender_overview(tenders)
+    aggregates = await load_aggregates({'limit': 100})
+    etag, cached = cached_page(request, aggregates)
+    if cached is not None:
+        return cached
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Geographic Analysis Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .kpi-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .kpi-value {{
-                font-size: 2em;
-                font-weight: bold;
-                color: #667eea;
-            }}
-            .kpi-label {{
-                color: #666;
-                margin-top: 5px;
-            }}
-            .chart {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🌍 Geographic Analysis Dashboard</h1>
-            <p>Country & Regional Procurement Trends</p>
-            <a href="/user/dashboard" style="color: white;">← Back to My Dashboard</a>
-        </div>
-        
-        <div class="kpi-grid">
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_tenders']}</div>
-                <div class="kpi-label">Total Tenders</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_value']}</div>
-                <div class="kpi-label">Total Value</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['average_value']}</div>
-                <div class="kpi-label">Average Value</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['geography']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['categories']}
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    html = await render_pool.run(
+        render_dashboard, aggregates, 'Geographic Analysis Dashboard', '🌍', 'Country & Regional Procurement Trends',
+        kpi_labels=('Total Tenders', 'Total Value', 'Average Value'),
+        charts=('geography', 'categories')
+    )
+    return page_response(etag, html)
 
 
 @app.get("/dashboard/value-analysis", response_class=HTMLResponse)
-async def value_dashboard():
+async def value_dashboard(request: Request):
     """Value analysis dashboard"""
-    tenders = ted_connector.search_tenders({'limit': 100})
-    dashboard = dashboard_gen.create_tender_overview(tenders)
+    aggregates = await load_aggregates({'limit': 100})
+    etag, cached = cached_page(request, aggregates)
+    if cached is not None:
+        return cached
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Value Analysis Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .kpi-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .kpi-value {{
-                font-size: 2em;
-                font-weight: bold;
-                color: #667eea;
-            }}
-            .kpi-label {{
-                color: #666;
-                margin-top: 5px;
-            }}
-            .chart {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>💰 Value Analysis Dashboard</h1>
-            <p>Contract Value Trends & Distribution</p>
-            <a href="/user/dashboard" style="color: white;">← Back to My Dashboard</a>
-        </div>
-        
-        <div class="kpi-grid">
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_tenders']}</div>
-                <div class="kpi-label">Total Tenders</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_value']}</div>
-                <div class="kpi-label">Total Value</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['average_value']}</div>
-                <div class="kpi-label">Average Value</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['value_dist']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['timeline']}
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    html = await render_pool.run(
+        render_dashboard, aggregates, 'Value Analysis Dashboard', '💰', 'Contract Value Trends & Distribution',
+        kpi_labels=('Total Tenders', 'Total Value', 'Average Value'),
+        charts=('value_dist', 'timeline')
+    )
+    return page_response(etag, html)
 
 
 @app.get("/dashboard/awards", response_class=HTMLResponse)
-async def awards_dashboard():
+async def awards_dashboard(request: Request):
     """Award analytics dashboard"""
-    tenders = ted_connector.search_awards({'limit': 100})
-    dashboard = dashboard_gen.create_tender_overview(tenders)
+    # Typed once here; fingerprinting and every chart then only read it
+    tenders = tender_table(await tender_source.asearch_awards({'limit': 100}))
+    etag, cached = cached_page(request, tenders)
+    if cached is not None:
+        return cached
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Award Analytics Dashboard</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .kpi-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .kpi-value {{
-                font-size: 2em;
-                font-weight: bold;
-                color: #667eea;
-            }}
-            .kpi-label {{
-                color: #666;
-                margin-top: 5px;
-            }}
-            .chart {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🏆 Award Analytics Dashboard</h1>
-            <p>Contract Award Analysis & Winners</p>
-            <a href="/user/dashboard" style="color: white;">← Back to My Dashboard</a>
-        </div>
-        
-        <div class="kpi-grid">
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_tenders']}</div>
-                <div class="kpi-label">Total Awards</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['total_value']}</div>
-                <div class="kpi-label">Total Value</div>
-            </div>
-            <div class="kpi-card">
-                <div class="kpi-value">{dashboard['kpis']['average_value']}</div>
-                <div class="kpi-label">Average Award</div>
-            </div>
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['timeline']}
-        </div>
-        
-        <div class="chart">
-            {dashboard['charts']['categories']}
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    html = await render_pool.run(
+        render_dashboard, tenders, 'Award Analytics Dashboard', '🏆', 'Contract Award Analysis & Winners',
+        kpi_labels=('Total Awards', 'Total Value', 'Average Award'),
+        charts=('timeline', 'categories')
+    )
+    return page_response(etag, html)
+
+
+# Tenders behind the tabbed insights dashboard
+INSIGHTS_FILTERS = {'limit': 1000}
+
+
+@app.get("/dashboard/insights", response_class=HTMLResponse)
+async def insights_dashboard(request: Request, tab: str = Query('overview')):
+    """Tabbed dashboard; only the KPIs and the active tab are rendered up front"""
+    if tab not in TABS:
+        raise HTTPException(status_code=404, detail="Tab not found")
+    
+    tenders = await load_table(INSIGHTS_FILTERS)
+    etag, cached = cached_page(request, tenders, tab)
+    if cached is not None:
+        return cached
+    
+    html = await render_pool.run(
+        powerbi_dashboard.create_tab_dashboard,
+        tenders, 'Procurement Insights', active=tab, tab_url='/dashboard/insights/tabs/{tab}'
+    )
+    return page_response(etag, html)
+
+
+@app.get("/dashboard/insights/tabs/{tab}")
+async def insights_tab(request: Request, tab: str):
+    """Chart JSON of one insights tab, fetched when the tab is first opened"""
+    if tab not in TABS:
+        raise HTTPException(status_code=404, detail="Tab not found")
+    
+    tenders = await load_table(INSIGHTS_FILTERS)
+    etag, cached = cached_page(request, tenders, media_type='application/json')
+    if cached is not None:
+        return cached
+    
+    payload = await render_pool.run(powerbi_dashboard.create_tab, tenders, tab)
+    return page_response(etag, payload, media_type='application/json')
 
 
 @app.get("/report/{tender_id}", response_class=HTMLResponse)
-async def tender_report_page(request: Request, tender_id: str, token: str = Query(None)):
+async def tender_report_page(tender_id: str, user: CurrentUser = Depends(current_user)):
     """Individual tender report page"""
-    try:
-        # Get token from query parameter or Authorization header
-        jwt_token = None
-        if token:
-            jwt_token = token
-        else:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                jwt_token = auth_header.replace('Bearer ', '')
-        
-        if not jwt_token:
-            return RedirectResponse(url="/login.html", status_code=302)
-        
-        payload = jwt.decode(jwt_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
-        
-        # Sample tender data (replace with real database lookup)
-        tender_details = {
-            'id': tender_id,
-            'title': 'Cloud Infrastructure Services',
-            'description': 'Comprehensive cloud infrastructure setup and maintenance for government agency. Includes server setup, security implementation, and 24/7 support.',
-            'value': 145000,
-            'currency': 'EUR',
-            'country': 'Germany',
-            'deadline': '2024-03-15',
-            'published': '2024-02-01',
-            'cpv_code': '48',
-            'cpv_description': 'IT Services & Software',
-            'contracting_authority': 'Federal Ministry of Interior',
-            'procedure_type': 'Open Procedure',
-            'documents': ['Technical Specifications.pdf', 'Terms and Conditions.pdf'],
-        }
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Tender Report - {tender_details['id']}</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-            <style>
-                .gradient-bg {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
-            </style>
-        </head>
-        <body class="bg-gray-50">
-            <div class="gradient-bg text-white shadow-lg">
-                <div class="max-w-5xl mx-auto px-6 py-4">
-                    <div class="flex justify-between items-center">
-                        <div>
-                            <div class="text-sm opacity-90">Tender ID: {tender_details['id']}</div>
-                            <h1 class="text-2xl font-bold mt-1">{tender_details['title']}</h1>
-                        </div>
-                        <a href="/user/dashboard?token={jwt_token}" class="bg-white text-purple-600 px-4 py-2 rounded-lg hover:bg-purple-50">
-                            <i class="fas fa-arrow-left mr-2"></i>Back to Dashboard
-                        </a>
-                    </div>
-                </div>
-            </div>
-
-            <div class="max-w-5xl mx-auto px-6 py-8">
-                <!-- Key Info Cards -->
-                <div class="grid grid-cols-1 md:grid-cols-4 gap-6 mb-6">
-                    <div class="bg-white rounded-lg shadow-sm p-4">
-                        <div class="text-sm text-gray-600 mb-1">Value</div>
-                        <div class="text-2xl font-bold text-purple-600">€{tender_details['value']:,}</div>
-                    </div>
-                    <div class="bg-white rounded-lg shadow-sm p-4">
-                        <div class="text-sm text-gray-600 mb-1">Country</div>
-                        <div class="text-2xl font-bold text-gray-800">{tender_details['country']}</div>
-                    </div>
-                    <div class="bg-white rounded-lg shadow-sm p-4">
-                        <div class="text-sm text-gray-600 mb-1">Deadline</div>
-                        <div class="text-lg font-bold text-orange-600">{tender_details['deadline']}</div>
-                    </div>
-                    <div class="bg-white rounded-lg shadow-sm p-4">
-                        <div class="text-sm text-gray-600 mb-1">CPV Code</div>
-                        <div class="text-lg font-bold text-gray-800">{tender_details['cpv_code']}</div>
-                    </div>
-                </div>
-
-                <!-- Main Content -->
-                <div class="grid grid-cols-1 lg:grid-cols-3 gap-6">
-                    <div class="lg:col-span-2 space-y-6">
-                        <!-- Description -->
-                        <div class="bg-white rounded-lg shadow-sm p-6">
-                            <h2 class="text-lg font-bold mb-4">Description</h2>
-                            <p class="text-gray-700">{tender_details['description']}</p>
-                        </div>
-
-                        <!-- Details -->
-                        <div class="bg-white rounded-lg shadow-sm p-6">
-                            <h2 class="text-lg font-bold mb-4">Tender Details</h2>
-                            <div class="space-y-3">
-                                <div class="flex justify-between border-b pb-2">
-                                    <span class="text-gray-600">Contracting Authority</span>
-                                    <span class="font-semibold">{tender_details['contracting_authority']}</span>
-                                </div>
-                                <div class="flex justify-between border-b pb-2">
-                                    <span class="text-gray-600">Procedure Type</span>
-                                    <span class="font-semibold">{tender_details['procedure_type']}</span>
-                                </div>
-                                <div class="flex justify-between border-b pb-2">
-                                    <span class="text-gray-600">Published Date</span>
-                                    <span class="font-semibold">{tender_details['published']}</span>
-                                </div>
-                                <div class="flex justify-between border-b pb-2">
-                                    <span class="text-gray-600">CPV Description</span>
-                                    <span class="font-semibold">{tender_details['cpv_description']}</span>
-                                </div>
-                            </div>
-                        </div>
-
-                        <!-- Documents -->
-                        <div class="bg-white rounded-lg shadow-sm p-6">
-                            <h2 class="text-lg font-bold mb-4">Documents</h2>
-                            <div class="space-y-2">
-                                <div class="flex items-center justify-between p-3 border rounded-lg hover:bg-gray-50">
-                                    <div class="flex items-center gap-3">
-                                        <i class="fas fa-file-pdf text-red-500 text-2xl"></i>
-                                        <span>Technical Specifications.pdf</span>
-                                    </div>
-                                    <button class="text-purple-600 hover:text-purple-700">
-                                        <i class="fas fa-download"></i>
-                                    </button>
-                                </div>
-                                <div class="flex items-center justify-between p-3 border rounded-lg hover:bg-gray-50">
-                                    <div class="flex items-center gap-3">
-                                        <i class="fas fa-file-pdf text-red-500 text-2xl"></i>
-                                        <span>Terms and Conditions.pdf</span>
-                                    </div>
-                                    <button class="text-purple-600 hover:text-purple-700">
-                                        <i class="fas fa-download"></i>
-                                    </button>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Sidebar -->
-                    <div class="space-y-6">
-                        <!-- Actions -->
-                        <div class="bg-white rounded-lg shadow-sm p-6">
-                            <h3 class="font-bold mb-4">Quick Actions</h3>
-                            <div class="space-y-2">
-                                <button class="w-full gradient-bg text-white py-2 rounded-lg font-semibold hover:opacity-90">
-                                    <i class="fas fa-file-alt mr-2"></i>Prepare Bid
-                                </button>
-                                <button onclick="addToFavorites('{tender_details['id']}')" class="w-full border border-purple-600 text-purple-600 py-2 rounded-lg font-semibold hover:bg-purple-50">
-                                    <i class="fas fa-star mr-2"></i>Add to Favorites
-                                </button>
-                                <button onclick="setAlert('{tender_details['id']}')" class="w-full border border-gray-300 text-gray-700 py-2 rounded-lg font-semibold hover:bg-gray-50">
-                                    <i class="fas fa-bell mr-2"></i>Set Alert
-                                </button>
-                                <button class="w-full border border-gray-300 text-gray-700 py-2 rounded-lg font-semibold hover:bg-gray-50">
-                                    <i class="fas fa-share mr-2"></i>Share
-                                </button>
-                            </div>
-                        </div>
-
-                        <!-- Match Score -->
-                        <div class="bg-gradient-to-br from-green-500 to-green-600 text-white rounded-lg shadow-sm p-6">
-                            <h3 class="font-bold mb-2">Match Score</h3>
-                            <div class="text-5xl font-bold mb-2">92%</div>
-                            <p class="text-sm opacity-90">Perfect match for your profile!</p>
-                        </div>
-
-                        <!-- Competition -->
-                        <div class="bg-white rounded-lg shadow-sm p-6">
-                            <h3 class="font-bold mb-3">Competition Level</h3>
-                            <div class="flex items-center gap-2 mb-2">
-                                <span class="text-2xl">👥</span>
-                                <span class="text-xl font-bold">Low</span>
-                            </div>
-                            <div class="text-sm text-gray-600">Estimated 3-5 bidders</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <script>
-                function addToFavorites(tenderId) {{
-                    alert('Added to favorites!');
-                }}
-                function setAlert(tenderId) {{
-                    alert('Alert set for tender ' + tenderId);
-                }}
-            </script>
-        </body>
-        </html>
-        """
-        
-        return HTMLResponse(content=html)
-    
-    except jwt.ExpiredSignatureError:
-        return RedirectResponse(url="/login.html?error=token_expired", status_code=302)
-    except jwt.InvalidTokenError:
-        return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
+    # Sample tender data (replace with real database lookup)
+    tender_details = {
+        'id': tender_id,
+        'title': 'Cloud Infrastructure Services',
+        'description': 'Comprehensive cloud infrastructure setup and maintenance for government agency. Includes server setup, security implementation, and 24/7 support.',
+        'value': 145000,
+        'currency': 'EUR',
+        'country': 'Germany',
+        'deadline': '2024-03-15',
+        'published': '2024-02-01',
+        'cpv_code': '48',
+        'cpv_description': 'IT Services & Software',
+        'contracting_authority': 'Federal Ministry of Interior',
+        'procedure_type': 'Open Procedure',
+        'documents': ['Technical Specifications.pdf', 'Terms and Conditions.pdf'],
+    }
+    
+    html = render_page('report.html', tender=tender_details,
+                       back_url=f"/user/dashboard?token={user.token}")
+    
+    return HTMLResponse(content=html)
 
 
 @app.get("/user/dashboard", response_class=HTMLResponse)
-async def user_personal_dashboard(
-    request: Request,
-    token: str = Query(None)
-):
+async def user_personal_dashboard(user: CurrentUser = Depends(current_user)):
     """User's personal dashboard with favorites"""
     try:
-        # Try to get token from query parameter (for OAuth redirects) or Authorization header
-        jwt_token = None
-        
-        if token:
-            # Token from OAuth redirect URL
-            jwt_token = token
-        else:
-            # Try to get from Authorization header
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                jwt_token = auth_header.replace('Bearer ', '')
-        
-        if not jwt_token:
-            # No token provided, redirect to login
-            return RedirectResponse(url="/login.html", status_code=302)
-        
-        # Decode and validate token
-        payload = jwt.decode(jwt_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
-        
-        username = payload.get('username', email.split('@')[0])
-        
         # Use enhanced dashboard with all high-value features
-        return HTMLResponse(content=generate_enhanced_dashboard(email, username))
+        return HTMLResponse(content=generate_enhanced_dashboard(user.email, user.username))
     
-    except jwt.ExpiredSignatureError:
-        return RedirectResponse(url="/login.html?error=token_expired", status_code=302)
-    except jwt.InvalidTokenError:
-        # Catches all JWT-related errors (DecodeError, InvalidSignatureError, etc.)
-        return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
     except Exception as e:
         print(f"Dashboard error: {str(e)}")
         return RedirectResponse(url="/login.html?error=server_error", status_code=302)
 
 
 @app.get("/user/settings", response_class=HTMLResponse)
-async def user_settings(request: Request, token: str = Query(None)):
+async def user_settings(user: CurrentUser = Depends(current_user)):
     """User settings page"""
-    try:
-        # Get token from query parameter or Authorization header
-        jwt_token = None
-        if token:
-            jwt_token = token
-        else:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                jwt_token = auth_header.replace('Bearer ', '')
-        
-        if not jwt_token:
-            return RedirectResponse(url="/login.html", status_code=302)
-        
-        payload = jwt.decode(jwt_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        username = payload.get('username', email.split('@')[0])
-        
-        if not email:
-            return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
-        
-        # Settings page HTML
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Settings - Procurement Intelligence</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-            <style>
-                .gradient-bg {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
-                .setting-card {{ background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            </style>
-        </head>
-        <body class="bg-gray-50">
-            <div class="min-h-screen">
-                <!-- Header -->
-                <div class="gradient-bg text-white p-6 shadow-lg">
-                    <div class="max-w-6xl mx-auto flex justify-between items-center">
-                        <div>
-                            <h1 class="text-2xl font-bold">⚙️ Settings</h1>
-                            <p class="text-purple-100">Manage your account and preferences</p>
-                        </div>
-                        <a href="/user/dashboard" class="bg-white text-purple-600 px-4 py-2 rounded-lg hover:bg-purple-50">
-                            <i class="fas fa-arrow-left mr-2"></i>Back to Dashboard
-                        </a>
-                    </div>
-                </div>
-
-                <div class="max-w-6xl mx-auto p-6">
-                    <!-- Account Settings -->
-                    <div class="setting-card">
-                        <h2 class="text-xl font-bold mb-4"><i class="fas fa-user mr-2"></i>Account Information</h2>
-                        <div class="grid grid-cols-2 gap-4">
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Username</label>
-                                <input type="text" value="{username}" class="w-full px-4 py-2 border rounded-lg" readonly>
-                            </div>
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Email</label>
-                                <input type="text" value="{email}" class="w-full px-4 py-2 border rounded-lg" readonly>
-                            </div>
-                        </div>
-                        <button class="mt-4 bg-purple-600 text-white px-4 py-2 rounded-lg hover:bg-purple-700">
-                            Change Password
-                        </button>
-                    </div>
-
-                    <!-- Notification Preferences -->
-                    <div class="setting-card">
-                        <h2 class="text-xl font-bold mb-4"><i class="fas fa-bell mr-2"></i>Notifications</h2>
-                        <div class="space-y-3">
-                            <label class="flex items-center">
-                                <input type="checkbox" checked class="mr-3 h-5 w-5">
-                                <span>Email notifications for new matching tenders</span>
-                            </label>
-                            <label class="flex items-center">
-                                <input type="checkbox" checked class="mr-3 h-5 w-5">
-                                <span>Alert me about bargain opportunities</span>
-                            </label>
-                            <label class="flex items-center">
-                                <input type="checkbox" class="mr-3 h-5 w-5">
-                                <span>Weekly market intelligence report</span>
-                            </label>
-                            <label class="flex items-center">
-                                <input type="checkbox" class="mr-3 h-5 w-5">
-                                <span>Competitor activity updates</span>
-                            </label>
-                        </div>
-                    </div>
-
-                    <!-- Display Preferences -->
-                    <div class="setting-card">
-                        <h2 class="text-xl font-bold mb-4"><i class="fas fa-palette mr-2"></i>Display</h2>
-                        <div class="grid grid-cols-2 gap-4">
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Theme</label>
-                                <select class="w-full px-4 py-2 border rounded-lg">
-                                    <option>Light</option>
-                                    <option>Dark</option>
-                                    <option>Auto</option>
-                                </select>
-                            </div>
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Currency</label>
-                                <select class="w-full px-4 py-2 border rounded-lg">
-                                    <option>EUR (€)</option>
-                                    <option>USD ($)</option>
-                                    <option>GBP (£)</option>
-                                </select>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- API Access -->
-                    <div class="setting-card">
-                        <h2 class="text-xl font-bold mb-4"><i class="fas fa-key mr-2"></i>API Access</h2>
-                        <p class="text-gray-600 mb-4">Use API keys to access data programmatically</p>
-                        <button class="bg-purple-600 text-white px-4 py-2 rounded-lg hover:bg-purple-700">
-                            Generate API Key
-                        </button>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
-    
-    except jwt.ExpiredSignatureError:
-        return RedirectResponse(url="/login.html?error=token_expired", status_code=302)
-    except jwt.InvalidTokenError:
-        return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
+    html = render_page('settings.html', username=user.username, email=user.email, back_url="/user/dashboard")
+    return HTMLResponse(content=html)
+
+
+# Shown on /user/alerts until alerts are stored per user
+EXAMPLE_ALERTS = [
+    {'title': '💰 IT Services Bargain Alert', 'description': 'Value: €50K - €500K | Keywords: software, cloud, IT',
+     'created': '2 days ago', 'status': '3 matches today', 'color': 'green'},
+    {'title': '🏢 Competitor Watch: TechCorp Inc', 'description': 'Notify when TechCorp Inc wins or bids on contracts',
+     'created': '1 week ago', 'status': '1 match this week', 'color': 'orange'},
+    {'title': '⏰ Deadline Reminder', 'description': 'Alert 3 days before deadlines for matching tenders',
+     'created': '3 weeks ago', 'status': 'Active', 'color': 'blue'},
+]
 
 
 @app.get("/user/alerts", response_class=HTMLResponse)
-async def user_alerts(request: Request, token: str = Query(None)):
+async def user_alerts(user: CurrentUser = Depends(current_user)):
     """User alerts management page"""
-    try:
-        # Get token
-        jwt_token = None
-        if token:
-            jwt_token = token
-        else:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                jwt_token = auth_header.replace('Bearer ', '')
-        
-        if not jwt_token:
-            return RedirectResponse(url="/login.html", status_code=302)
-        
-        payload = jwt.decode(jwt_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
-        
-        # Alerts page HTML
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Alerts - Procurement Intelligence</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-            <style>
-                .gradient-bg { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
-                .alert-card { background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            </style>
-        </head>
-        <body class="bg-gray-50">
-            <div class="min-h-screen">
-                <!-- Header -->
-                <div class="gradient-bg text-white p-6 shadow-lg">
-                    <div class="max-w-6xl mx-auto flex justify-between items-center">
-                        <div>
-                            <h1 class="text-2xl font-bold">🔔 Smart Alerts</h1>
-                            <p class="text-purple-100">Never miss an opportunity</p>
-                        </div>
-                        <a href="/user/dashboard" class="bg-white text-purple-600 px-4 py-2 rounded-lg hover:bg-purple-50">
-                            <i class="fas fa-arrow-left mr-2"></i>Back to Dashboard
-                        </a>
-                    </div>
-                </div>
-
-                <div class="max-w-6xl mx-auto p-6">
-                    <!-- Create New Alert -->
-                    <div class="alert-card">
-                        <h2 class="text-xl font-bold mb-4">Create New Alert</h2>
-                        <div class="grid grid-cols-2 gap-4 mb-4">
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Alert Type</label>
-                                <select class="w-full px-4 py-2 border rounded-lg">
-                                    <option>💰 Bargain Alert (below market price)</option>
-                                    <option>🎯 Keyword Match</option>
-                                    <option>📊 Value Threshold</option>
-                                    <option>⏰ Deadline Reminder</option>
-                                    <option>🏢 Competitor Activity</option>
-                                    <option>📍 Geographic Alert</option>
-                                </select>
-                            </div>
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Keywords (comma-separated)</label>
-                                <input type="text" placeholder="IT services, cloud, software" class="w-full px-4 py-2 border rounded-lg">
-                            </div>
-                        </div>
-                        <div class="grid grid-cols-3 gap-4 mb-4">
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Min Value (€)</label>
-                                <input type="number" placeholder="100000" class="w-full px-4 py-2 border rounded-lg">
-                            </div>
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Max Value (€)</label>
-                                <input type="number" placeholder="5000000" class="w-full px-4 py-2 border rounded-lg">
-                            </div>
-                            <div>
-                                <label class="block text-sm font-semibold text-gray-700 mb-2">Country</label>
-                                <select class="w-full px-4 py-2 border rounded-lg">
-                                    <option>All Countries</option>
-                                    <option>Germany</option>
-                                    <option>France</option>
-                                    <option>Greece</option>
-                                    <option>USA</option>
-                                </select>
-                            </div>
-                        </div>
-                        <div class="flex gap-4">
-                            <button class="bg-purple-600 text-white px-6 py-2 rounded-lg hover:bg-purple-700">
-                                <i class="fas fa-plus mr-2"></i>Create Alert
-                            </button>
-                        </div>
-                    </div>
-
-                    <!-- Active Alerts -->
-                    <h2 class="text-xl font-bold mb-4">Active Alerts</h2>
-                    
-                    <!-- Example Alert 1 -->
-                    <div class="alert-card border-l-4 border-green-500">
-                        <div class="flex justify-between items-start">
-                            <div>
-                                <h3 class="font-bold text-lg">💰 IT Services Bargain Alert</h3>
-                                <p class="text-gray-600 mt-2">Value: €50K - €500K | Keywords: software, cloud, IT</p>
-                                <p class="text-sm text-gray-500 mt-1">Created 2 days ago • <span class="text-green-600 font-semibold">3 matches today</span></p>
-                            </div>
-                            <div class="flex gap-2">
-                                <button class="text-blue-600 hover:text-blue-800"><i class="fas fa-edit"></i></button>
-                                <button class="text-red-600 hover:text-red-800"><i class="fas fa-trash"></i></button>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Example Alert 2 -->
-                    <div class="alert-card border-l-4 border-orange-500">
-                        <div class="flex justify-between items-start">
-                            <div>
-                                <h3 class="font-bold text-lg">🏢 Competitor Watch: TechCorp Inc</h3>
-                                <p class="text-gray-600 mt-2">Notify when TechCorp Inc wins or bids on contracts</p>
-                                <p class="text-sm text-gray-500 mt-1">Created 1 week ago • <span class="text-orange-600 font-semibold">1 match this week</span></p>
-                            </div>
-                            <div class="flex gap-2">
-                                <button class="text-blue-600 hover:text-blue-800"><i class="fas fa-edit"></i></button>
-                                <button class="text-red-600 hover:text-red-800"><i class="fas fa-trash"></i></button>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Example Alert 3 -->
-                    <div class="alert-card border-l-4 border-blue-500">
-                        <div class="flex justify-between items-start">
-                            <div>
-                                <h3 class="font-bold text-lg">⏰ Deadline Reminder</h3>
-                                <p class="text-gray-600 mt-2">Alert 3 days before deadlines for matching tenders</p>
-                                <p class="text-sm text-gray-500 mt-1">Created 3 weeks ago • <span class="text-blue-600 font-semibold">Active</span></p>
-                            </div>
-                            <div class="flex gap-2">
-                                <button class="text-blue-600 hover:text-blue-800"><i class="fas fa-edit"></i></button>
-                                <button class="text-red-600 hover:text-red-800"><i class="fas fa-trash"></i></button>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
-    
-    except jwt.ExpiredSignatureError:
-        return RedirectResponse(url="/login.html?error=token_expired", status_code=302)
-    except jwt.InvalidTokenError:
-        return RedirectResponse(url="/login.html?error=invalid_token", status_code=302)
+    html = render_page('alerts.html', alerts=EXAMPLE_ALERTS, back_url="/user/dashboard")
+    return HTMLResponse(content=html)
 
 
 @app.post("/api/favorites")
-async def add_to_favorites(
-    tender_data: dict,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-):
-    """Add tender to user favorites"""
+async def add_to_favorites(body: dict, user: CurrentUser = Depends(current_user)):
+    """
+    Add a tender to favorites, or change many at once
+    
+    The body is either one tender ({"id": ..., ...}) or a batch
+    {"add": [tender, ...], "remove": [tender_id, ...]}, applied in one
+    transaction.
+    """
+    batch = 'add' in body or 'remove' in body
+    add, remove = (body.get('add') or [], body.get('remove') or []) if batch else ([body], [])
+    
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
-        
-        success = add_favorite(email, tender_data)
-        return JSONResponse({'success': success})
+        added, removed = await asyncio.to_thread(favorite_store.update, user.email, add, remove)
+    except ValueError as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
     
-    except jwt.JWTError:
-        return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
+    if not batch:
+        return JSONResponse({'success': added == 1})
+    return JSONResponse({'success': True, 'added': added, 'removed': removed})
 
 
 @app.delete("/api/favorites/{tender_id}")
-async def remove_from_favorites(
-    tender_id: str,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-):
+async def remove_from_favorites(tender_id: str, user: CurrentUser = Depends(current_user)):
     """Remove tender from favorites"""
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
-        
-        success = remove_favorite(email, tender_id)
-        return JSONResponse({'success': success})
-    
-    except jwt.JWTError:
-        return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
+    success = await asyncio.to_thread(favorite_store.remove, user.email, tender_id)
+    return JSONResponse({'success': success})
 
 
 @app.get("/api/favorites")
-async def get_user_favorites(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_user_favorites(user: CurrentUser = Depends(current_user)):
     """Get user's favorites"""
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get('email')
-        
-        if not email:
-            return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
-        
-        favorites = get_favorites(email)
-        return JSONResponse({'success': True, 'favorites': favorites})
-    
-    except jwt.JWTError:
-        return JSONResponse({'success': False, 'error': 'Invalid token'}, status_code=401)
+    favorites = await asyncio.to_thread(favorite_store.list, user.email)
+    return JSONResponse({'success': True, 'favorites': favorites})
 
 
 @app.get("/auth/google/callback")
-async def google_oauth_callback(code: str = Query(None), state: str = Query(None)):
+async def google_oauth_callback(request: Request, code: str = Query(None), state: str = Query(None)):
     """Handle Google OAuth callback"""
     
     if not code:
         return RedirectResponse(url="/login.html?error=no_code")
     
-    if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
+    if not google_oauth.configured:
         return RedirectResponse(url="/login.html?error=oauth_not_configured")
     
     try:
-        # Exchange code for access token
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "code": code,
-                    "client_id": GOOGLE_CLIENT_ID,
-                    "client_secret": GOOGLE_CLIENT_SECRET,
-                    "redirect_uri": GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code",
-                }
-            )
-            
-            if token_response.status_code != 200:
-                error_body = token_response.text
-                print(f"Google token exchange failed. Status: {token_response.status_code}")
-                print(f"Response: {error_body}")
-                print(f"Redirect URI used: {GOOGLE_REDIRECT_URI}")
-                return RedirectResponse(url="/login.html?error=token_exchange_failed")
-            
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
-            
-            # Get user info from Google
-            user_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if user_response.status_code != 200:
-                return RedirectResponse(url="/login.html?error=user_info_failed")
-            
-            user_data = user_response.json()
-            email = user_data.get("email")
-            name = user_data.get("name", email.split("@")[0])
-            
-            # Create or update user in database
-            if email not in users_db:
-                users_db[email] = {
-                    "email": email,
-                    "username": name,
-                    "provider": "google",
-                    "created_at": datetime.now().isoformat()
-                }
-            
-            # Create JWT token
-            token_payload = {
-                "email": email,
-                "username": name,
-                "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            }
-            jwt_token = jwt.encode(token_payload, SECRET_KEY, algorithm=ALGORITHM)
-            
-            # Redirect to user dashboard with token in URL (frontend will save to localStorage)
-            return RedirectResponse(url=f"/user/dashboard?token={jwt_token}&login=success")
+        # Exchange code for access token and user info over the shared client
+        user_data = await google_oauth.fetch_user(request.app.state.http_client, code)
+        email = user_data.get("email")
+        name = user_data.get("name", email.split("@")[0])
+        
+        # Create the account on first login
+        await asyncio.to_thread(user_store.create, User(email=email, username=name, provider="google"))
+        
+        # Create JWT token
+        jwt_token = token_verifier.issue(email, name)
+        
+        # Redirect to user dashboard with token in URL (frontend will save to localStorage)
+        return RedirectResponse(url=f"/user/dashboard?token={jwt_token}&login=success")
     
+    except GoogleOAuthError as e:
+        print(f"Google OAuth error: {str(e)}")
+        return RedirectResponse(url=f"/login.html?error={e.reason}")
     except Exception as e:
         print(f"Google OAuth error: {str(e)}")
         return RedirectResponse(url="/login.html?error=oauth_failed")
@@ -0,0 +1,13 @@
+"""
+Authentication services
+"""
+from .google import GoogleOAuth, GoogleOAuthError
+from .passwords import ClientThrottled, HasherBusy, HashingRejected, PasswordHasher
+from .proxies import TrustedProxies
+from .tokens import CurrentUser, InvalidToken, TokenVerifier, request_token
+
+__all__ = [
+    'GoogleOAuth', 'GoogleOAuthError',
+    'ClientThrottled', 'HasherBusy', 'HashingRejected', 'PasswordHasher', 'TrustedProxies',
+    'CurrentUser', 'InvalidToken', 'TokenVerifier', 'request_token'
+]
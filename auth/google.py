@@ -0,0 +1,81 @@
+"""
+Google OAuth sign-in
+Authorization-code exchange and profile lookup over a shared HTTP client
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+import httpx
+
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+
+
+class GoogleOAuthError(Exception):
+    """
+    Google sign-in failed
+
+    reason is the login page's error code: 'token_exchange_failed' or
+    'user_info_failed'.
+    """
+
+    def __init__(self, reason: str, detail: str = ''):
+        super().__init__(f'{reason}: {detail}' if detail else reason)
+        self.reason = reason
+
+
+@dataclass
+class GoogleOAuth:
+    """
+    Google OAuth client credentials and endpoints
+
+    The endpoints can point at a local stub (conftest.GoogleStubServer) to
+    test and time the sign-in flow offline; see benchmarks/bench_oauth.py.
+    """
+    client_id: str
+    client_secret: str
+    redirect_uri: str
+    token_url: str = GOOGLE_TOKEN_URL
+    userinfo_url: str = GOOGLE_USERINFO_URL
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.client_id and self.client_secret)
+
+    async def fetch_user(self, client: httpx.AsyncClient, code: str) -> Dict:
+        """
+        Exchange an authorization code and return the Google profile
+
+        Args:
+            client: Shared, pooled client, so repeat sign-ins reuse open
+                connections to Google
+            code: Authorization code from the callback
+
+        Raises:
+            GoogleOAuthError: Either request was refused or failed
+        """
+        try:
+            token_response = await client.post(self.token_url, data={
+                "code": code,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "redirect_uri": self.redirect_uri,
+                "grant_type": "authorization_code",
+            })
+        except httpx.HTTPError as e:
+            raise GoogleOAuthError('token_exchange_failed', str(e)) from e
+        if token_response.status_code != 200:
+            raise GoogleOAuthError(
+                'token_exchange_failed',
+                f'{token_response.status_code} {token_response.text} (redirect URI {self.redirect_uri})'
+            )
+        access_token = token_response.json().get("access_token")
+
+        try:
+            user_response = await client.get(self.userinfo_url, headers={"Authorization": f"Bearer {access_token}"})
+        except httpx.HTTPError as e:
+            raise GoogleOAuthError('user_info_failed', str(e)) from e
+        if user_response.status_code != 200:
+            raise GoogleOAuthError('user_info_failed', str(user_response.status_code))
+        return user_response.json()
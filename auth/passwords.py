@@ -0,0 +1,155 @@
+"""
+Password hashing service
+bcrypt on a dedicated pool sized to the cores, with admission control per client
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import bcrypt
+
+
+class HashingRejected(Exception):
+    """A hash or verification was turned away without being run"""
+
+
+class HasherBusy(HashingRejected):
+    """max_pending operations are already queued or running"""
+
+
+class ClientThrottled(HashingRejected):
+    """One client already has per_client operations in flight"""
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification off the event loop
+
+    Each operation costs 100-300 ms of CPU, so they run on their own
+    threads (bcrypt releases the GIL), one per core: a burst of logins
+    queues behind the other logins, never in front of dashboard
+    requests. Operations beyond max_pending, or beyond per_client for one
+    client address, are rejected at once rather than queued.
+    """
+
+    def __init__(self, rounds: int = 12, workers: Optional[int] = None,
+                 max_pending: int = 64, per_client: int = 2):
+        """
+        Args:
+            rounds: bcrypt cost factor for new hashes; verified hashes with
+                another cost are transparently rehashed (see verify)
+            workers: Hashing threads (defaults to the CPU count)
+            max_pending: Operations allowed to be queued or running at once
+            per_client: Operations one client address may have in flight
+        """
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.per_client = per_client
+        self.pending = 0
+        self.hashed = 0
+        self.verified = 0
+        self.rehashed = 0
+        self.rejected = 0
+        self.throttled = 0
+        self._clients: Dict[str, int] = {}
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='bcrypt')
+        self._lock = threading.Lock()
+
+    async def hash(self, password: str, client: Optional[str] = None) -> str:
+        """
+        Hash a new password at the configured cost
+
+        Raises:
+            HashingRejected: The pool or the client is at its limit
+        """
+        return await self._run(client, self._hash, password)
+
+    async def verify(self, password: str, hashed: str,
+                     client: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password against its stored hash
+
+        Returns:
+            (valid, new_hash): new_hash is set when the password is valid
+            but hashed used another cost factor; callers should store it
+            in place of hashed. Malformed hashes never verify.
+
+        Raises:
+            HashingRejected: The pool or the client is at its limit
+        """
+        return await self._run(client, self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether hashed was made with another cost factor than rounds"""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _hash(self, password: str) -> str:
+        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+        with self._lock:
+            self.hashed += 1
+        return hashed
+
+    def _verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        try:
+            valid = bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        except ValueError:
+            valid = False
+        with self._lock:
+            self.verified += 1
+        if not valid or not self.needs_rehash(hashed):
+            return valid, None
+        new_hash = self._hash(password)
+        with self._lock:
+            self.rehashed += 1
+        return True, new_hash
+
+    async def _run(self, client: Optional[str], operation: Callable, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HasherBusy(f'{self.pending} password operations pending')
+            if client is not None and self._clients.get(client, 0) >= self.per_client:
+                self.throttled += 1
+                raise ClientThrottled(f'Too many concurrent password operations from {client}')
+            self.pending += 1
+            if client is not None:
+                self._clients[client] = self._clients.get(client, 0) + 1
+        future = self._executor.submit(operation, *args)
+        # Released when the work is really done (or dropped unrun), not
+        # when an impatient caller stops waiting
+        future.add_done_callback(lambda _: self._release(client))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, client: Optional[str]):
+        with self._lock:
+            self.pending -= 1
+            if client is not None:
+                remaining = self._clients.pop(client) - 1
+                if remaining:
+                    self._clients[client] = remaining
+
+    def status(self) -> Dict:
+        """Load and outcome counters for monitoring"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'rounds': self.rounds,
+                'pending': self.pending,
+                'max_pending': self.max_pending,
+                'clients': len(self._clients),
+                'hashed': self.hashed,
+                'verified': self.verified,
+                'rehashed': self.rehashed,
+                'rejected': self.rejected,
+                'throttled': self.throttled
+            }
+
+    def shutdown(self):
+        """Drop queued operations and stop the threads once running ones finish"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
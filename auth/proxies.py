@@ -0,0 +1,47 @@
+"""
+Client addresses behind reverse proxies
+Reads X-Forwarded-For only from proxies the deployment trusts
+"""
+import ipaddress
+from typing import Iterable
+
+from fastapi import Request
+
+
+class TrustedProxies:
+    """
+    Resolve the address a request really came from
+
+    Behind a reverse proxy (e.g. Railway's edge) every request arrives
+    from the proxy's address. When the peer is a trusted proxy,
+    X-Forwarded-For is walked from the right, skipping further trusted
+    hops, and the first untrusted address is the client. Entries left of
+    it were written by the client and are ignored, so they can't be used
+    to dodge per-client limits.
+    """
+
+    def __init__(self, networks: Iterable[str] = ()):
+        """
+        Args:
+            networks: Addresses or CIDR ranges of trusted proxies; empty
+                trusts none and uses the peer address as-is
+        """
+        self.networks = [ipaddress.ip_network(network, strict=False) for network in networks or ()]
+
+    def trusts(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+    def client_address(self, request: Request) -> str:
+        address = request.client.host if request.client else 'unknown'
+        if not self.trusts(address):
+            return address
+        hops = [hop.strip() for hop in request.headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+        for hop in reversed(hops):
+            address = hop
+            if not self.trusts(hop):
+                break
+        return address
@@ -0,0 +1,133 @@
+"""
+JWT session tokens
+Issuing, verifying and caching verified tokens so hot routes skip the HMAC
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import jwt
+from fastapi import Request
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The signed-in user a verified token names"""
+    email: str
+    username: str
+    token: str
+    expires_at: float
+
+
+class InvalidToken(Exception):
+    """
+    A request's token is missing, expired or does not verify
+
+    reason is 'missing', 'expired' or 'invalid'.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f'Token {reason}')
+        self.reason = reason
+
+
+def request_token(request: Request, token: Optional[str] = None) -> Optional[str]:
+    """The token from a ?token= query parameter or a Bearer Authorization header"""
+    if token:
+        return token
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() == 'bearer' and credentials.strip():
+        return credentials.strip()
+    return None
+
+
+class TokenVerifier:
+    """
+    Issue and verify HS256 session tokens
+
+    Verified tokens are kept in a small LRU cache until their own expiry
+    or cache_seconds, whichever comes first, so repeated requests with
+    the same token skip signature verification and claim parsing.
+    Tokens that fail verification are never cached.
+    """
+
+    def __init__(self, secret: str, algorithm: str = 'HS256', lifetime: timedelta = timedelta(days=30),
+                 max_entries: int = 10_000, cache_seconds: float = 300.0):
+        """
+        Args:
+            secret: HMAC key
+            algorithm: JWT signing algorithm
+            lifetime: How long issued tokens stay valid
+            max_entries: Verified tokens kept in the cache
+            cache_seconds: Longest a verified token is trusted without
+                checking its signature again
+        """
+        self.secret = secret
+        self.algorithm = algorithm
+        self.lifetime = lifetime
+        self.max_entries = max_entries
+        self.cache_seconds = cache_seconds
+        self.hits = 0
+        self.misses = 0
+        self._verified: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def issue(self, email: str, username: Optional[str] = None) -> str:
+        """Sign a token for email, valid for lifetime"""
+        return jwt.encode({
+            'email': email,
+            'username': username or email.split('@')[0],
+            'exp': datetime.now(timezone.utc) + self.lifetime
+        }, self.secret, algorithm=self.algorithm)
+
+    def verify(self, token: Optional[str]) -> CurrentUser:
+        """
+        The user a token was issued to
+
+        Raises:
+            InvalidToken: The token is missing, expired, does not verify or
+                names no email
+        """
+        if not token:
+            raise InvalidToken('missing')
+        now = time.time()
+        with self._lock:
+            entry = self._verified.get(token)
+            if entry is not None and now < entry[1]:
+                self._verified.move_to_end(token)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except jwt.ExpiredSignatureError:
+            raise InvalidToken('expired') from None
+        except jwt.InvalidTokenError:
+            raise InvalidToken('invalid') from None
+        email = payload.get('email')
+        if not email:
+            raise InvalidToken('invalid')
+
+        expires_at = float(payload.get('exp', now + self.cache_seconds))
+        user = CurrentUser(email=email, username=payload.get('username') or email.split('@')[0],
+                           token=token, expires_at=expires_at)
+        with self._lock:
+            self._verified[token] = (user, min(expires_at, now + self.cache_seconds))
+            self._verified.move_to_end(token)
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return user
+
+    def status(self) -> Dict:
+        """Cache size and hit-rate counters for monitoring"""
+        with self._lock:
+            return {
+                'entries': len(self._verified),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-chart groupbys vs the single-pass aggregation engine
+
+Usage:
+    python benchmarks/bench_aggregate.py [--rows 1000000]
+
+The baseline repeats the groupbys create_tender_overview,
+create_market_intelligence and compute_statistics used to run
+separately over the same frame. The compact rows use
+ProcurementConnector.to_compact (categoricals, int32 days, float32).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics import aggregate
+from connectors.base import ProcurementConnector
+from connectors.synthetic import generate_tenders
+
+
+def separate_groupbys(tenders: pd.DataFrame):
+    """The old per-consumer scans"""
+    # create_tender_overview
+    dates = pd.to_datetime(tenders['published_date'])
+    tenders.groupby(dates.dt.to_period('D')).agg({'tender_id': 'count', 'value_eur': 'sum'})
+    tenders.groupby('country_name').agg({'tender_id': 'count', 'value_eur': 'sum'})
+    tenders.groupby('cpv_description')['value_eur'].sum()
+    # create_market_intelligence
+    tenders['country_name'].value_counts()
+    tenders.groupby('cpv_description')['value_eur'].sum()
+    tenders.groupby(pd.to_datetime(tenders['published_date']).dt.date)['tender_id'].count()
+    tenders['procedure_type'].value_counts()
+    # compute_statistics
+    tenders['value_eur'].agg(['sum', 'mean', 'min', 'max'])
+    tenders['country'].nunique()
+    tenders.groupby('country_name')['value_eur'].sum()
+    tenders.groupby('cpv_description')['tender_id'].count()
+
+
+def timed(label: str, fn, rows: int):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:8.0f} ms  ({rows / elapsed:,.0f} rows/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tenders = generate_tenders(args.rows, {'published_from': '2024-01-01', 'published_to': '2026-01-01'})
+    categorical = tenders.astype({c: 'category' for c in ('country_name', 'cpv_description', 'procedure_type')})
+    compact = ProcurementConnector.to_compact(tenders)
+    print(f"{args.rows:,} tenders")
+    for label, frame in (('object/str columns', tenders), ('compact', compact)):
+        print(f"{label:<28} {frame.memory_usage(deep=True).sum() / 2**20:8.0f} MiB")
+
+    timed('separate groupbys', lambda: separate_groupbys(tenders), args.rows)
+    timed('aggregate (numpy)', lambda: aggregate(tenders), args.rows)
+    timed('aggregate (numpy, category)', lambda: aggregate(categorical), args.rows)
+    timed('aggregate (numpy, compact)', lambda: aggregate(compact), args.rows)
+    timed('aggregate (duckdb)', lambda: aggregate(tenders, engine='duckdb'), args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: streaming export throughput and memory
+
+Usage:
+    python benchmarks/bench_export.py [--rows 1000000] [--format ndjson]
+
+Loads synthetic tenders into a temporary store, then streams them
+through the export encoder, reporting rows/s and peak RSS growth.
+"""
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from connectors.synthetic import iter_tables
+from storage.export import EXPORT_FORMATS, iter_export
+from storage.tender_store import TenderStore
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='ndjson')
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = TenderStore(Path(directory) / 'bench.duckdb')
+        for table in iter_tables(args.rows, {'published_from': '2025-01-01', 'published_to': '2026-01-01'},
+                                 chunk_size=200_000):
+            store.ingest(table.to_pandas())
+        print(f"Loaded {store.count():,} tenders, peak RSS {peak_rss_mb():,.0f} MB")
+
+        before = peak_rss_mb()
+        started = time.perf_counter()
+        size = 0
+        for chunk in iter_export(store.iter_batches(batch_size=args.batch_size), args.format):
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        store.close()
+
+    print(f"{args.format}: {args.rows:,} rows, {size / 1e6:,.0f} MB in {elapsed:.1f}s "
+          f"({args.rows / elapsed:,.0f} rows/s), peak RSS +{peak_rss_mb() - before:,.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: TED fetch throughput against a local stub server
+
+Usage:
+    python benchmarks/bench_fetch.py [--notices 1000] [--page-size 100] [--concurrency 8] [--latency 0.05]
+
+Fetches --notices notices from the conftest TED stub, which answers each
+page after --latency seconds, one page at a time and then with
+--concurrency pages in flight. Runs offline.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from conftest import TEDStubServer
+from connectors.ted_eu import TEDConnector
+
+
+async def fetch(stub: TEDStubServer, notices: int, page_size: int, concurrency: int):
+    connector = TEDConnector(live=True, page_size=page_size, max_concurrency=concurrency)
+    connector.base_url = stub.url
+    started = time.perf_counter()
+    tenders = await connector.asearch_tenders({'limit': notices})
+    elapsed = time.perf_counter() - started
+    await connector.aclose()
+    return len(tenders), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--notices', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    with TEDStubServer(total_notices=args.notices, latency=args.latency) as stub:
+        for concurrency in (1, args.concurrency):
+            rows, elapsed = asyncio.run(fetch(stub, args.notices, args.page_size, concurrency))
+            print(f"{concurrency:>3} in flight: {rows:,} notices in {elapsed:.3f}s "
+                  f"({rows / elapsed:,.0f} notices/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: login latency under concurrent load
+
+Usage:
+    python benchmarks/bench_login.py [--logins 200] [--concurrency 32] [--rounds 12]
+
+Runs a burst of password verifications on one event loop, either inline
+(bcrypt.checkpw in the coroutine, as the handlers used to) or through
+PasswordHasher, while a probe measures how long a cheap request waits
+for the loop. Reports login p50/p99 and probe p99 for both.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import bcrypt
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from auth import PasswordHasher
+
+
+def percentile(samples, q: float) -> float:
+    """q-th percentile of samples in seconds, as milliseconds"""
+    return float(np.percentile(samples, q)) * 1000
+
+
+async def probe(latencies: list, stop: asyncio.Event, interval: float = 0.01):
+    """A cheap request every interval; records how late the loop ran it"""
+    while not stop.is_set():
+        scheduled = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append(time.perf_counter() - scheduled - interval)
+
+
+async def burst(mode: str, hashed: str, hasher: PasswordHasher, args) -> dict:
+    logins, probes = [], []
+    gate = asyncio.Semaphore(args.concurrency)
+    stop = asyncio.Event()
+
+    async def login(number: int):
+        async with gate:
+            started = time.perf_counter()
+            if mode == 'inline':
+                # Handlers await the request body first, so logins interleave
+                await asyncio.sleep(0)
+                valid = bcrypt.checkpw(b'Correct-horse-battery-1', hashed.encode('utf-8'))
+            else:
+                valid, _ = await hasher.verify('Correct-horse-battery-1', hashed, client=f'10.0.{number % 250}.1')
+            assert valid
+            logins.append(time.perf_counter() - started)
+
+    prober = asyncio.create_task(probe(probes, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(login(number) for number in range(args.logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+    return {'logins': logins, 'probes': probes, 'elapsed': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=None, help='Hashing threads (default: CPU count)')
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(rounds=args.rounds, workers=args.workers,
+                            max_pending=args.logins, per_client=args.logins)
+    hashed = bcrypt.hashpw(b'Correct-horse-battery-1', bcrypt.gensalt(args.rounds)).decode('utf-8')
+    print(f"{args.logins} logins, {args.concurrency} concurrent, cost {args.rounds}, "
+          f"{hasher.workers} hashing threads")
+
+    for mode in ('inline', 'pool'):
+        result = asyncio.run(burst(mode, hashed, hasher, args))
+        print(f"{mode:>6}: {args.logins / result['elapsed']:6.1f} logins/s, "
+              f"login p50 {percentile(result['logins'], 50):7.0f} ms, p99 {percentile(result['logins'], 99):7.0f} ms, "
+              f"loop probe p99 {percentile(result['probes'], 99):7.1f} ms")
+    hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
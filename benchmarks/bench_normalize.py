@@ -0,0 +1,73 @@
+"""
+Benchmark: scalar vs vectorized tender normalization
+
+Usage:
+    python benchmarks/bench_normalize.py [--rows 1000000] [--scalar-rows 50000]
+
+The scalar path is timed on --scalar-rows and extrapolated to --rows,
+since running it on a million rows takes minutes.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from connectors.base import ProcurementConnector
+from connectors.ted_eu import TEDConnector
+
+
+def synthetic_columns(rows: int, seed: int = 0):
+    """Currency strings and dates in the shapes upstream feeds send"""
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(10_000, 50_000_000, rows)
+    value_styles = np.array(['€{:,}', '{:,} EUR', '$ {:,}', '{}'])
+    values = pd.Series([value_styles[i % 4].format(a) for i, a in enumerate(amounts)])
+    values[rng.random(rows) < 0.01] = 'n/a'
+
+    days = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, rows), unit='D')
+    dates = pd.Series(days.strftime('%Y-%m-%d'))
+    offsets = rng.random(rows) < 0.05
+    dates[offsets] = dates[offsets] + '+01:00'
+    dates[rng.random(rows) < 0.01] = 'unknown'
+    return values, dates
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--scalar-rows', type=int, default=50_000)
+    args = parser.parse_args()
+
+    connector = TEDConnector()
+    values, dates = synthetic_columns(args.rows)
+    sample_values, sample_dates = values.head(args.scalar_rows), dates.head(args.scalar_rows)
+
+    _, scalar_values = timed(lambda: [connector.normalize_value(v) for v in sample_values])
+    _, scalar_dates = timed(lambda: [connector.normalize_date(d) for d in sample_dates])
+    scale = args.rows / len(sample_values)
+
+    (parsed_values, value_errors), batch_values = timed(lambda: ProcurementConnector.normalize_values(values))
+    (parsed_dates, date_errors), batch_dates = timed(lambda: ProcurementConnector.normalize_dates(dates))
+
+    print(f"Rows: {args.rows:,} (scalar timed on {len(sample_values):,}, extrapolated)")
+    print(f"{'':8}{'scalar':>12}{'batch':>12}{'speedup':>10}")
+    for name, scalar, batch in (('values', scalar_values * scale, batch_values),
+                                ('dates', scalar_dates * scale, batch_dates)):
+        print(f"{name:8}{scalar:>11.2f}s{batch:>11.2f}s{scalar / batch:>9.0f}x")
+    print(f"dtypes: {parsed_values.dtype}, {parsed_dates.dtype}; "
+          f"errors flagged: {value_errors.sum():,} values, {date_errors.sum():,} dates")
+
+
+if __name__ == '__main__':
+    main()
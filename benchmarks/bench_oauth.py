@@ -0,0 +1,59 @@
+"""
+Benchmark: Google sign-in latency, client per login vs shared pooled client
+
+Usage:
+    python benchmarks/bench_oauth.py [--logins 20] [--latency 0.002] [--handshake 0.02]
+
+Runs the code exchange and profile lookup against the conftest Google
+stub, which answers after --latency seconds and charges --handshake
+seconds per new connection (standing in for TCP and TLS setup to
+Google). Reports login p50/p99 and connections opened. Runs offline.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from auth.google import GoogleOAuth
+from conftest import GoogleStubServer
+from connectors.http import create_http_client
+
+
+async def logins(oauth: GoogleOAuth, count: int, shared: bool) -> list:
+    latencies = []
+    async with create_http_client() as client:
+        for n in range(count):
+            started = time.perf_counter()
+            if shared:
+                await oauth.fetch_user(client, f'user{n}')
+            else:
+                async with httpx.AsyncClient() as fresh:
+                    await oauth.fetch_user(fresh, f'user{n}')
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.002)
+    parser.add_argument('--handshake', type=float, default=0.02)
+    args = parser.parse_args()
+
+    for label, shared in (('Client per login', False), ('Shared client', True)):
+        with GoogleStubServer(latency=args.latency, handshake_latency=args.handshake) as stub:
+            oauth = GoogleOAuth('client-id', 'client-secret', 'http://localhost/callback',
+                                token_url=stub.token_url, userinfo_url=stub.userinfo_url)
+            latencies = asyncio.run(logins(oauth, args.logins, shared))
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{label:<17} p50 {p50:.1f}ms p99 {p99:.1f}ms, {len(stub.client_ports)} connections")
+
+
+if __name__ == '__main__':
+    main()
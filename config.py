@@ -0,0 +1,32 @@
+"""
+Configuration loader for config.yml
+"""
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import yaml
+
+CONFIG_PATH = Path(__file__).parent / "config.yml"
+
+_ENV_PATTERN = re.compile(r'^\$\{(\w+)\}$')
+
+
+def _expand_env(value):
+    """Replace ${VAR} placeholders with environment values (None if unset)"""
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand_env(v) for v in value]
+    if isinstance(value, str):
+        match = _ENV_PATTERN.match(value)
+        if match:
+            return os.getenv(match.group(1))
+    return value
+
+
+def load_config(path: Optional[Path] = None) -> Dict:
+    """Load config.yml with environment variable placeholders resolved"""
+    with open(path or CONFIG_PATH, encoding='utf-8') as f:
+        return _expand_env(yaml.safe_load(f) or {})
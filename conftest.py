@@ -0,0 +1,231 @@
+"""
+Shared pytest fixtures
+
+The stub servers let connector and auth tests run offline.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+
+def pytest_ignore_collect(collection_path, config):
+    # test_platform.py is a smoke script against a running server
+    return collection_path.name == 'test_platform.py'
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 stalls concurrent clients
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class TEDStubServer:
+    """Local stand-in for the TED v3 notice search endpoint"""
+
+    def __init__(self, total_notices: int = 1000, latency: float = 0.0):
+        self.total_notices = total_notices
+        self.latency = latency
+        self.requests = []
+        self.failures = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _StubHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/v3'
+
+    def fail(self, status: int, times: int = 1, headers: dict = None):
+        """Answer the next `times` requests with an error status"""
+        with self._lock:
+            self.failures.extend([(status, headers or {})] * times)
+
+    def notice(self, n: int) -> dict:
+        return {
+            'publication-number': f'{n:08d}-2026',
+            'notice-title': {'eng': f'Stub notice {n}'},
+            'buyer-country': ['DE'],
+            'classification-cpv': ['48000000'],
+            'estimated-value-lot': [str(100000 + n)],
+            'estimated-value-cur-lot': ['EUR'],
+            'publication-date': '2026-01-15',
+            'deadline-receipt-tender-date-lot': ['2026-03-01'],
+            'buyer-name': {'eng': 'Stub Agency'},
+            'procedure-type': 'restricted' if n % 4 == 3 else 'open',
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                with stub._lock:
+                    stub.requests.append(query)
+                    failure = stub.failures.pop(0) if stub.failures else None
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    self._respond(query, failure)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _respond(self, query, failure):
+                if failure:
+                    status, headers = failure
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                page_size = int(query.get('pageSize', ['100'])[0])
+                page_num = int(query.get('pageNum', ['1'])[0])
+                start = (page_num - 1) * page_size
+                end = min(start + page_size, stub.total_notices)
+                body = json.dumps({
+                    'notices': [stub.notice(n) for n in range(start, end)],
+                    'totalNoticeCount': stub.total_notices,
+                }).encode()
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def ted_stub():
+    """TED stub server with 1000 notices and no added latency"""
+    with TEDStubServer() as stub:
+        yield stub
+
+
+class GoogleStubServer:
+    """
+    Local stand-in for Google's OAuth token and userinfo endpoints
+
+    Speaks HTTP/1.1 keep-alive and records each request's client port, so
+    tests can tell reused connections from new ones. handshake_latency is
+    paid once per new connection, like a TLS handshake to Google.
+    """
+
+    def __init__(self, latency: float = 0.0, handshake_latency: float = 0.0):
+        self.latency = latency
+        self.handshake_latency = handshake_latency
+        self.requests = []
+        self.failures = {}
+        self._lock = threading.Lock()
+        self._server = _StubHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def token_url(self) -> str:
+        return f'{self.url}/token'
+
+    @property
+    def userinfo_url(self) -> str:
+        return f'{self.url}/userinfo'
+
+    @property
+    def client_ports(self) -> set:
+        """Distinct client ports seen, i.e. connections opened to the stub"""
+        with self._lock:
+            return {port for _, _, port in self.requests}
+
+    def fail(self, path: str, status: int, times: int = 1):
+        """Answer the next `times` requests to /token or /userinfo with an error status"""
+        with self._lock:
+            self.failures.setdefault(path, []).extend([status] * times)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle hold the body
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                if stub.handshake_latency:
+                    time.sleep(stub.handshake_latency)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                code = form.get('code', [''])[0]
+                self._respond('/token', {'access_token': f'stub-token-{code}', 'token_type': 'Bearer'})
+
+            def do_GET(self):
+                token = self.headers.get('Authorization', '').partition(' ')[2]
+                code = token.removeprefix('stub-token-')
+                self._respond('/userinfo', {'email': f'{code}@example.com', 'name': f'User {code}'})
+
+            def _respond(self, path: str, payload: dict):
+                with stub._lock:
+                    stub.requests.append((self.command, urlparse(self.path).path, self.client_address[1]))
+                    pending = stub.failures.get(urlparse(self.path).path)
+                    failure = pending.pop(0) if pending else None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if urlparse(self.path).path != path:
+                    failure = failure or 404
+                status = failure or 200
+                body = b'{"error": "stub"}' if failure else json.dumps(payload).encode()
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def google_stub():
+    """Google OAuth stub server with no added latency"""
+    with GoogleStubServer() as stub:
+        yield stub
@@ -3,5 +3,10 @@ Procurement data source connectors
 """
 from .base import ProcurementConnector
 from .ted_eu import TEDConnector
+from .cache import TenderCache, CachedConnector
+from .registry import ConnectorRegistry, FederatedConnector
 
-__all__ = ['ProcurementConnector', 'TEDConnector']
+__all__ = [
+    'ProcurementConnector', 'TEDConnector', 'TenderCache', 'CachedConnector',
+    'ConnectorRegistry', 'FederatedConnector'
+]
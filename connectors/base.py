@@ -1,17 +1,87 @@
 """
 Base connector class for all procurement data sources
 """
+import asyncio
+import concurrent.futures
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
 
+from analytics import aggregate
+
+
+# Common tender schema every connector returns
+TENDER_COLUMNS = [
+    'tender_id', 'title', 'country', 'country_name', 'cpv_code', 'cpv_description',
+    'value_eur', 'currency', 'published_date', 'deadline', 'buyer',
+    'procedure_type', 'source', 'url'
+]
+
+# Compact representation: low-cardinality strings become categoricals
+# (Arrow dictionaries), dates int32 days since 1970-01-01 (Arrow date32)
+# and values float32
+COMPACT_CATEGORIES = [
+    'country', 'country_name', 'cpv_code', 'cpv_description', 'currency',
+    'source', 'procedure_type', 'buyer'
+]
+COMPACT_DATES = ['published_date', 'deadline']
+COMPACT_ARROW_SCHEMA = pa.schema([
+    (name, pa.dictionary(pa.int32(), pa.string()) if name in COMPACT_CATEGORIES
+     else pa.date32() if name in COMPACT_DATES
+     else pa.float32() if name == 'value_eur'
+     else pa.string())
+    for name in TENDER_COLUMNS
+])
+
+# Currency symbols, ISO codes, thousands separators and whitespace
+CURRENCY_NOISE = ['€', '$', '£', ',', ' ', '\xa0', 'EUR', 'USD', 'GBP']
+NUMBER_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine to completion from blocking code
+
+    asyncio.run refuses to start inside a running event loop (an async
+    handler or a notebook calling a blocking helper), so there the
+    coroutine runs on its own loop in a worker thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+def _as_series(values) -> pd.Series:
+    """Accept a pandas Series, Arrow array or any sequence"""
+    if isinstance(values, pd.Series):
+        return values
+    if hasattr(values, 'to_pandas'):
+        return values.to_pandas()
+    return pd.Series(values)
+
 
 class ProcurementConnector(ABC):
     """Abstract base class for procurement data connectors"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Most tenders one search can return, however high its limit
+    # (None: unbounded). A search returning this many may be truncated.
+    max_results: Optional[int] = None
+    
+    def __init__(self, api_key: Optional[str] = None, store=None):
+        """
+        Args:
+            api_key: Optional API key for the source
+            store: Optional TenderStore answering statistics from SQL
+        """
         self.api_key = api_key
+        self.store = store
         self.base_url = ""
         self.source_name = ""
     
@@ -28,6 +98,19 @@ class ProcurementConnector(ABC):
         """
         pass
     
+    async def asearch_tenders(self, filters: Dict) -> pd.DataFrame:
+        """
+        Async variant of search_tenders
+        
+        Runs the blocking search in a worker thread by default; connectors
+        with a native async client should override this.
+        """
+        return await asyncio.to_thread(self.search_tenders, filters)
+    
+    async def asearch_awards(self, filters: Dict) -> pd.DataFrame:
+        """Async variant of search_awards"""
+        return await asyncio.to_thread(self.search_awards, filters)
+    
     @abstractmethod
     def get_tender_details(self, tender_id: str) -> Dict:
         """Get detailed information for a specific tender"""
@@ -38,11 +121,34 @@ class ProcurementConnector(ABC):
         """Search for contract awards"""
         pass
     
+    def get_statistics(self, filters: Dict = None) -> Dict:
+        """Get procurement statistics, from the local store when it has matches"""
+        if self.store is not None and self.store.count(filters):
+            return self.store.statistics(filters)
+        tenders = self.search_tenders(filters)
+        if self.store is not None:
+            self.store.ingest(tenders)
+        return self.compute_statistics(tenders)
+    
+    async def aget_statistics(self, filters: Dict = None) -> Dict:
+        """Get procurement statistics without blocking the event loop"""
+        if self.store is not None and await asyncio.to_thread(self.store.count, filters):
+            return await asyncio.to_thread(self.store.statistics, filters)
+        tenders = await self.asearch_tenders(filters)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.ingest, tenders)
+        return self.compute_statistics(tenders)
+    
+    @staticmethod
+    def compute_statistics(tenders: pd.DataFrame) -> Dict:
+        """Summarize a tender frame (see analytics.aggregate)"""
+        return aggregate(tenders).statistics()
+    
     def normalize_date(self, date_str: str) -> datetime:
         """Normalize date strings to datetime objects"""
         try:
             return pd.to_datetime(date_str)
-        except:
+        except (ValueError, TypeError, OverflowError):
             return None
     
     def normalize_value(self, value: any) -> float:
@@ -53,5 +159,139 @@ class ProcurementConnector(ABC):
             # Remove currency symbols and convert
             value_str = str(value).replace('€', '').replace('$', '').replace(',', '')
             return float(value_str)
-        except:
+        except (ValueError, TypeError):
             return 0.0
+    
+    @staticmethod
+    def normalize_dates(values, date_format: str = '%Y-%m-%d') -> Tuple[pd.Series, pd.Series]:
+        """
+        Batch variant of normalize_date
+        
+        Parses the whole column with a fixed format, then retries only the
+        rows that did not match: first as ISO dates with a suffix, then with
+        pandas' per-element parser.
+        
+        Args:
+            values: Series, Arrow array or sequence of date strings
+            date_format: Format expected for the bulk of the rows
+            
+        Returns:
+            (datetime64 Series, boolean error mask); unparseable rows are NaT
+            and flagged, missing values are NaT but not flagged
+        """
+        series = _as_series(values)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series, pd.Series(False, index=series.index)
+        
+        parsed = pd.to_datetime(series, format=date_format, errors='coerce')
+        retry = parsed.isna() & series.notna()
+        if retry.any() and date_format == '%Y-%m-%d':
+            # ISO dates with a time or UTC offset suffix, e.g. 2026-01-15+01:00
+            parsed[retry] = pd.to_datetime(series[retry].astype('string').str[:10], format=date_format, errors='coerce')
+            retry = parsed.isna() & series.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(series[retry], format='mixed', errors='coerce')
+        
+        return parsed, parsed.isna() & series.notna()
+    
+    @staticmethod
+    def normalize_values(values) -> Tuple[pd.Series, pd.Series]:
+        """
+        Batch variant of normalize_value
+        
+        Strips currency symbols, codes and thousands separators with Arrow
+        string kernels and converts the column in a single cast.
+        
+        Args:
+            values: Series, Arrow array or sequence of numbers or currency strings
+            
+        Returns:
+            (float64 Series, boolean error mask); unparseable rows are NaN
+            and flagged, missing values are NaN but not flagged
+        """
+        series = _as_series(values)
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype('float64'), pd.Series(False, index=series.index)
+        
+        cleaned = pa.array(series.astype('string'), type=pa.string(), from_pandas=True)
+        for token in CURRENCY_NOISE:
+            cleaned = pc.replace_substring(cleaned, token, '')
+        valid = pc.match_substring_regex(cleaned, NUMBER_PATTERN)
+        numbers = pc.cast(pc.if_else(valid, cleaned, None), pa.float64())
+        numeric = pd.Series(numbers.to_numpy(zero_copy_only=False), index=series.index)
+        
+        return numeric, numeric.isna() & series.notna()
+    
+    @staticmethod
+    def to_compact(tenders: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compact in-memory form of a tender frame
+        
+        COMPACT_CATEGORIES become pandas categoricals, dates nullable
+        int32 days since 1970-01-01 and value_eur float32 (exact to
+        about 7 significant digits, plenty for estimated values). The
+        result takes a fraction of the memory, groups on integer codes
+        and is accepted by analytics.aggregate, analytics.tender_table
+        and TenderStore.ingest as is.
+        
+        Args:
+            tenders: Frame in the connector schema (dates as strings or
+                datetimes); it is not modified
+            
+        Returns:
+            New frame with the same columns
+        """
+        compact = {}
+        for name in tenders.columns:
+            column = tenders[name]
+            if name in COMPACT_CATEGORIES:
+                if not isinstance(column.dtype, pd.CategoricalDtype):
+                    column = column.astype('category')
+            elif name in COMPACT_DATES:
+                if pd.api.types.is_integer_dtype(column):
+                    column = column.astype('Int32')
+                else:
+                    days = ProcurementConnector.normalize_dates(column)[0].to_numpy().astype('datetime64[D]')
+                    missing = np.isnat(days)
+                    days = np.where(missing, 0, days.astype(np.int64)).astype(np.int32)
+                    column = pd.Series(pd.arrays.IntegerArray(days, missing), index=column.index, name=name)
+            elif name == 'value_eur':
+                column = ProcurementConnector.normalize_values(column)[0].astype('float32')
+            compact[name] = column
+        return pd.DataFrame(compact, index=tenders.index, copy=False)
+    
+    @staticmethod
+    def from_compact(compact: pd.DataFrame) -> pd.DataFrame:
+        """
+        Back to the connector schema: object-free strings, 'YYYY-MM-DD'
+        dates and float64 values
+        """
+        tenders = {}
+        for name in compact.columns:
+            column = compact[name]
+            if name in COMPACT_CATEGORIES and isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype('str').where(column.notna(), None)
+            elif name in COMPACT_DATES and pd.api.types.is_integer_dtype(column):
+                days = column.to_numpy(dtype='float64', na_value=np.nan)
+                column = pd.Series(pd.to_datetime(days, unit='D'), index=column.index).dt.strftime('%Y-%m-%d')
+            elif name == 'value_eur':
+                column = column.astype('float64')
+            tenders[name] = column
+        return pd.DataFrame(tenders, index=compact.index, copy=False)
+    
+    @staticmethod
+    def to_compact_arrow(tenders: pd.DataFrame) -> pa.Table:
+        """
+        Arrow form of to_compact: dictionary-encoded strings, date32 and
+        float32 (COMPACT_ARROW_SCHEMA), for zero-copy hand-off to DuckDB
+        or Parquet
+        """
+        compact = ProcurementConnector.to_compact(tenders.reindex(columns=TENDER_COLUMNS))
+        arrays = []
+        for field in COMPACT_ARROW_SCHEMA:
+            column = compact[field.name]
+            if field.name in COMPACT_DATES:
+                arrays.append(pa.array(column, type=pa.int32(), from_pandas=True).cast(pa.date32()))
+            else:
+                arrays.append(pa.array(column, type=field.type, from_pandas=True))
+        return pa.Table.from_arrays(arrays, schema=COMPACT_ARROW_SCHEMA)
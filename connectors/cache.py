@@ -0,0 +1,238 @@
+"""
+Persistent on-disk tender cache
+Stores search results as Parquet files so repeated dashboard loads skip upstream
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from .base import ProcurementConnector
+from .transport import UpstreamError
+
+
+class TenderCache:
+    """
+    Parquet-backed cache of search results keyed by normalized filters.
+
+    Entries younger than ttl_hours are fresh. Entries older than that but
+    younger than max_age_hours are stale: they are still served while the
+    caller refreshes them. Each file's mtime records when it was written
+    and its atime when it was last read, which drives LRU eviction once
+    the directory grows past max_size_mb. Where atime can't be set on an
+    open file (Windows), reads are only remembered by this process.
+    """
+
+    def __init__(self, directory: str = "cache", ttl_hours: float = 6,
+                 max_age_hours: float = 24, max_size_mb: float = 512):
+        self.directory = Path(directory)
+        self.ttl = ttl_hours * 3600
+        self.max_age = max(max_age_hours, ttl_hours) * 3600
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._read_at: Dict[str, float] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(source: str, filters: Dict) -> str:
+        """Hash a source name and filter dict into a stable cache key"""
+        normalized = {
+            str(k).lower(): str(v).strip().upper() if k == 'country' else str(v).strip()
+            for k, v in (filters or {}).items()
+            if v is not None and v != ''
+        }
+        payload = json.dumps({'source': source, 'filters': normalized}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key: str, allow_expired: bool = False) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        Look up a cached result
+
+        Returns:
+            (DataFrame or None, state) where state is 'fresh', 'stale',
+            'expired' (only with allow_expired) or 'miss'
+        """
+        try:
+            handle = open(self._path(key), 'rb')
+        except FileNotFoundError:
+            return None, 'miss'
+
+        # Work on the open file so a concurrent put() replacing the path
+        # can't have its write time clobbered by our access-time update
+        with handle:
+            written = os.fstat(handle.fileno()).st_mtime
+            age = time.time() - written
+            if age < self.ttl:
+                state = 'fresh'
+            elif age < self.max_age:
+                state = 'stale'
+            elif allow_expired:
+                state = 'expired'
+            else:
+                return None, 'miss'
+
+            try:
+                tenders = pd.read_parquet(handle)
+                now = time.time()
+                self._read_at[key] = now
+                # Record the access for LRU without touching the write time.
+                # Never by path: that could reset a concurrent put()'s mtime.
+                if os.utime in os.supports_fd:
+                    os.utime(handle.fileno(), (now, written))
+            except (OSError, ValueError):
+                return None, 'miss'
+
+        return tenders, state
+
+    def put(self, key: str, tenders: pd.DataFrame):
+        """Store a result, then evict least recently used entries if over budget"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tenders.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently read entries until the cache fits max_size"""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob('*.parquet'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((max(stat.st_atime, self._read_at.get(path.stem, 0.0)), stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_size:
+                    break
+                path.unlink(missing_ok=True)
+                self._read_at.pop(path.stem, None)
+                total -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        for path in self.directory.glob('*.parquet'):
+            path.unlink(missing_ok=True)
+        self._read_at.clear()
+
+
+class CachedConnector(ProcurementConnector):
+    """
+    Cache layer in front of another ProcurementConnector
+
+    Fresh hits are served from disk, stale hits are served immediately
+    while a background refresh replaces them, and misses go upstream.
+    When upstream is down (UpstreamError, including an open circuit) the
+    last cached result is served however old it is.
+    Attributes not defined here are delegated to the wrapped connector.
+    """
+
+    def __init__(self, connector: ProcurementConnector, cache: TenderCache):
+        super().__init__(connector.api_key, connector.store)
+        self.connector = connector
+        self.cache = cache
+        self.base_url = connector.base_url
+        self.source_name = connector.source_name
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._tasks = set()
+
+    def __getattr__(self, name):
+        if name == 'connector':
+            raise AttributeError(name)
+        return getattr(self.connector, name)
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key: str):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    def search_tenders(self, filters: Dict = None) -> pd.DataFrame:
+        """Search with caching"""
+        filters = filters or {}
+        key = self.cache.make_key(self.source_name, filters)
+        tenders, state = self.cache.get(key)
+
+        if state == 'stale' and self._claim_refresh(key):
+            def refresh():
+                try:
+                    self.cache.put(key, self.connector.search_tenders(filters))
+                except UpstreamError as e:
+                    print(f"Cache refresh failed ({self.source_name}): {e}")
+                finally:
+                    self._release_refresh(key)
+            threading.Thread(target=refresh, daemon=True).start()
+
+        if tenders is not None:
+            return tenders
+
+        try:
+            tenders = self.connector.search_tenders(filters)
+        except UpstreamError:
+            tenders, _ = self.cache.get(key, allow_expired=True)
+            if tenders is None:
+                raise
+            return tenders
+        self.cache.put(key, tenders)
+        return tenders
+
+    async def asearch_tenders(self, filters: Dict = None) -> pd.DataFrame:
+        """Search with caching without blocking the event loop"""
+        filters = filters or {}
+        key = self.cache.make_key(self.source_name, filters)
+        tenders, state = await asyncio.to_thread(self.cache.get, key)
+
+        if state == 'stale' and self._claim_refresh(key):
+            async def refresh():
+                try:
+                    fresh = await self.connector.asearch_tenders(filters)
+                    await asyncio.to_thread(self.cache.put, key, fresh)
+                except UpstreamError as e:
+                    print(f"Cache refresh failed ({self.source_name}): {e}")
+                finally:
+                    self._release_refresh(key)
+            task = asyncio.create_task(refresh())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if tenders is not None:
+            return tenders
+
+        try:
+            tenders = await self.connector.asearch_tenders(filters)
+        except UpstreamError:
+            tenders, _ = await asyncio.to_thread(self.cache.get, key, True)
+            if tenders is None:
+                raise
+            return tenders
+        await asyncio.to_thread(self.cache.put, key, tenders)
+        return tenders
+
+    def search_awards(self, filters: Dict = None) -> pd.DataFrame:
+        """Search for contract awards with caching"""
+        return self.search_tenders({**(filters or {}), 'notice_type': 'award'})
+
+    async def asearch_awards(self, filters: Dict = None) -> pd.DataFrame:
+        """Search for contract awards with caching without blocking the event loop"""
+        return await self.asearch_tenders({**(filters or {}), 'notice_type': 'award'})
+
+    def get_tender_details(self, tender_id: str) -> Dict:
+        """Get detailed information for a specific tender"""
+        return self.connector.get_tender_details(tender_id)
@@ -0,0 +1,40 @@
+"""
+Shared outbound HTTP client
+One pooled, keep-alive AsyncClient per application for connectors and OAuth
+"""
+import importlib.util
+
+import httpx
+
+
+def http2_available() -> bool:
+    """Whether the optional h2 package (httpx[http2]) is installed"""
+    return importlib.util.find_spec('h2') is not None
+
+
+def create_http_client(max_connections: int = 100, max_keepalive_connections: int = 20,
+                       keepalive_expiry: float = 30.0, timeout: float = 30.0,
+                       connect_timeout: float = 5.0, http2: bool = True) -> httpx.AsyncClient:
+    """
+    Pooled AsyncClient meant to live as long as the application
+
+    Connections to each host are kept alive between requests, so only
+    the first call to an upstream pays for the TCP and TLS handshakes.
+    With HTTP/2 (used when h2 is installed) concurrent requests to one
+    host share a single connection.
+
+    Args:
+        max_connections: Open connections across all hosts
+        max_keepalive_connections: Idle connections kept for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        timeout: Default read/write/pool timeout in seconds
+        connect_timeout: Seconds to establish a connection
+        http2: Negotiate HTTP/2 where the server and h2 allow it
+    """
+    return httpx.AsyncClient(
+        http2=http2 and http2_available(),
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_keepalive_connections,
+                            keepalive_expiry=keepalive_expiry),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout)
+    )
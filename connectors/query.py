@@ -0,0 +1,240 @@
+"""
+Search filter AST and compilers
+Pushes every predicate TED can express into its expert query; the rest run locally
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+
+# ISO 3166 alpha-2 -> alpha-3, as TED expert search expects
+ISO3_COUNTRIES = {
+    'AT': 'AUT', 'BE': 'BEL', 'BG': 'BGR', 'CY': 'CYP', 'CZ': 'CZE', 'DE': 'DEU',
+    'DK': 'DNK', 'EE': 'EST', 'ES': 'ESP', 'FI': 'FIN', 'FR': 'FRA', 'GR': 'GRC',
+    'HR': 'HRV', 'HU': 'HUN', 'IE': 'IRL', 'IT': 'ITA', 'LT': 'LTU', 'LU': 'LUX',
+    'LV': 'LVA', 'MT': 'MLT', 'NL': 'NLD', 'PL': 'POL', 'PT': 'PRT', 'RO': 'ROU',
+    'SE': 'SWE', 'SI': 'SVN', 'SK': 'SVK', 'NO': 'NOR', 'CH': 'CHE', 'IS': 'ISL',
+    'LI': 'LIE', 'UK': 'GBR', 'GB': 'GBR'
+}
+
+# Tender column -> TED expert search field
+TED_FIELDS = {
+    'country': 'buyer-country',
+    'cpv_code': 'classification-cpv',
+    'value_eur': 'estimated-value-lot',
+    'published_date': 'publication-date',
+    'deadline': 'deadline-receipt-tender-date-lot',
+    'title': 'FT',
+}
+
+DATE_COLUMNS = ('published_date', 'deadline')
+
+
+@dataclass(frozen=True)
+class In:
+    """column is one of values"""
+    column: str
+    values: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Prefix:
+    """column starts with any of prefixes"""
+    column: str
+    prefixes: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Range:
+    """low <= column <= high (either bound optional)"""
+    column: str
+    low: Optional[Union[float, str]] = None
+    high: Optional[Union[float, str]] = None
+
+
+@dataclass(frozen=True)
+class Contains:
+    """column contains text (case-insensitive)"""
+    column: str
+    text: str
+
+
+Predicate = Union[In, Prefix, Range, Contains]
+
+
+def as_list(value) -> List[str]:
+    """Accept a list, tuple or comma-separated string"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        items = value
+    else:
+        items = str(value).split(',')
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def parse_filters(filters: Optional[Dict]) -> List[Predicate]:
+    """
+    Translate a search filter dict into a conjunction of predicates
+
+    Supported keys: country, cpv_code, procedure_type (single values,
+    lists or comma-separated), min_value/max_value,
+    published_from/published_to, deadline_from/deadline_to, keywords and
+    buyer. Other keys (limit, notice_type) are not predicates.
+    """
+    filters = filters or {}
+    predicates = []
+
+    countries = [c.upper() for c in as_list(filters.get('country'))]
+    if countries:
+        predicates.append(In('country', tuple(countries)))
+    prefixes = as_list(filters.get('cpv_code'))
+    if prefixes:
+        predicates.append(Prefix('cpv_code', tuple(prefixes)))
+    procedures = as_list(filters.get('procedure_type'))
+    if procedures:
+        predicates.append(In('procedure_type', tuple(procedures)))
+
+    for column, low_key, high_key, cast in (
+        ('value_eur', 'min_value', 'max_value', float),
+        ('published_date', 'published_from', 'published_to', str),
+        ('deadline', 'deadline_from', 'deadline_to', str),
+    ):
+        low, high = filters.get(low_key), filters.get(high_key)
+        if low is not None or high is not None:
+            predicates.append(Range(
+                column,
+                cast(low) if low is not None else None,
+                cast(high) if high is not None else None
+            ))
+
+    if filters.get('keywords'):
+        predicates.append(Contains('title', str(filters['keywords'])))
+    if filters.get('buyer'):
+        predicates.append(Contains('buyer', str(filters['buyer'])))
+
+    return predicates
+
+
+def _ted_date(value: str) -> str:
+    return str(value).replace('-', '')[:8]
+
+
+def _ted_number(value: float) -> str:
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def _ted_term(predicate: Predicate) -> Optional[str]:
+    """Expert-search term for one predicate, or None if TED cannot express it"""
+    field = TED_FIELDS.get(predicate.column)
+    if field is None:
+        return None
+
+    if isinstance(predicate, In):
+        if not all(c in ISO3_COUNTRIES for c in predicate.values):
+            return None
+        return f"{field} IN ({' '.join(ISO3_COUNTRIES[c] for c in predicate.values)})"
+
+    if isinstance(predicate, Prefix):
+        # TED matches CPV codes with trailing wildcards
+        return f"{field} IN ({' '.join(p + '*' for p in predicate.prefixes)})"
+
+    if isinstance(predicate, Range):
+        render = _ted_date if predicate.column in DATE_COLUMNS else _ted_number
+        parts = []
+        if predicate.low is not None:
+            parts.append(f'{field}>={render(predicate.low)}')
+        if predicate.high is not None:
+            parts.append(f'{field}<={render(predicate.high)}')
+        return ' AND '.join(parts)
+
+    if isinstance(predicate, Contains) and predicate.column == 'title':
+        text = predicate.text.replace('"', '')
+        return f'{field}~"{text}"'
+
+    return None
+
+
+def compile_ted(predicates: List[Predicate]) -> Tuple[Optional[str], List[Predicate]]:
+    """
+    Compile predicates into a TED expert query
+
+    Returns:
+        (query string or None, residual predicates that must be applied
+        locally with apply_local)
+    """
+    terms, residual = [], []
+    for predicate in predicates:
+        term = _ted_term(predicate)
+        if term is None:
+            residual.append(predicate)
+        else:
+            terms.append(term)
+    return (' AND '.join(terms) if terms else None), residual
+
+
+def _like_literal(text: str) -> str:
+    """Escape LIKE wildcards so text matches literally (with ESCAPE '\\')"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def compile_sql(predicates: List[Predicate]) -> Tuple[str, List]:
+    """
+    Compile predicates into a parameterized SQL WHERE clause
+
+    Matches exactly what apply_local keeps: In is case-insensitive and
+    Contains matches its text literally.
+    """
+    clauses, params = [], []
+    for predicate in predicates:
+        column = predicate.column
+        if isinstance(predicate, In):
+            clauses.append(f"upper({column}) IN ({', '.join('?' for _ in predicate.values)})")
+            params.extend(value.upper() for value in predicate.values)
+        elif isinstance(predicate, Prefix):
+            clauses.append('(' + ' OR '.join(f'starts_with({column}, ?)' for _ in predicate.prefixes) + ')')
+            params.extend(predicate.prefixes)
+        elif isinstance(predicate, Range):
+            cast = 'CAST(? AS DATE)' if column in DATE_COLUMNS else '?'
+            if predicate.low is not None:
+                clauses.append(f'{column} >= {cast}')
+                params.append(predicate.low)
+            if predicate.high is not None:
+                clauses.append(f'{column} <= {cast}')
+                params.append(predicate.high)
+        elif isinstance(predicate, Contains):
+            clauses.append(f"{column} ILIKE ? ESCAPE '\\'")
+            params.append(f'%{_like_literal(predicate.text)}%')
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def apply_local(tenders: pd.DataFrame, predicates: List[Predicate]) -> pd.DataFrame:
+    """Filter a tender frame by predicates upstream could not evaluate"""
+    if not predicates or len(tenders) == 0:
+        return tenders
+
+    mask = pd.Series(True, index=tenders.index)
+    for predicate in predicates:
+        column = tenders[predicate.column] if predicate.column in tenders.columns else None
+        if column is None:
+            continue
+        if isinstance(predicate, In):
+            mask &= column.astype(str).str.upper().isin([v.upper() for v in predicate.values])
+        elif isinstance(predicate, Prefix):
+            mask &= column.astype(str).str.startswith(predicate.prefixes)
+        elif isinstance(predicate, Range):
+            if predicate.column in DATE_COLUMNS:
+                column = pd.to_datetime(column, errors='coerce')
+                low = pd.Timestamp(predicate.low) if predicate.low is not None else None
+                high = pd.Timestamp(predicate.high) if predicate.high is not None else None
+            else:
+                low, high = predicate.low, predicate.high
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        elif isinstance(predicate, Contains):
+            mask &= column.astype(str).str.contains(predicate.text, case=False, regex=False)
+
+    return tenders[mask]
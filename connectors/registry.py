@@ -0,0 +1,172 @@
+"""
+Connector registry and federated multi-source search
+"""
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from .base import ProcurementConnector, TENDER_COLUMNS, run_sync
+from .cache import TenderCache, CachedConnector
+from .ted_eu import TEDConnector
+from .transport import ResilientTransport
+
+
+# config.yml source name -> connector class
+CONNECTOR_CLASSES = {
+    'ted_eu': TEDConnector,
+}
+
+
+class ConnectorRegistry:
+    """
+    Every enabled ProcurementConnector built from config.yml
+
+    `sources` holds the raw connectors (used by the delta sync) and
+    `connectors` the ones searches should go through, which are wrapped
+    in a CachedConnector when caching is enabled. All sources share one
+    ResilientTransport, so rate limits and circuit breakers are per host.
+    """
+
+    def __init__(self, sources: Dict[str, ProcurementConnector],
+                 connectors: Optional[Dict[str, ProcurementConnector]] = None,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 transport: Optional[ResilientTransport] = None):
+        self.sources = sources
+        self.connectors = connectors or dict(sources)
+        self.timeouts = timeouts or {}
+        self.transport = transport
+
+    @classmethod
+    def from_config(cls, config: Dict, store=None, live: bool = False,
+                    base_dir: Optional[Path] = None, default_timeout: float = 10.0) -> 'ConnectorRegistry':
+        """
+        Build connectors for every enabled source in config
+
+        Sources without a registered connector class are skipped with a
+        warning rather than failing startup.
+        """
+        base_dir = Path(base_dir or '.')
+        cache_config = config.get('cache', {})
+        transport = ResilientTransport(**(config.get('transport') or {}))
+        sources, connectors, timeouts = {}, {}, {}
+
+        for name, source_config in (config.get('sources') or {}).items():
+            if not source_config.get('enabled', False):
+                continue
+            connector_class = CONNECTOR_CLASSES.get(name)
+            if connector_class is None:
+                print(f"Skipping source '{name}': no connector registered")
+                continue
+
+            connector = connector_class(api_key=source_config.get('api_key'), live=live,
+                                        store=store, transport=transport)
+            if source_config.get('api_url'):
+                connector.base_url = source_config['api_url']
+            sources[name] = connector
+            timeouts[name] = source_config.get('timeout_seconds', default_timeout)
+
+            if cache_config.get('enabled', True):
+                connector = CachedConnector(connector, TenderCache(
+                    directory=str(base_dir / cache_config.get('directory', 'cache')),
+                    ttl_hours=source_config.get('cache_hours', 6),
+                    max_age_hours=cache_config.get('max_age_hours', 24),
+                    max_size_mb=cache_config.get('max_size_mb', 512)
+                ))
+            connectors[name] = connector
+
+        return cls(sources, connectors, timeouts, transport)
+
+    def __getitem__(self, name: str) -> ProcurementConnector:
+        return self.connectors[name]
+
+    def __iter__(self):
+        return iter(self.connectors)
+
+    def __len__(self):
+        return len(self.connectors)
+
+    def use_client(self, client):
+        """Route every source's upstream requests through one shared httpx.AsyncClient"""
+        for connector in self.sources.values():
+            if hasattr(connector, 'use_client'):
+                connector.use_client(client)
+
+    async def aclose(self):
+        """Close pooled clients the raw connectors created themselves"""
+        for connector in self.sources.values():
+            if hasattr(connector, 'aclose'):
+                await connector.aclose()
+
+
+class FederatedConnector(ProcurementConnector):
+    """
+    Searches every registered source concurrently and merges the results
+
+    Each source gets its own timeout. A source that times out or fails is
+    left out of the merged frame and reported in the per-source status,
+    so one slow upstream never holds back the others.
+    """
+
+    def __init__(self, registry: ConnectorRegistry, store=None):
+        super().__init__(store=store)
+        self.registry = registry
+        self.source_name = 'Federated'
+
+    async def _fan_out(self, method: str, filters: Dict) -> Tuple[pd.DataFrame, Dict]:
+        async def run(name: str):
+            started = time.perf_counter()
+            timeout = self.registry.timeouts.get(name)
+            try:
+                tenders = await asyncio.wait_for(
+                    getattr(self.registry[name], method)(dict(filters)), timeout
+                )
+                status = {'status': 'ok', 'rows': len(tenders)}
+            except asyncio.TimeoutError:
+                tenders, status = None, {'status': 'timeout', 'rows': 0}
+            except Exception as e:
+                tenders, status = None, {'status': 'error', 'rows': 0, 'error': str(e)}
+            status['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            return name, tenders, status
+
+        results = await asyncio.gather(*(run(name) for name in self.registry))
+        return self.merge([t for _, t, _ in results]), {name: status for name, _, status in results}
+
+    @staticmethod
+    def merge(frames) -> pd.DataFrame:
+        """Concatenate per-source frames into the common tender schema"""
+        frames = [f for f in frames if f is not None and len(f)]
+        if not frames:
+            return pd.DataFrame(columns=TENDER_COLUMNS)
+        merged = pd.concat([f.reindex(columns=TENDER_COLUMNS) for f in frames], ignore_index=True)
+        return merged.drop_duplicates('tender_id', keep='first').reset_index(drop=True)
+
+    async def asearch_with_status(self, filters: Dict = None) -> Tuple[pd.DataFrame, Dict]:
+        """Federated search returning the merged frame and per-source status"""
+        return await self._fan_out('asearch_tenders', filters or {})
+
+    async def asearch_tenders(self, filters: Dict = None) -> pd.DataFrame:
+        """Federated search across all sources"""
+        return (await self._fan_out('asearch_tenders', filters or {}))[0]
+
+    async def asearch_awards(self, filters: Dict = None) -> pd.DataFrame:
+        """Federated award search across all sources"""
+        return (await self._fan_out('asearch_awards', filters or {}))[0]
+
+    def search_tenders(self, filters: Dict = None) -> pd.DataFrame:
+        """Blocking federated search for scripts"""
+        return run_sync(self.asearch_tenders(filters))
+
+    def search_awards(self, filters: Dict = None) -> pd.DataFrame:
+        """Blocking federated award search for scripts"""
+        return run_sync(self.asearch_awards(filters))
+
+    def get_tender_details(self, tender_id: str) -> Dict:
+        """Ask each source in turn for a tender's details"""
+        for name in self.registry:
+            details = self.registry[name].get_tender_details(tender_id)
+            if details:
+                return details
+        return {}
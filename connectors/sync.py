@@ -0,0 +1,172 @@
+"""
+Incremental delta sync of connector notices into the local TenderStore
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from .base import ProcurementConnector
+
+
+class TenderSync:
+    """
+    Background job pulling only new or amended notices from a connector
+
+    Each run asks the connector for notices published since the stored
+    high-water mark (minus overlap_days, so late amendments to recent
+    notices are picked up), upserts them into the store and advances the
+    watermark. The first run backfills initial_days.
+
+    Days are first requested with batch_limit; a day that fills it is
+    requested again with a larger limit until it comes back short. A day
+    still full at the connector's max_results is truncated: the
+    watermark is held before it, so every run re-reads it, and it is
+    reported in last_error and status().
+
+    With a leader_lock (storage.FileLock) shared by every worker process,
+    only the worker holding it syncs; the others stand by and try to take
+    it over each interval, e.g. after the leader exits.
+    """
+
+    def __init__(self, connector: ProcurementConnector, store, interval_minutes: float = 30,
+                 overlap_days: int = 1, initial_days: int = 30, batch_limit: int = 1000,
+                 leader_lock=None):
+        self.connector = connector
+        self.store = store
+        self.interval = interval_minutes * 60
+        self.overlap_days = overlap_days
+        self.initial_days = initial_days
+        self.batch_limit = batch_limit
+        self.leader_lock = leader_lock
+        self.last_error: Optional[str] = None
+        self.truncated_days: List[date] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def source(self) -> str:
+        return self.connector.source_name
+
+    async def run_once(self) -> Dict:
+        """Fetch and upsert everything published since the watermark"""
+        watermark = await asyncio.to_thread(self.store.get_watermark, self.source)
+        last_published = watermark['last_published'] if watermark else None
+        last_notice_id = watermark['last_notice_id'] if watermark else None
+        if last_published is None:
+            day = date.today() - timedelta(days=self.initial_days)
+        else:
+            day = last_published - timedelta(days=self.overlap_days)
+        rows = 0
+        truncated = []
+        notice_ids = {}
+
+        # One publication day per request keeps the window exact no matter
+        # how upstream orders its results
+        while day <= date.today():
+            batch, complete = await self._fetch_day(day)
+            if not complete:
+                truncated.append(day)
+                print(f"Sync warning ({self.source}): {day} has more than "
+                      f"{self.connector.max_results} notices; holding the watermark before it")
+
+            if len(batch):
+                rows += await asyncio.to_thread(self.store.ingest, batch)
+                notice_ids[day] = str(batch['tender_id'].max())
+                if last_published is None or day >= last_published:
+                    last_published = day
+                    last_notice_id = notice_ids[day]
+
+            day += timedelta(days=1)
+
+        if truncated and last_published is not None and last_published >= truncated[0]:
+            # Never move past a day that was only partly read
+            last_published = truncated[0] - timedelta(days=1)
+            last_notice_id = notice_ids.get(last_published)
+        await asyncio.to_thread(
+            self.store.set_watermark, self.source, last_published, last_notice_id, datetime.now(), rows
+        )
+        self.truncated_days = truncated
+        self.last_error = (
+            f"{len(truncated)} day(s) truncated at {self.connector.max_results} notices, "
+            f"first {truncated[0].isoformat()}" if truncated else None
+        )
+        return {'source': self.source, 'rows': rows, 'last_published': last_published,
+                'truncated_days': [d.isoformat() for d in truncated]}
+
+    async def _fetch_day(self, day: date):
+        """
+        Every notice published on day, as far as the connector allows
+
+        Returns:
+            (notices, complete): complete is False when the day still
+            filled max_results, so some notices were left upstream
+        """
+        limit, cap = self.batch_limit, self.connector.max_results
+        while True:
+            batch = await self.connector.asearch_tenders({
+                'published_from': day.isoformat(),
+                'published_to': day.isoformat(),
+                'limit': limit
+            })
+            if len(batch) < limit:
+                return batch, True
+            if cap is not None and limit >= cap:
+                return batch, False
+            # Busy day: ask again for more, up to what the connector can return
+            limit = limit * 4 if cap is None else min(limit * 4, cap)
+
+    async def run_forever(self):
+        """Run a sync every interval until cancelled"""
+        while True:
+            if self.leading or self.leader_lock.acquire_nowait():
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"Sync error ({self.source}): {e}")
+            await asyncio.sleep(self.interval)
+
+    @property
+    def leading(self) -> bool:
+        """Whether this process runs the sync (always, without a leader_lock)"""
+        return self.leader_lock is None or self.leader_lock.held
+
+    def start(self):
+        """Start the background job on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        """Cancel the background job"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader_lock is not None:
+            self.leader_lock.release()
+
+    def status(self) -> Dict:
+        """Watermark and lag metrics for monitoring"""
+        watermark = self.store.get_watermark(self.source) or {}
+        synced_at = watermark.get('last_synced_at')
+        last_published = watermark.get('last_published')
+        now = datetime.now()
+
+        return {
+            'source': self.source,
+            'running': self._task is not None and not self._task.done(),
+            'leader': self.leading,
+            'last_synced_at': synced_at.isoformat() if synced_at else None,
+            'last_published': last_published.isoformat() if last_published else None,
+            'last_notice_id': watermark.get('last_notice_id'),
+            'rows_synced': watermark.get('rows_synced', 0),
+            # Time since the last successful run, and age of the newest notice
+            'sync_lag_seconds': (now - synced_at).total_seconds() if synced_at else None,
+            'data_lag_days': (now.date() - last_published).days if last_published else None,
+            'truncated_days': [d.isoformat() for d in self.truncated_days],
+            'last_error': self.last_error
+        }
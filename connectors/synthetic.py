@@ -0,0 +1,321 @@
+"""
+Synthetic tender generator
+Seeded, vectorized sample data for demos and production-scale load tests
+"""
+import hashlib
+import json
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .query import as_list
+
+
+COUNTRY_NAMES = {
+    'DE': 'Germany', 'FR': 'France', 'ES': 'Spain', 'IT': 'Italy',
+    'NL': 'Netherlands', 'BE': 'Belgium', 'PL': 'Poland',
+    'SE': 'Sweden', 'AT': 'Austria', 'DK': 'Denmark'
+}
+
+# Rough share of EU notices published by each country
+COUNTRY_WEIGHTS = [0.22, 0.20, 0.10, 0.10, 0.06, 0.05, 0.13, 0.05, 0.05, 0.04]
+
+CPV_CATEGORIES = {
+    '48000000': 'Software package and information systems',
+    '72000000': 'IT services: consulting, software development',
+    '30200000': 'Computer equipment and supplies',
+    '45000000': 'Construction work',
+    '79000000': 'Business services',
+    '85000000': 'Health and social work services',
+    '90000000': 'Sewage, refuse, cleaning services'
+}
+
+# Median contract value (EUR) per category; construction runs larger
+CPV_MEDIAN_VALUES = [900_000, 700_000, 300_000, 2_500_000, 400_000, 600_000, 800_000]
+
+TITLE_TEMPLATES = [
+    "Supply and implementation of {service}",
+    "Framework agreement for {service}",
+    "Provision of {service}",
+    "{service} - Multi-year contract",
+    "Consulting services for {service}"
+]
+
+SERVICES = [
+    "cloud computing infrastructure",
+    "enterprise resource planning system",
+    "cybersecurity services",
+    "data analytics platform",
+    "digital transformation",
+    "AI/ML solutions",
+    "electronic procurement system",
+    "healthcare IT system"
+]
+
+PROCEDURE_TYPES = ['Open', 'Restricted', 'Negotiated']
+PROCEDURE_WEIGHTS = [0.70, 0.18, 0.12]
+
+MIN_VALUE = 10_000
+MAX_VALUE = 500_000_000
+# Spread of log(value) around the category median (log-logistic scale)
+VALUE_SPREAD = 0.6
+
+DEFAULT_WINDOW_DAYS = 30
+DEADLINE_MIN_DAYS = 30
+DEADLINE_MAX_DAYS = 90
+
+# Rows are drawn in fixed blocks, each from its own seed, so a row's
+# content depends on its index and never on how many rows were asked for
+ROW_BLOCK = 8192
+# Independent uniform draws per row: country, CPV, value, publication day,
+# deadline, title, procedure type
+DRAWS_PER_ROW = 7
+
+SCHEMA = pa.schema([
+    ('tender_id', pa.string()),
+    ('title', pa.string()),
+    ('country', pa.string()),
+    ('country_name', pa.string()),
+    ('cpv_code', pa.string()),
+    ('cpv_description', pa.string()),
+    ('value_eur', pa.int64()),
+    ('currency', pa.string()),
+    ('published_date', pa.string()),
+    ('deadline', pa.string()),
+    ('buyer', pa.string()),
+    ('procedure_type', pa.string()),
+    ('source', pa.string()),
+    ('url', pa.string()),
+])
+
+
+def filter_namespace(filters: Optional[Dict], seed: int = 0, window: tuple = ()) -> str:
+    """
+    Stable 16-hex-digit namespace for a generated notice set
+
+    Hashes everything that shapes the rows (seed, filters other than
+    'limit', and the resolved publication window) into 64 bits. Tender ids
+    carry it, so different requests never share an id, and one id always
+    names the same row however many rows were generated.
+    """
+    relevant = {k: str(v) for k, v in (filters or {}).items() if k != 'limit' and v is not None}
+    key = json.dumps({'seed': seed, 'filters': relevant, 'window': [str(d) for d in window]}, sort_keys=True)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _uniforms(namespace: str, start: int, n: int) -> np.ndarray:
+    """
+    DRAWS_PER_ROW uniform draws for rows start..start+n, one row per column
+
+    Each ROW_BLOCK of rows has its own generator seeded by the namespace and
+    block number, so slicing any range of rows reproduces the same draws.
+    """
+    if n <= 0:
+        return np.empty((DRAWS_PER_ROW, 0))
+    first_block, last_block = start // ROW_BLOCK, (start + n - 1) // ROW_BLOCK
+    draws = np.concatenate([
+        np.random.default_rng([int(namespace, 16), block]).random((ROW_BLOCK, DRAWS_PER_ROW))
+        for block in range(first_block, last_block + 1)
+    ])
+    offset = start - first_block * ROW_BLOCK
+    return draws[offset:offset + n].T
+
+
+def _weighted(u: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Indices drawn with the given weights, by inverting the cumulative weights"""
+    cumulative = np.cumsum(weights / weights.sum())
+    return np.minimum(np.searchsorted(cumulative, u, side='right'), len(weights) - 1)
+
+
+def _take(values, codes) -> pa.Array:
+    """Expand small lookup lists by integer codes without Python loops"""
+    return pa.array(values, type=pa.string()).take(pa.array(codes))
+
+
+def _log_logistic(u: np.ndarray, medians: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Heavy-tailed contract values truncated to [low, high]
+
+    Sampled by inverting the log-logistic CDF between the bounds, so value
+    filters are honored without rejection sampling.
+    """
+    mu = np.log(medians)
+    cdf_low = 1 / (1 + np.exp(-(np.log(low) - mu) / VALUE_SPREAD))
+    cdf_high = 1 / (1 + np.exp(-(np.log(high) - mu) / VALUE_SPREAD))
+    u = cdf_low + u * (cdf_high - cdf_low)
+    u = np.clip(u, 1e-12, 1 - 1e-12)
+    values = np.exp(mu + VALUE_SPREAD * np.log(u / (1 - u)))
+    return np.clip(np.round(values), low, high).astype(np.int64)
+
+
+def generate_table(n: int, filters: Optional[Dict] = None, seed: int = 0,
+                   base_date: Optional[date] = None, id_offset: int = 0,
+                   source: str = 'TED (EU)') -> pa.Table:
+    """
+    Generate n synthetic tenders as an Arrow table
+
+    Filters are honored at generation time, so exactly n matching rows are
+    returned. Supported: country, cpv_code (2-digit division prefixes;
+    both accept lists or comma-separated values),
+    min_value, max_value, published_from, published_to, deadline_from,
+    deadline_to.
+
+    Args:
+        n: Number of tenders
+        filters: Search filters to satisfy
+        seed: Base seed; output is fully determined by seed, filters,
+            base_date and id_offset, and row i is the same for any n
+        base_date: "Today" for the default publication window
+        id_offset: First row number, for generating in chunks
+        source: Value of the source column
+    """
+    filters = filters or {}
+    base_date = base_date or date.today()
+
+    # Publication window, narrowed so the deadline window stays reachable
+    first = base_date - timedelta(days=DEFAULT_WINDOW_DAYS)
+    last = base_date - timedelta(days=1)
+    if filters.get('published_from'):
+        first = date.fromisoformat(str(filters['published_from']))
+    if filters.get('published_to'):
+        last = date.fromisoformat(str(filters['published_to']))
+    if filters.get('deadline_from'):
+        first = max(first, date.fromisoformat(str(filters['deadline_from'])) - timedelta(days=DEADLINE_MAX_DAYS))
+    if filters.get('deadline_to'):
+        last = min(last, date.fromisoformat(str(filters['deadline_to'])) - timedelta(days=DEADLINE_MIN_DAYS))
+    if last < first:
+        return SCHEMA.empty_table()
+
+    namespace = filter_namespace(filters, seed, (first, last))
+    u_country, u_cpv, u_value, u_published, u_deadline, u_title, u_procedure = _uniforms(namespace, id_offset, n)
+
+    # Country
+    countries = list(COUNTRY_NAMES)
+    country_weights = np.array(COUNTRY_WEIGHTS)
+    wanted = [c.upper() for c in as_list(filters.get('country'))]
+    if wanted:
+        known = [c for c in wanted if c in COUNTRY_NAMES]
+        if known:
+            country_weights = np.where(np.isin(countries, known), country_weights, 0.0)
+        else:
+            countries, country_weights = wanted, np.ones(len(wanted))
+    country_codes = _weighted(u_country, country_weights)
+
+    # CPV category
+    cpv_codes = list(CPV_CATEGORIES)
+    cpv_mask = np.ones(len(cpv_codes), dtype=bool)
+    prefixes = tuple(p[:2] for p in as_list(filters.get('cpv_code')))
+    if prefixes:
+        cpv_mask = np.array([c.startswith(prefixes) for c in cpv_codes])
+    if not cpv_mask.any():
+        return SCHEMA.empty_table()
+    cpv_choices = np.flatnonzero(cpv_mask)
+    cpv_idx = cpv_choices[(u_cpv * len(cpv_choices)).astype(np.int64)]
+
+    # Value, skewed per category
+    low = max(float(filters.get('min_value') or MIN_VALUE), 1.0)
+    high = float(filters.get('max_value') or MAX_VALUE)
+    if high < low:
+        return SCHEMA.empty_table()
+    values = _log_logistic(u_value, np.array(CPV_MEDIAN_VALUES, dtype=float)[cpv_idx], low, high)
+
+    # Weekdays carry most publications
+    span = np.arange((last - first).days + 1)
+    weekday = (first.weekday() + span) % 7
+    day_weights = np.where(weekday < 5, 1.0, 0.15)
+    published = span[_weighted(u_published, day_weights)]
+
+    # Deadline 30-90 days after publication, clipped to any deadline filter
+    lower = published + DEADLINE_MIN_DAYS
+    upper = published + DEADLINE_MAX_DAYS
+    if filters.get('deadline_from'):
+        lower = np.maximum(lower, (date.fromisoformat(str(filters['deadline_from'])) - first).days)
+    if filters.get('deadline_to'):
+        upper = np.minimum(upper, (date.fromisoformat(str(filters['deadline_to'])) - first).days)
+    deadline = lower + np.floor(u_deadline * (upper - lower + 1)).astype(np.int64)
+
+    # Only a few hundred distinct days, so format each once and index
+    day_strings = [(first + timedelta(days=int(d))).isoformat() for d in range(int(deadline.max(initial=0)) + 1)]
+
+    # Titles from every template/service combination
+    titles = [t.format(service=s) for t in TITLE_TEMPLATES for s in SERVICES]
+    title_idx = (u_title * len(titles)).astype(np.int64)
+
+    procedure_idx = _weighted(u_procedure, np.array(PROCEDURE_WEIGHTS))
+
+    numbers = pc.cast(pa.array(np.arange(id_offset, id_offset + n, dtype=np.int64)), pa.string())
+    numbers = pc.utf8_lpad(numbers, 7, '0')
+    tender_ids = pc.binary_join_element_wise(f'TED-{namespace}-', numbers, '')
+
+    country_name_list = [COUNTRY_NAMES.get(c, c) for c in countries]
+
+    return pa.Table.from_arrays([
+        tender_ids,
+        _take(titles, title_idx),
+        _take(countries, country_codes),
+        _take(country_name_list, country_codes),
+        _take(cpv_codes, cpv_idx),
+        _take(list(CPV_CATEGORIES.values()), cpv_idx),
+        pa.array(values),
+        pa.repeat(pa.scalar('EUR'), n),
+        _take(day_strings, published),
+        _take(day_strings, deadline),
+        _take([f'{name} Government Agency' for name in country_name_list], country_codes),
+        _take(PROCEDURE_TYPES, procedure_idx),
+        pa.repeat(pa.scalar(source), n),
+        pc.binary_join_element_wise('https://ted.europa.eu/udl?uri=TED:NOTICE:', tender_ids, ''),
+    ], schema=SCHEMA)
+
+
+def generate_tenders(n: int, filters: Optional[Dict] = None, seed: int = 0,
+                     base_date: Optional[date] = None, source: str = 'TED (EU)') -> pd.DataFrame:
+    """Generate n synthetic tenders as a DataFrame in the connector schema"""
+    table = generate_table(n, filters, seed=seed, base_date=base_date, source=source)
+    return table.to_pandas()
+
+
+def iter_tables(n: int, filters: Optional[Dict] = None, seed: int = 0,
+                base_date: Optional[date] = None, chunk_size: int = 1_000_000) -> Iterator[pa.Table]:
+    """Generate n tenders in chunks of at most chunk_size rows"""
+    for offset in range(0, n, chunk_size):
+        yield generate_table(min(chunk_size, n - offset), filters, seed=seed,
+                             base_date=base_date, id_offset=offset)
+
+
+def write_parquet(path: str, n: int, filters: Optional[Dict] = None, seed: int = 0,
+                  base_date: Optional[date] = None, chunk_size: int = 1_000_000) -> int:
+    """
+    Stream n synthetic tenders straight to a Parquet file
+
+    Memory stays bounded by chunk_size, so tens of millions of rows can be
+    written for load tests. Returns the number of rows written.
+    """
+    rows = 0
+    with pq.ParquetWriter(path, SCHEMA) as writer:
+        for table in iter_tables(n, filters, seed=seed, base_date=base_date, chunk_size=chunk_size):
+            writer.write_table(table)
+            rows += table.num_rows
+    return rows
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Write synthetic tenders to Parquet')
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--country')
+    parser.add_argument('--cpv-code')
+    args = parser.parse_args()
+
+    filters = {k: v for k, v in {'country': args.country, 'cpv_code': args.cpv_code}.items() if v}
+    started = time.perf_counter()
+    rows = write_parquet(args.path, args.rows, filters, seed=args.seed)
+    print(f"Wrote {rows:,} tenders to {args.path} in {time.perf_counter() - started:.1f}s")
@@ -2,21 +2,74 @@
 TED (Tenders Electronic Daily) - EU Procurement Connector
 Official EU procurement portal with 600B+ EUR annually
 """
-import requests
+import asyncio
+import math
+import httpx
 import pandas as pd
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-from .base import ProcurementConnector
+from datetime import date
+from .base import ProcurementConnector, run_sync
+from .query import apply_local, compile_ted, parse_filters
+from .transport import ResilientTransport
+from .synthetic import generate_tenders
+
+
+# TED v3 notice fields mapped onto our tender schema
+NOTICE_FIELDS = {
+    'tender_id': 'publication-number',
+    'title': 'notice-title',
+    'country': 'buyer-country',
+    'cpv_code': 'classification-cpv',
+    'value_eur': 'estimated-value-lot',
+    'currency': 'estimated-value-cur-lot',
+    'published_date': 'publication-date',
+    'deadline': 'deadline-receipt-tender-date-lot',
+    'buyer': 'buyer-name',
+    'procedure_type': 'procedure-type',
+}
+
+
+# Sample data volume for date-bounded requests (e.g. delta sync)
+SAMPLE_NOTICES_PER_DAY = 40
+
+# Most notices scanned to fill a limit when some filters run locally
+MAX_SCAN_NOTICES = 15_000
 
 
 class TEDConnector(ProcurementConnector):
     """Connector for TED (EU) procurement data"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        super().__init__(api_key)
+    max_results = MAX_SCAN_NOTICES
+    
+    def __init__(self, api_key: Optional[str] = None, live: bool = False,
+                 page_size: int = 100, max_concurrency: int = 8,
+                 timeout: float = 30.0, client: Optional[httpx.AsyncClient] = None,
+                 store=None, transport: Optional[ResilientTransport] = None):
+        """
+        Args:
+            api_key: Optional TED API key
+            live: Query the TED API instead of returning sample data
+            page_size: Notices requested per page
+            max_concurrency: Maximum number of pages fetched at once
+            timeout: Per-request timeout in seconds
+            client: Shared AsyncClient owned by the caller (one is
+                created lazily, and closed by aclose, when omitted)
+            store: Optional TenderStore answering statistics from SQL
+            transport: Retry/rate-limit/circuit-breaker layer, shareable
+                between connectors hitting the same host
+        """
+        super().__init__(api_key, store)
         self.base_url = "https://api.ted.europa.eu/v3"
         self.source_name = "TED (EU)"
         self.headers = {}
+        self.live = live
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client = client
+        self._owns_client = client is None
+        self.transport = transport or ResilientTransport()
+        self.sample_seed = 0
         
         if api_key:
             self.headers['Authorization'] = f'Bearer {api_key}'
@@ -26,159 +79,228 @@ class TEDConnector(ProcurementConnector):
         Search for EU tenders
         
         Filters:
-            - country: ISO 2-letter country code (e.g., 'DE', 'FR')
-            - cpv_code: Common Procurement Vocabulary code
+            - country: ISO 2-letter country code(s) (e.g., 'DE' or 'DE,FR')
+            - cpv_code: Common Procurement Vocabulary code prefix(es)
             - min_value: Minimum tender value in EUR
             - max_value: Maximum tender value in EUR
             - deadline_from: Start of deadline range (YYYY-MM-DD)
             - deadline_to: End of deadline range (YYYY-MM-DD)
+            - published_from: Earliest publication date (YYYY-MM-DD)
+            - published_to: Latest publication date (YYYY-MM-DD)
             - keywords: Search keywords
+            - procedure_type, buyer: Filtered locally after the fetch
             - limit: Number of results (default 100)
+        
+        Blocking variant for scripts; async handlers should await
+        asearch_tenders() instead.
+        
+        In live mode upstream failures raise transport.UpstreamError
+        (CircuitOpenError while TED is known to be down) instead of
+        quietly returning sample data; CachedConnector turns that into
+        the last cached result.
         """
         filters = filters or {}
         
-        # TED Search API endpoint (public, no auth needed for search)
-        search_url = f"{self.base_url}/notices/search"
+        if not self.live:
+            # Demo mode without the live API
+            return self._get_sample_tenders(filters)
+        
+        async def run():
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                return await self.fetch_tenders(filters, client)
+        
+        return run_sync(run())
+    
+    async def asearch_tenders(self, filters: Dict = None) -> pd.DataFrame:
+        """Search for EU tenders without blocking the event loop"""
+        filters = filters or {}
+        
+        if not self.live:
+            return self._get_sample_tenders(filters)
         
-        # Build query parameters
+        return await self.fetch_tenders(filters)
+    
+    def _build_params(self, filters: Dict) -> Dict:
+        """
+        Translate filters into TED search query parameters
+        
+        Every predicate TED's expert search can express (country and CPV
+        lists, value ranges, date windows, keywords) goes into 'q'; see
+        query.compile_ted. The rest are applied by fetch_tenders.
+        """
         params = {
-            'pageSize': filters.get('limit', 100),
-            'pageNum': 1
+            'pageSize': self.page_size,
+            'fields': ','.join(NOTICE_FIELDS.values())
         }
         
-        # Add filters to query
-        query_parts = []
+        query, _ = compile_ted(parse_filters(filters))
+        if query:
+            params['q'] = query
         
-        if 'country' in filters:
-            query_parts.append(f'BT-05-Lot={filters["country"]}')
+        return params
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency)
+            )
+            self._owns_client = True
+        return self._client
+    
+    def use_client(self, client: Optional[httpx.AsyncClient]):
+        """Send requests through a client owned (and closed) by the caller"""
+        self._client = client
+        self._owns_client = client is None
+    
+    async def aclose(self):
+        """Close the client if this connector created it"""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+    
+    async def fetch_tenders(self, filters: Dict,
+                            client: Optional[httpx.AsyncClient] = None) -> pd.DataFrame:
+        """
+        Fetch every page needed for filters['limit'] concurrently.
         
-        if 'cpv_code' in filters:
-            query_parts.append(f'BT-262-Lot={filters["cpv_code"]}*')
+        All pages are requested at once, bounded by max_concurrency, so a
+        large limit costs roughly one round-trip instead of one per page.
+        Pages are parsed as they arrive and concatenated in page order.
+        Every page goes through self.transport; if one page fails for
+        good the others are cancelled and the error is raised.
         
-        if 'keywords' in filters:
-            query_parts.append(f'*{filters["keywords"]}*')
+        Filters TED cannot express are applied to each page before the
+        limit is counted. While matches fall short, further waves of pages
+        are fetched (sized by the match rate so far) until the limit is
+        filled, the results run out or MAX_SCAN_NOTICES were scanned.
+        """
+        client = client or await self._get_client()
+        limit = filters.get('limit', 100)
+        params = self._build_params(filters)
+        _, residual = compile_ted(parse_filters(filters))
+        max_pages = max(1, MAX_SCAN_NOTICES // self.page_size)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        if 'deadline_from' in filters:
-            query_parts.append(f'BT-131-Lot>={filters["deadline_from"]}')
+        async def fetch(page_num: int):
+            async with semaphore:
+                response = await self.transport.request(
+                    client, 'GET', f"{self.base_url}/notices/search",
+                    params={**params, 'pageNum': page_num},
+                    headers=self.headers
+                )
+            payload = response.json()
+            notices = payload.get('notices', [])
+            # A short page is the last one, as is the page reaching the total
+            total = payload.get('totalNoticeCount')
+            last_page = max(1, math.ceil(total / self.page_size)) if total is not None else None
+            if len(notices) < self.page_size:
+                last_page = min(last_page or page_num, page_num)
+            return page_num, self._parse_notices(notices), last_page
         
-        if 'deadline_to' in filters:
-            query_parts.append(f'BT-131-Lot<={filters["deadline_to"]}')
+        frames, matched, scanned = [], 0, 0
+        next_page, last_page = 1, max_pages
+        num_pages = max(1, math.ceil(limit / self.page_size))
+        while True:
+            pages = await self._fetch_pages(fetch, range(next_page, min(next_page + num_pages, last_page + 1)))
+            for page_num in sorted(pages):
+                frame, page_last = pages[page_num]
+                if page_last is not None:
+                    last_page = min(last_page, page_last)
+                if page_num > last_page:
+                    break
+                scanned += len(frame)
+                frame = apply_local(frame, residual)
+                if len(frame):
+                    frames.append(frame)
+                    matched += len(frame)
+            next_page += num_pages
+            if matched >= limit or next_page > last_page:
+                break
+            # Enough pages for the shortfall at the match rate seen so far
+            rate = matched / scanned if matched else 0.0
+            wanted = math.ceil((limit - matched) / (self.page_size * rate)) if rate else self.max_concurrency
+            num_pages = min(wanted, self.max_concurrency)
         
-        if query_parts:
-            params['q'] = ' AND '.join(query_parts)
+        if not frames:
+            return pd.DataFrame(columns=list(NOTICE_FIELDS) + ['country_name', 'cpv_description', 'source', 'url'])
         
+        return pd.concat(frames, ignore_index=True).head(limit)
+    
+    async def _fetch_pages(self, fetch, page_numbers) -> Dict:
+        """Run fetch for each page number at once; {page_num: (frame, last_page)}"""
+        tasks = [asyncio.ensure_future(fetch(n)) for n in page_numbers]
+        pages = {}
         try:
-            # Note: For demo without API key, return sample data
-            # In production, uncomment the API call below
-            
-            # response = requests.get(search_url, params=params, headers=self.headers, timeout=30)
-            # response.raise_for_status()
-            # data = response.json()
-            
-            # For now, return sample data structure
-            return self._get_sample_tenders(filters)
-            
-        except Exception as e:
-            print(f"TED API Error: {e}")
-            return self._get_sample_tenders(filters)
+            for future in asyncio.as_completed(tasks):
+                page_num, frame, last_page = await future
+                pages[page_num] = (frame, last_page)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return pages
+    
+    def _parse_notices(self, notices: List[Dict]) -> pd.DataFrame:
+        """Map raw TED notices onto the tender schema"""
+        
+        def first(value):
+            # TED returns multilingual dicts and lists for many fields
+            if isinstance(value, dict):
+                value = value.get('eng', next(iter(value.values()), None))
+            if isinstance(value, list):
+                value = value[0] if value else None
+            return value
+        
+        tenders = pd.DataFrame(
+            [{column: first(notice.get(field)) for column, field in NOTICE_FIELDS.items()} for notice in notices],
+            columns=list(NOTICE_FIELDS)
+        )
+        
+        # Normalize whole columns at once
+        tenders['value_eur'] = self.normalize_values(tenders['value_eur'])[0].fillna(0.0)
+        for column in ('published_date', 'deadline'):
+            tenders[column] = self.normalize_dates(tenders[column])[0].dt.strftime('%Y-%m-%d')
+        tenders['currency'] = tenders['currency'].fillna('EUR')
+        tenders['country_name'] = tenders['country']
+        tenders['cpv_description'] = tenders['cpv_code']
+        tenders['source'] = self.source_name
+        tenders['url'] = 'https://ted.europa.eu/en/notice/-/detail/' + tenders['tender_id'].astype(str)
+        
+        return tenders
     
     def _get_sample_tenders(self, filters: Dict = None) -> pd.DataFrame:
         """
         Generate realistic sample tender data
         This simulates TED API response for demo purposes
+        
+        Rows are generated to match the filters, so exactly filters['limit']
+        tenders come back, and the same filters give the same rows each day.
+        Filters the generator can't honour (keywords, buyer, procedure
+        type) are applied afterwards, generating more rows until the limit
+        is filled; generated rows don't depend on how many are asked for.
         """
-        from datetime import timedelta
-        import random
-        
-        # Sample countries
-        countries = ['DE', 'FR', 'ES', 'IT', 'NL', 'BE', 'PL', 'SE', 'AT', 'DK']
-        country_names = {
-            'DE': 'Germany', 'FR': 'France', 'ES': 'Spain', 'IT': 'Italy',
-            'NL': 'Netherlands', 'BE': 'Belgium', 'PL': 'Poland', 
-            'SE': 'Sweden', 'AT': 'Austria', 'DK': 'Denmark'
-        }
+        filters = filters or {}
+        limit = filters.get('limit', 50)
+        available = max(limit, MAX_SCAN_NOTICES)
         
-        # Sample CPV categories
-        cpv_categories = {
-            '48000000': 'Software package and information systems',
-            '72000000': 'IT services: consulting, software development',
-            '30200000': 'Computer equipment and supplies',
-            '45000000': 'Construction work',
-            '79000000': 'Business services',
-            '85000000': 'Health and social work services',
-            '90000000': 'Sewage, refuse, cleaning services'
-        }
+        # A bounded publication window only holds so many notices
+        if filters.get('published_from') and filters.get('published_to'):
+            days = (date.fromisoformat(str(filters['published_to']))
+                    - date.fromisoformat(str(filters['published_from']))).days + 1
+            available = max(days, 0) * SAMPLE_NOTICES_PER_DAY
         
-        # Sample titles
-        title_templates = [
-            "Supply and implementation of {service}",
-            "Framework agreement for {service}",
-            "Provision of {service}",
-            "{service} - Multi-year contract",
-            "Consulting services for {service}"
-        ]
-        
-        services = [
-            "cloud computing infrastructure",
-            "enterprise resource planning system",
-            "cybersecurity services",
-            "data analytics platform",
-            "digital transformation",
-            "AI/ML solutions",
-            "electronic procurement system",
-            "healthcare IT system"
-        ]
-        
-        # Generate sample tenders
-        num_samples = min(filters.get('limit', 50), 100) if filters else 50
-        tenders = []
-        
-        base_date = datetime.now()
-        
-        for i in range(num_samples):
-            country = random.choice(countries)
-            cpv_code = random.choice(list(cpv_categories.keys()))
-            service = random.choice(services)
-            title_template = random.choice(title_templates)
-            
-            # Generate realistic dates
-            published = base_date - timedelta(days=random.randint(1, 30))
-            deadline = published + timedelta(days=random.randint(30, 90))
-            
-            # Generate realistic values
-            value = random.randint(100000, 50000000)
-            
-            tender = {
-                'tender_id': f'TED-{2026000000 + i}',
-                'title': title_template.format(service=service),
-                'country': country,
-                'country_name': country_names[country],
-                'cpv_code': cpv_code,
-                'cpv_description': cpv_categories[cpv_code],
-                'value_eur': value,
-                'currency': 'EUR',
-                'published_date': published.strftime('%Y-%m-%d'),
-                'deadline': deadline.strftime('%Y-%m-%d'),
-                'buyer': f'{country_names[country]} Government Agency',
-                'procedure_type': random.choice(['Open', 'Restricted', 'Negotiated']),
-                'source': 'TED (EU)',
-                'url': f'https://ted.europa.eu/udl?uri=TED:NOTICE:{2026000000 + i}'
-            }
-            
-            # Apply filters
-            if filters:
-                if 'country' in filters and tender['country'] != filters['country']:
-                    continue
-                if 'cpv_code' in filters and not tender['cpv_code'].startswith(filters['cpv_code'][:2]):
-                    continue
-                if 'min_value' in filters and tender['value_eur'] < filters['min_value']:
-                    continue
-                if 'max_value' in filters and tender['value_eur'] > filters['max_value']:
-                    continue
-            
-            tenders.append(tender)
-        
-        return pd.DataFrame(tenders)
+        predicates = parse_filters(filters)
+        num_samples = min(limit, available)
+        while True:
+            tenders = generate_tenders(num_samples, filters, seed=self.sample_seed,
+                                       source=self.source_name)
+            tenders = apply_local(tenders, predicates)
+            if len(tenders) >= limit or num_samples >= available:
+                return tenders.head(limit).reset_index(drop=True)
+            num_samples = min(num_samples * 4, available)
     
     def get_tender_details(self, tender_id: str) -> Dict:
         """Get detailed information for a specific tender"""
@@ -202,24 +324,13 @@ class TEDConnector(ProcurementConnector):
         # Similar to search_tenders but filtered for awards
         return self.search_tenders(filters)
     
-    def get_statistics(self, filters: Dict = None) -> Dict:
-        """Get procurement statistics"""
-        
-        tenders = self.search_tenders(filters)
+    async def asearch_awards(self, filters: Dict = None) -> pd.DataFrame:
+        """Search for contract awards without blocking the event loop"""
         
-        if len(tenders) == 0:
-            return {}
+        filters = dict(filters or {})
+        filters['notice_type'] = 'award'
         
-        return {
-            'total_tenders': len(tenders),
-            'total_value': tenders['value_eur'].sum(),
-            'average_value': tenders['value_eur'].mean(),
-            'min_value': tenders['value_eur'].min(),
-            'max_value': tenders['value_eur'].max(),
-            'countries': tenders['country'].nunique(),
-            'top_countries': tenders.groupby('country_name')['value_eur'].sum().sort_values(ascending=False).head(5).to_dict(),
-            'top_categories': tenders.groupby('cpv_description')['tender_id'].count().sort_values(ascending=False).head(5).to_dict()
-        }
+        return await self.asearch_tenders(filters)
 
 
 # Quick test
@@ -0,0 +1,264 @@
+"""
+Resilient HTTP transport for upstream procurement APIs
+Retries with jittered backoff, per-host rate limiting and circuit breaking
+"""
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+
+# Worth retrying: throttling and transient gateway/server failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    """An upstream API could not answer after retries"""
+
+
+class CircuitOpenError(UpstreamError):
+    """Upstream is failing; the request was rejected without being sent"""
+
+
+class UpstreamRejected(UpstreamError):
+    """Upstream refused the request with a status not worth retrying (e.g. 400)"""
+
+    def __init__(self, message: str, response: httpx.Response):
+        super().__init__(message)
+        self.response = response
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every request to one host
+
+    Callers reserve a token up front (the balance may go negative) and
+    sleep for their share of the deficit, so waiting requests are served
+    in arrival order without a loop-bound asyncio lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, returning the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures
+
+    While open every request is rejected immediately. After reset_seconds
+    one probe is let through (half-open); success closes the circuit and
+    failure re-opens it for another reset_seconds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            # One probe at a time; a probe that never reported back expires
+            now = time.monotonic()
+            if state == 'half_open' and (self._probe_started is None
+                                         or now - self._probe_started >= self.reset_seconds):
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probe_started is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probe_started = None
+
+
+class ResilientTransport:
+    """
+    Sends requests through a per-host rate limiter and circuit breaker
+
+    Transient failures (connection errors, timeouts, 429 and 5xx) are
+    retried with full-jitter exponential backoff; a 429's Retry-After is
+    honoured when it fits within max_retry_after, otherwise the request
+    fails straight away rather than holding a worker. One instance can be
+    shared by several connectors so limits apply per host, not per
+    connector.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 8.0, max_retry_after: float = 30.0,
+                 rate_per_second: float = 10.0, burst: int = 20,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Args:
+            max_attempts: Tries per request, including the first
+            backoff_base: First retry delay ceiling in seconds
+            backoff_max: Upper bound on any single backoff delay
+            max_retry_after: Longest Retry-After worth waiting for
+            rate_per_second: Sustained requests per second per host
+            burst: Requests per host allowed at once before throttling
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: How long the circuit stays open before a probe
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        with self._lock:
+            if host not in self._breakers:
+                self._buckets[host] = TokenBucket(self.rate_per_second, self.burst)
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+                self._counters[host] = {'requests': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+            return self._buckets[host], self._breakers[host], self._counters[host]
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Circuit breaker guarding url's host"""
+        return self._host_state(urlparse(url).netloc)[1]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delta or HTTP date)"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request with rate limiting, retries and circuit breaking
+
+        Returns:
+            The successful response
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            UpstreamRejected: Upstream answered with a non-retryable error
+                status (the response is kept on the exception)
+            UpstreamError: Every attempt failed
+        """
+        host = urlparse(url).netloc
+        bucket, breaker, counters = self._host_state(host)
+        last_error = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            if not breaker.allow():
+                counters['rejected'] += 1
+                raise CircuitOpenError(f"Circuit open for {host}") from last_error
+
+            await bucket.acquire()
+            counters['requests'] += 1
+            delay = None
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                last_error = e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    # Upstream answered; 4xx are the caller's problem, not an outage
+                    breaker.record_success()
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as e:
+                        raise UpstreamRejected(f"{response.status_code} from {host}", response) from e
+                    return response
+                last_error = httpx.HTTPStatusError(
+                    f"{response.status_code} from {host}", request=response.request, response=response
+                )
+                if response.status_code == 429:
+                    delay = self.retry_after(response)
+                    if delay is not None and delay > self.max_retry_after:
+                        breaker.record_failure()
+                        counters['failures'] += 1
+                        raise UpstreamError(
+                            f"{host} asked to retry after {delay:.0f}s"
+                        ) from last_error
+
+            breaker.record_failure()
+            counters['failures'] += 1
+            if attempt < self.max_attempts:
+                counters['retries'] += 1
+                await asyncio.sleep(delay if delay is not None else self.backoff(attempt))
+
+        raise UpstreamError(f"{host} failed after {self.max_attempts} attempts: {last_error}") from last_error
+
+    def status(self) -> Dict:
+        """Per-host breaker state and request counters for monitoring"""
+        with self._lock:
+            hosts = list(self._breakers)
+        return {
+            host: {
+                'circuit': self._breakers[host].state,
+                'consecutive_failures': self._breakers[host].failures,
+                **self._counters[host]
+            }
+            for host in hosts
+        }
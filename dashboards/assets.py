@@ -0,0 +1,118 @@
+"""
+Shared front-end assets for dashboards
+One versioned, locally served Plotly.js bundle, fingerprinted static files
+and JSON-only figure rendering
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import jinja2
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+
+PLOTLY_VERSION = get_plotlyjs_version()
+
+# The minified bundle shipped inside the plotly package, so it always
+# matches the figure JSON the server produces
+PLOTLY_BUNDLE_PATH = Path(plotly.__file__).parent / 'package_data' / 'plotly.min.js'
+PLOTLY_BUNDLE_URL = f'/static/plotly-{PLOTLY_VERSION}.min.js'
+PLOTLY_SCRIPT = f'<script src="{PLOTLY_BUNDLE_URL}" charset="utf-8"></script>'
+
+# The URL changes with the version, so browsers may keep the file forever
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+PLOT_CONFIG = {'responsive': True, 'displaylogo': False}
+
+# Page CSS and JS, served under STATIC_URL with a content hash in the name
+STATIC_DIR = Path(__file__).parent.parent / 'static'
+STATIC_URL = '/static'
+
+# Jinja2 page templates (layout.html and the pages extending it)
+TEMPLATE_DIR = Path(__file__).parent.parent / 'templates'
+
+
+def directory_digest(*directories: Path) -> str:
+    """Short hash over every file in the given directories, for cache keys"""
+    digest = hashlib.blake2b(digest_size=6)
+    for directory in directories:
+        for path in sorted(p for p in Path(directory).rglob('*') if p.is_file()):
+            digest.update(str(path.relative_to(directory)).encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class StaticAssets:
+    """
+    Content-fingerprinted URLs for the files under a static directory
+
+    url('css/dashboard.css') gives /static/css/dashboard.<hash>.css, so
+    the file can be cached forever and a changed file gets a new URL.
+    Hashes are computed once per file and process.
+    """
+
+    def __init__(self, directory: Path = STATIC_DIR, prefix: str = STATIC_URL):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self._digests: Dict[str, str] = {}
+
+    def digest(self, path: str) -> str:
+        if path not in self._digests:
+            content = (self.directory / path).read_bytes()
+            self._digests[path] = hashlib.blake2b(content, digest_size=6).hexdigest()
+        return self._digests[path]
+
+    def url(self, path: str) -> str:
+        """Fingerprinted URL of a file relative to the static directory"""
+        name = Path(path)
+        return f'{self.prefix}/{name.with_name(f"{name.stem}.{self.digest(path)}{name.suffix}").as_posix()}'
+
+    def resolve(self, fingerprinted: str) -> Optional[Path]:
+        """File behind a fingerprinted path, or None if unknown or stale"""
+        name = Path(fingerprinted)
+        stem, _, digest = name.stem.rpartition('.')
+        path = name.with_name(f'{stem}{name.suffix}').as_posix()
+        candidate = (self.directory / path).resolve()
+        if not stem or not candidate.is_relative_to(self.directory.resolve()) or not candidate.is_file():
+            return None
+        return candidate if self.digest(path) == digest else None
+
+
+def figure_json(fig: go.Figure) -> str:
+    """Serialize a figure to JSON (uses orjson when installed)"""
+    return pio.to_json(fig, validate=False)
+
+
+def render_figure(fig: go.Figure, div_id: str) -> str:
+    """
+    Render a figure as an empty div plus a Plotly.newPlot call
+
+    Unlike fig.to_html this embeds no loader and no bundle reference;
+    pages include PLOTLY_SCRIPT once in their <head>.
+    """
+    # Plotly escapes <, > and / in its JSON, so it is safe inside <script>
+    return (
+        f'<div id="{div_id}" class="plotly-graph-div"></div>'
+        f'<script>(function(f){{Plotly.newPlot("{div_id}", f.data, f.layout, '
+        f'{json.dumps(PLOT_CONFIG)});}})({figure_json(fig)});</script>'
+    )
+
+
+def page_environment(assets: StaticAssets, directory: Path = TEMPLATE_DIR) -> jinja2.Environment:
+    """
+    Jinja2 environment for the page templates
+
+    Templates are compiled on first use and kept (no per-request mtime
+    checks); output is autoescaped, so chart HTML must be marked |safe.
+    """
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=jinja2.select_autoescape(default=True),
+        auto_reload=False
+    )
+    env.globals.update(asset_url=assets.url, plotly_script=PLOTLY_SCRIPT)
+    return env
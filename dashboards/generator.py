@@ -6,14 +6,41 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
+from .assets import render_figure
+from .render_cache import RenderCache, fingerprint
+from analytics import TenderAggregates, aggregate, downsample
+
+
+def _eur_short(value: float) -> str:
+    """Compact EUR label: 12.5K, 3.2M, 1.1B"""
+    for threshold, suffix in ((1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if value >= threshold:
+            return f'€{value / threshold:.3g}{suffix}'
+    return f'€{value:.0f}'
 
 
 class DashboardGenerator:
     """Generate procurement analytics dashboards"""
     
-    def __init__(self):
+    def __init__(self, render_mode: str = 'json', cache: Optional[RenderCache] = None,
+                 max_points: int = 500, downsample_method: str = 'lttb'):
+        """
+        Args:
+            render_mode: 'json' renders charts as figure JSON for pages that
+                include assets.PLOTLY_SCRIPT once; 'html' produces
+                standalone fig.to_html snippets that load Plotly from the CDN
+            cache: Optional RenderCache memoizing rendered charts by a
+                content hash of the input tenders
+            max_points: Point budget per timeline trace; longer series are
+                downsampled on the server
+            downsample_method: 'lttb' or 'minmax' (see analytics.downsample)
+        """
+        self.render_mode = render_mode
+        self.cache = cache
+        self.max_points = max_points
+        self.downsample_method = downsample_method
         self.color_scheme = {
             'primary': '#1f77b4',
             'success': '#2ca02c',
@@ -21,83 +48,120 @@ class DashboardGenerator:
             'danger': '#d62728'
         }
     
-    def create_tender_overview(self, tenders: pd.DataFrame) -> Dict:
-        """Create comprehensive tender overview dashboard"""
-        
-        if len(tenders) == 0:
+    def create_tender_overview(self, tenders: Optional[pd.DataFrame] = None,
+                               aggregates: Optional[TenderAggregates] = None) -> Dict:
+        """
+        Create comprehensive tender overview dashboard
+        
+        Args:
+            tenders: Tender frame to aggregate, ideally a typed
+                analytics.tender_table; it is only read, never modified
+            aggregates: Precomputed aggregates instead, e.g. from
+                TenderStore.aggregates (answered by the rollup cube)
+        
+        With a cache, identical inputs are only rendered once; the
+        returned dict is shared and must not be modified.
+        """
+        source = aggregates if aggregates is not None else tenders
+        if self.cache is None:
+            return self._build_tender_overview(source)
+        
+        key = fingerprint(source, 'tender_overview', self.render_mode,
+                          self.max_points, self.downsample_method)
+        return self.cache.get_or_render(key, lambda: self._build_tender_overview(source))
+    
+    def _build_tender_overview(self, source) -> Dict:
+        # Every KPI and group-by in one pass over the frame
+        aggregates = source if isinstance(source, TenderAggregates) else aggregate(source)
+        if aggregates.total_tenders == 0:
             return {'error': 'No tenders found'}
         
-        # KPI Cards
-        total_tenders = len(tenders)
-        total_value = tenders['value_eur'].sum()
-        avg_value = tenders['value_eur'].mean()
-        
-        # Timeline Chart
-        tenders['published_date'] = pd.to_datetime(tenders['published_date'])
-        timeline = tenders.groupby(tenders['published_date'].dt.to_period('D')).agg({
-            'tender_id': 'count',
-            'value_eur': 'sum'
-        }).reset_index()
-        timeline['published_date'] = timeline['published_date'].dt.to_timestamp()
+        # Timeline Chart, within the point budget
+        timeline = self.timeline(aggregates)
         
         fig_timeline = px.line(
             timeline, 
             x='published_date', 
-            y='tender_id',
+            y='count',
             title='Tender Publications Over Time',
-            labels={'tender_id': 'Number of Tenders', 'published_date': 'Date'}
+            labels={'count': 'Number of Tenders', 'published_date': 'Date'}
         )
         fig_timeline.update_layout(hovermode='x unified')
         
         # Geographic Distribution
-        geo_data = tenders.groupby('country_name').agg({
-            'tender_id': 'count',
-            'value_eur': 'sum'
-        }).reset_index().sort_values('tender_id', ascending=False)
+        geo_data = aggregates.by('country_name', sort='count', top=10)
         
         fig_geo = px.bar(
-            geo_data.head(10),
+            geo_data,
             x='country_name',
-            y='tender_id',
+            y='count',
             title='Top 10 Countries by Tender Count',
-            labels={'tender_id': 'Number of Tenders', 'country_name': 'Country'}
+            labels={'count': 'Number of Tenders', 'country_name': 'Country'}
         )
         
-        # Value Distribution
-        fig_value = px.histogram(
-            tenders,
-            x='value_eur',
-            nbins=30,
-            title='Tender Value Distribution',
-            labels={'value_eur': 'Value (EUR)'}
-        )
-        fig_value.update_layout(showlegend=False)
+        # Value Distribution, from the precomputed log-scale bins
+        fig_value = self.create_value_histogram(aggregates)
         
         # Category Breakdown
-        category_data = tenders.groupby('cpv_description')['value_eur'].sum().sort_values(ascending=False).head(10)
+        category_data = aggregates.by('cpv_description', sort='value', top=10)
         
         fig_category = px.pie(
-            values=category_data.values,
-            names=category_data.index,
+            values=category_data['value'],
+            names=category_data['cpv_description'],
             title='Top 10 Categories by Value'
         )
         
         return {
             'kpis': {
-                'total_tenders': total_tenders,
-                'total_value': f'€{total_value:,.0f}',
-                'average_value': f'€{avg_value:,.0f}'
+                'total_tenders': aggregates.total_tenders,
+                'total_value': f'€{aggregates.total_value:,.0f}',
+                'average_value': f'€{aggregates.average_value:,.0f}'
             },
             'charts': {
-                'timeline': fig_timeline.to_html(include_plotlyjs='cdn', div_id='timeline'),
-                'geography': fig_geo.to_html(include_plotlyjs='cdn', div_id='geography'),
-                'value_dist': fig_value.to_html(include_plotlyjs='cdn', div_id='value_dist'),
-                'categories': fig_category.to_html(include_plotlyjs='cdn', div_id='categories')
+                'timeline': self.render_chart(fig_timeline, 'timeline'),
+                'geography': self.render_chart(fig_geo, 'geography'),
+                'value_dist': self.render_chart(fig_value, 'value_dist'),
+                'categories': self.render_chart(fig_category, 'categories')
             }
         }
     
-    def create_market_intelligence(self, tenders: pd.DataFrame) -> go.Figure:
-        """Create market intelligence dashboard"""
+    def timeline(self, aggregates: TenderAggregates) -> pd.DataFrame:
+        """Daily counts, downsampled to at most max_points days"""
+        return downsample(aggregates.by('published_date', sort=None), 'published_date', 'count',
+                          self.max_points, self.downsample_method)
+    
+    def create_value_histogram(self, aggregates: TenderAggregates) -> go.Figure:
+        """Bar chart of the log-scale value bins, trimmed to the occupied range"""
+        histogram = aggregates.histogram
+        occupied = histogram.index[histogram['count'] > 0]
+        histogram = histogram.loc[occupied.min():occupied.max()] if len(occupied) else histogram.iloc[:0]
+        
+        fig = px.bar(
+            x=[f'{_eur_short(low)}–{_eur_short(high)}' for low, high in zip(histogram['low'], histogram['high'])],
+            y=histogram['count'],
+            title='Tender Value Distribution',
+            labels={'x': 'Value (EUR)', 'y': 'Number of Tenders'}
+        )
+        fig.update_layout(showlegend=False, bargap=0.05)
+        return fig
+    
+    def render_chart(self, fig: go.Figure, div_id: str) -> str:
+        """Embed a figure according to render_mode"""
+        if self.render_mode == 'html':
+            return fig.to_html(include_plotlyjs='cdn', full_html=False, div_id=div_id)
+        return render_figure(fig, div_id)
+    
+    def create_market_intelligence(self, tenders: pd.DataFrame,
+                                   aggregates: Optional[TenderAggregates] = None) -> go.Figure:
+        """
+        Create market intelligence dashboard
+        
+        Args:
+            tenders: Tender frame (only read, never modified)
+            aggregates: Precomputed analytics.aggregate(tenders), if the
+                caller already has it
+        """
+        aggregates = aggregates or aggregate(tenders)
         
         # Create subplots
         fig = make_subplots(
@@ -109,31 +173,30 @@ class DashboardGenerator:
         )
         
         # Country distribution
-        country_counts = tenders['country_name'].value_counts().head(5)
+        country_counts = aggregates.by('country_name', sort='count', top=5)
         fig.add_trace(
-            go.Bar(x=country_counts.index, y=country_counts.values, name='Tenders'),
+            go.Bar(x=country_counts['country_name'], y=country_counts['count'], name='Tenders'),
             row=1, col=1
         )
         
         # Category pie
-        category_values = tenders.groupby('cpv_description')['value_eur'].sum().head(5)
+        category_values = aggregates.by('cpv_description', sort='value', top=5)
         fig.add_trace(
-            go.Pie(labels=category_values.index, values=category_values.values),
+            go.Pie(labels=category_values['cpv_description'], values=category_values['value']),
             row=1, col=2
         )
         
         # Timeline
-        tenders['published_date'] = pd.to_datetime(tenders['published_date'])
-        timeline = tenders.groupby(tenders['published_date'].dt.date)['tender_id'].count()
+        timeline = self.timeline(aggregates)
         fig.add_trace(
-            go.Scatter(x=timeline.index, y=timeline.values, mode='lines+markers'),
+            go.Scatter(x=timeline['published_date'], y=timeline['count'], mode='lines+markers'),
             row=2, col=1
         )
         
         # Procedure types
-        procedure_counts = tenders['procedure_type'].value_counts()
+        procedure_counts = aggregates.by('procedure_type', sort='count')
         fig.add_trace(
-            go.Bar(x=procedure_counts.index, y=procedure_counts.values),
+            go.Bar(x=procedure_counts['procedure_type'], y=procedure_counts['count']),
             row=2, col=2
         )
         
@@ -1,15 +1,92 @@
 """
 Power BI Style Dashboard Layout Generator
-Creates tab-based, minimal-scroll dashboards
+Creates tab-based, minimal-scroll dashboards whose tabs can load on demand
 """
+import json
+from typing import List, Optional
+
+import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+from .assets import PLOT_CONFIG, PLOTLY_SCRIPT, figure_json
+from .generator import DashboardGenerator
+from .render_cache import RenderCache, fingerprint
+from analytics import TenderAggregates, aggregate, days_until, downsample, tender_table
+
+
+# Tab name -> (label, Font Awesome icon), in display order
+TABS = {
+    'overview': ('Overview', 'fa-home'),
+    'category': ('By Category', 'fa-th'),
+    'geography': ('Geography', 'fa-globe'),
+    'value': ('Value Analysis', 'fa-dollar-sign'),
+    'timeline': ('Timeline', 'fa-clock')
+}
+
+# Draws a tab's chart payload (see create_tab) into its pane, and fetches
+# lazy tabs once, on first click
+TAB_SCRIPT = '''
+const tabRequests = {};
+
+function drawTab(name, payload) {
+    const grid = document.querySelector('#' + name + ' .chart-grid');
+    grid.innerHTML = '';
+    if (!payload.charts.length) {
+        grid.innerHTML = '<div class="chart-status">No tenders found</div>';
+        return;
+    }
+    payload.charts.forEach(figure => {
+        const chart = document.createElement('div');
+        chart.className = 'chart';
+        grid.appendChild(chart);
+        Plotly.newPlot(chart, figure.data, figure.layout, PLOT_CONFIG);
+    });
+}
+
+function loadTab(name) {
+    const pane = document.getElementById(name);
+    if (!pane.dataset.src || tabRequests[name]) return;
+    tabRequests[name] = fetch(pane.dataset.src)
+        .then(response => {
+            if (!response.ok) throw new Error(response.statusText);
+            return response.json();
+        })
+        .then(payload => drawTab(name, payload))
+        .catch(() => {
+            delete tabRequests[name];
+            pane.querySelector('.chart-grid').innerHTML =
+                '<div class="chart-status">Could not load this tab, click to retry</div>';
+        });
+}
+
+function showTab(button, name) {
+    document.querySelectorAll('.tab-content, .tab').forEach(element => {
+        element.classList.remove('active');
+    });
+    const pane = document.getElementById(name);
+    pane.classList.add('active');
+    button.classList.add('active');
+    loadTab(name);
+    // Charts drawn while their pane was hidden have no size yet
+    pane.querySelectorAll('.js-plotly-plot').forEach(chart => Plotly.Plots.resize(chart));
+}
+'''
+
 
 class PowerBIDashboard:
     """Generate Power BI style dashboards with tabs and KPIs"""
     
-    def __init__(self):
+    def __init__(self, generator: Optional[DashboardGenerator] = None,
+                 cache: Optional[RenderCache] = None):
+        """
+        Args:
+            generator: DashboardGenerator whose timeline point budget and
+                value histogram the tabs share
+            cache: Optional RenderCache memoizing each tab's chart JSON
+                by a content hash of the input tenders
+        """
+        self.generator = generator or DashboardGenerator()
+        self.cache = cache
         self.colors = {
             'primary': '#667eea',
             'secondary': '#764ba2',
@@ -41,8 +118,27 @@ class PowerBIDashboard:
         cards_html += '</div>'
         return cards_html
     
-    def create_tab_dashboard(self, data, title="Dashboard"):
-        """Create tabbed dashboard with minimal scrolling"""
+    def create_tab_dashboard(self, data, title="Dashboard", active='overview',
+                             tab_url: Optional[str] = None):
+        """
+        Create tabbed dashboard with minimal scrolling
+        
+        Args:
+            data: Tender frame, ideally already a typed
+                analytics.tender_table; it is only read
+            title: Page title
+            active: Tab shown first
+            tab_url: URL template with a {tab} field serving create_tab
+                for the same data. When given, only the KPIs and the
+                active tab are rendered into the page and the other tabs
+                are fetched on first click, so the page costs the same
+                however many tabs there are; otherwise every tab is
+                rendered up front.
+        """
+        if active not in TABS:
+            raise ValueError(f"Unknown tab '{active}'; expected one of {tuple(TABS)}")
+        data = tender_table(data)
+        urgent = int(days_until(data['deadline']).between(0, 7).sum()) if 'deadline' in data else 0
         
         # Calculate KPIs
         kpis = [
@@ -68,20 +164,30 @@ class PowerBIDashboard:
             },
             {
                 'label': 'Urgent (7 days)',
-                'value': f"{len(data[data['days_to_deadline'] <= 7]):,}",
+                'value': f"{urgent:,}",
                 'icon': 'fa-clock',
                 'color': 'warning'
             }
         ]
         
-        # Tab contents
-        tabs = {
-            'overview': self._create_overview_tab(data),
-            'category': self._create_category_tab(data),
-            'geography': self._create_geography_tab(data),
-            'value': self._create_value_tab(data),
-            'timeline': self._create_timeline_tab(data)
-        }
+        # Tab panes; lazy ones are filled in by loadTab
+        tab_buttons, tab_panes = [], []
+        for name, (label, icon) in TABS.items():
+            state = ' active' if name == active else ''
+            tab_buttons.append(
+                f'<div class="tab{state}" onclick="showTab(this, \'{name}\')">'
+                f'<i class="fas {icon}"></i> {label}</div>'
+            )
+            if tab_url is None or name == active:
+                tab_panes.append(
+                    f'<div id="{name}" class="tab-content{state}"><div class="chart-grid"></div>'
+                    f'<script>drawTab("{name}", {self.create_tab(data, name)});</script></div>'
+                )
+            else:
+                tab_panes.append(
+                    f'<div id="{name}" class="tab-content" data-src="{tab_url.format(tab=name)}">'
+                    f'<div class="chart-grid"><div class="chart-status">Loading…</div></div></div>'
+                )
         
         # Build HTML
         html = f'''
@@ -89,7 +195,11 @@ class PowerBIDashboard:
         <html>
         <head>
             <title>{title}</title>
-            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+            {PLOTLY_SCRIPT}
+            <script>
+                const PLOT_CONFIG = {json.dumps(PLOT_CONFIG)};
+                {TAB_SCRIPT}
+            </script>
             <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
             <style>
                 * {{ margin: 0; padding: 0; box-sizing: border-box; }}
@@ -167,6 +277,11 @@ class PowerBIDashboard:
                     padding: 20px;
                     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
                 }}
+                .chart-status {{
+                    grid-column: 1 / -1;
+                    color: #64748b;
+                    padding: 20px;
+                }}
                 .chart h3 {{
                     font-size: 16px;
                     color: #1a202c;
@@ -190,80 +305,96 @@ class PowerBIDashboard:
             {self.create_kpi_cards(kpis)}
             
             <div class="tabs">
-                <div class="tab active" onclick="showTab('overview')">
-                    <i class="fas fa-home"></i> Overview
-                </div>
-                <div class="tab" onclick="showTab('category')">
-                    <i class="fas fa-th"></i> By Category
-                </div>
-                <div class="tab" onclick="showTab('geography')">
-                    <i class="fas fa-globe"></i> Geography
-                </div>
-                <div class="tab" onclick="showTab('value')">
-                    <i class="fas fa-dollar-sign"></i> Value Analysis
-                </div>
-                <div class="tab" onclick="showTab('timeline')">
-                    <i class="fas fa-clock"></i> Timeline
-                </div>
+                {''.join(tab_buttons)}
             </div>
             
-            <div id="overview" class="tab-content active">
-                {tabs['overview']}
-            </div>
-            <div id="category" class="tab-content">
-                {tabs['category']}
-            </div>
-            <div id="geography" class="tab-content">
-                {tabs['geography']}
-            </div>
-            <div id="value" class="tab-content">
-                {tabs['value']}
-            </div>
-            <div id="timeline" class="tab-content">
-                {tabs['timeline']}
-            </div>
-            
-            <script>
-                function showTab(tabName) {{
-                    // Hide all tabs
-                    document.querySelectorAll('.tab-content').forEach(tab => {{
-                        tab.classList.remove('active');
-                    }});
-                    document.querySelectorAll('.tab').forEach(tab => {{
-                        tab.classList.remove('active');
-                    }});
-                    
-                    // Show selected tab
-                    document.getElementById(tabName).classList.add('active');
-                    event.target.closest('.tab').classList.add('active');
-                }}
-            </script>
+            {''.join(tab_panes)}
         </body>
         </html>
         '''
         
         return html
     
-    def _create_overview_tab(self, data):
+    def create_tab(self, data, tab: str) -> str:
+        """
+        Chart payload of one tab, as served to lazy tabs
+        
+        Args:
+            data: Tender frame (only read, never modified)
+            tab: One of TABS
+        
+        Returns:
+            JSON object {"tab": ..., "charts": [figure, ...]}; with a cache,
+            identical data is only rendered once per tab
+        """
+        if tab not in TABS:
+            raise ValueError(f"Unknown tab '{tab}'; expected one of {tuple(TABS)}")
+        data = tender_table(data)
+        if self.cache is None:
+            return self._build_tab(data, tab)
+        
+        key = fingerprint(data, 'powerbi_tab', tab, self.generator.max_points,
+                          self.generator.downsample_method)
+        return self.cache.get_or_render(key, lambda: self._build_tab(data, tab))
+    
+    def _build_tab(self, data: pd.DataFrame, tab: str) -> str:
+        aggregates = aggregate(data)
+        figures = []
+        if aggregates.total_tenders:
+            figures = getattr(self, f'_create_{tab}_tab')(aggregates)
+            for fig in figures:
+                fig.update_layout(margin=dict(l=40, r=20, t=50, b=40))
+        # Figures are already JSON; splice them in rather than re-encoding
+        return f'{{"tab": {json.dumps(tab)}, "charts": [{", ".join(figure_json(fig) for fig in figures)}]}}'
+    
+    def _create_overview_tab(self, aggregates: TenderAggregates) -> List[go.Figure]:
         """Overview tab with 4 key charts"""
-        # Implementation here
-        return '''
-        <div class="chart-grid">
-            <div class="chart" id="overview-1"></div>
-            <div class="chart" id="overview-2"></div>
-            <div class="chart" id="overview-3"></div>
-            <div class="chart" id="overview-4"></div>
-        </div>
-        '''
+        timeline = self.generator.timeline(aggregates)
+        countries = aggregates.by('country_name', sort='count', top=10)
+        categories = aggregates.by('cpv_description', sort='value', top=10)
+        return [
+            px.line(timeline, x='published_date', y='count', title='Tenders Published',
+                    labels={'count': 'Tenders', 'published_date': 'Date'}),
+            px.bar(countries, x='country_name', y='count', title='Top 10 Countries',
+                   labels={'count': 'Tenders', 'country_name': 'Country'}),
+            self.generator.create_value_histogram(aggregates),
+            px.pie(categories, values='value', names='cpv_description', title='Top 10 Categories by Value')
+        ]
     
-    def _create_category_tab(self, data):
-        return '<div class="chart-grid"><div class="chart">Category charts here</div></div>'
+    def _create_category_tab(self, aggregates: TenderAggregates) -> List[go.Figure]:
+        by_count = aggregates.by('cpv_description', sort='count', top=15)
+        by_value = aggregates.by('cpv_description', sort='value', top=10)
+        return [
+            px.bar(by_count.iloc[::-1], x='count', y='cpv_description', orientation='h',
+                   title='Categories by Tender Count', labels={'count': 'Tenders', 'cpv_description': ''}),
+            px.pie(by_value, values='value', names='cpv_description', title='Categories by Value')
+        ]
     
-    def _create_geography_tab(self, data):
-        return '<div class="chart-grid"><div class="chart">Geography charts here</div></div>'
+    def _create_geography_tab(self, aggregates: TenderAggregates) -> List[go.Figure]:
+        by_count = aggregates.by('country_name', sort='count', top=20)
+        by_value = aggregates.by('country_name', sort='value', top=20)
+        return [
+            px.bar(by_count, x='country_name', y='count', title='Tenders by Country',
+                   labels={'count': 'Tenders', 'country_name': 'Country'}),
+            px.bar(by_value, x='country_name', y='value', title='Value by Country',
+                   labels={'value': 'Value (EUR)', 'country_name': 'Country'})
+        ]
     
-    def _create_value_tab(self, data):
-        return '<div class="chart-grid"><div class="chart">Value charts here</div></div>'
+    def _create_value_tab(self, aggregates: TenderAggregates) -> List[go.Figure]:
+        procedures = aggregates.by('procedure_type', sort='value')
+        return [
+            self.generator.create_value_histogram(aggregates),
+            px.bar(procedures, x='procedure_type', y='value', title='Value by Procedure Type',
+                   labels={'value': 'Value (EUR)', 'procedure_type': 'Procedure'})
+        ]
     
-    def _create_timeline_tab(self, data):
-        return '<div class="chart-grid"><div class="chart">Timeline charts here</div></div>'
+    def _create_timeline_tab(self, aggregates: TenderAggregates) -> List[go.Figure]:
+        days = aggregates.by('published_date', sort=None)
+        values = downsample(days, 'published_date', 'value', self.generator.max_points,
+                            self.generator.downsample_method)
+        return [
+            px.line(self.generator.timeline(aggregates), x='published_date', y='count',
+                    title='Tenders Published per Day', labels={'count': 'Tenders', 'published_date': 'Date'}),
+            px.line(values, x='published_date', y='value', title='Value Published per Day',
+                    labels={'value': 'Value (EUR)', 'published_date': 'Date'})
+        ]
@@ -0,0 +1,122 @@
+"""
+In-memory render cache for dashboards
+Memoizes charts and pages by a content hash of the tenders they were built from
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+import pandas as pd
+
+from analytics import TenderAggregates
+
+
+def _hash_frame(digest, frame: pd.DataFrame):
+    digest.update(','.join(map(str, frame.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+
+
+def fingerprint(data: Union[pd.DataFrame, TenderAggregates, None], *parts) -> str:
+    """
+    Stable content hash of a tender frame (or its aggregates) plus any
+    extra key parts
+
+    Rows are hashed with pandas' vectorized hash_pandas_object, so the
+    fingerprint changes whenever any value changes but not when the same
+    data is fetched again.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, TenderAggregates):
+        digest.update(repr((data.total_tenders, data.total_value, data.min_value, data.max_value,
+                            data.valued_tenders, data.countries)).encode('utf-8'))
+        for name in sorted(data.groups):
+            digest.update(name.encode('utf-8'))
+            _hash_frame(digest, data.groups[name])
+        if data.histogram is not None:
+            _hash_frame(digest, data.histogram)
+    elif data is not None:
+        _hash_frame(digest, data)
+    digest.update(json.dumps(parts, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _size(value: Any) -> int:
+    """Approximate bytes held by a rendered value"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_size(k) + _size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_size(v) for v in value)
+    return 64
+
+
+class RenderCache:
+    """
+    LRU cache of rendered charts and pages, bounded by total size
+
+    Keys are fingerprints, so entries never go stale: new data simply
+    hashes to a new key and old entries age out under max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any):
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Any:
+        """Return the cached value for key, rendering and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def status(self) -> Dict:
+        """Size and hit-rate counters for monitoring"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,118 @@
+"""
+Bounded worker pool for CPU-bound dashboard rendering
+Keeps pandas group-bys and Plotly serialization off the event loop
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class RenderError(Exception):
+    """A render could not be scheduled or finished in time"""
+
+
+class RenderRejected(RenderError):
+    """The render queue is full; the request was turned away without waiting"""
+
+
+class RenderTimeout(RenderError):
+    """A render did not finish within its timeout"""
+
+
+class RenderPool:
+    """
+    Fixed set of render threads behind an admission-controlled queue
+
+    Threads rather than processes, so renders share the in-process
+    RenderCache and read tender frames without pickling them; numpy,
+    pandas and DuckDB release the GIL for the heavy parts. Requests
+    beyond max_queue waiting renders are rejected at once instead of
+    piling up behind a slow dashboard.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = 32, timeout: float = 30.0):
+        """
+        Args:
+            workers: Render threads (defaults to the CPU count, at most 8)
+            max_queue: Renders allowed to wait for a free thread
+            timeout: Seconds a request waits for its render by default
+        """
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='render')
+        self._lock = threading.Lock()
+
+    async def run(self, render: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run render(*args, **kwargs) on a render thread and await its result
+
+        Raises:
+            RenderRejected: max_queue renders are already waiting
+            RenderTimeout: The result took longer than timeout seconds. A
+                render still queued is dropped; one already running
+                finishes in the background (its result may still be
+                cached for the next request).
+        """
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise RenderRejected(f'{self.queued} renders already queued')
+            self.queued += 1
+        future = self._executor.submit(self._call, render, args, kwargs)
+        future.add_done_callback(self._dropped)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise RenderTimeout(f'Render took longer than {timeout or self.timeout:g}s') from None
+
+    def _call(self, render: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            result = render(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def _dropped(self, future: Future):
+        # Cancelled (timed out or client gone) before a thread picked it up
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def status(self) -> Dict:
+        """Queue depth and outcome counters for monitoring"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queued': self.queued,
+                'running': self.running,
+                'max_queue': self.max_queue,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts
+            }
+
+    def shutdown(self):
+        """Drop queued renders and stop the threads once running ones finish"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -4,6 +4,7 @@ Power BI-style layout with tabs and high-value insights
 """
 import pandas as pd
 from typing import Dict
+from ..assets import PLOTLY_SCRIPT
 
 def generate_ted_dashboard(tenders: pd.DataFrame, user_email: str = "user") -> str:
     """
@@ -44,7 +45,7 @@ def generate_ted_dashboard(tenders: pd.DataFrame, user_email: str = "user") -> s
     <head>
         <title>TED EU Procurement Intelligence</title>
         <script src="https://cdn.tailwindcss.com"></script>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        {PLOTLY_SCRIPT}
         <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
         <style>
             .gradient-bg {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
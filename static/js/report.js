@@ -0,0 +1,13 @@
+// Tender report actions; buttons carry the tender ID in data-tender-id
+document.addEventListener('click', function (event) {
+    var button = event.target.closest('[data-action]');
+    if (!button) {
+        return;
+    }
+    var tenderId = button.dataset.tenderId;
+    if (button.dataset.action === 'favorite') {
+        alert('Added to favorites!');
+    } else if (button.dataset.action === 'alert') {
+        alert('Alert set for tender ' + tenderId);
+    }
+});
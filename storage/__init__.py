@@ -0,0 +1,13 @@
+"""
+Local persistence for tenders, accounts and favorites
+"""
+from .tender_store import TenderStore
+from .locks import FileLock
+from .export import EXPORT_FORMATS, iter_export
+from .favorites import FavoriteStore, SQLiteFavoriteStore
+from .users import SQLiteUserStore, User, UserStore
+
+__all__ = [
+    'TenderStore', 'FileLock', 'EXPORT_FORMATS', 'iter_export',
+    'FavoriteStore', 'SQLiteFavoriteStore', 'SQLiteUserStore', 'User', 'UserStore'
+]
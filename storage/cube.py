@@ -0,0 +1,245 @@
+"""
+Rollup cube over the tenders table
+Count, value sum/min/max and a value histogram per (country, CPV division, day)
+"""
+from typing import List, Optional
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from analytics.aggregates import VALUE_BINS, TenderAggregates, fold_days, histogram_frame, value_bin_sql
+from connectors.query import In, Predicate, Prefix, Range, compile_sql
+
+
+# Cells are keyed by these tenders columns; cpv_code is cut to its
+# 2-digit division. Naming them after the tenders columns lets
+# query.compile_sql filter the cube directly. cpv_description is part of
+# the key because live TED notices describe the full code, so one
+# division can hold several descriptions.
+CELL_KEYS = ('country', 'cpv_code', 'published_date', 'cpv_description')
+
+CELL_SELECT = "country, left(cpv_code, 2) AS cpv_code, published_date, cpv_description"
+
+# Cells rows are matched on, NULL-safe
+CELL_MATCH = ' AND '.join(f'c.{key} IS NOT DISTINCT FROM a.{key}' for key in CELL_KEYS)
+
+
+def create(cursor: duckdb.DuckDBPyConnection) -> bool:
+    """Create the cube tables, returning True if they did not exist yet"""
+    exists = cursor.execute("""
+        SELECT count(*) FROM information_schema.tables WHERE table_name = 'tender_cube'
+    """).fetchone()[0]
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tender_cube (
+            country VARCHAR,
+            cpv_code VARCHAR,
+            published_date DATE,
+            cpv_description VARCHAR,
+            country_name VARCHAR,
+            tenders BIGINT,
+            valued BIGINT,
+            value_sum DOUBLE,
+            value_min DOUBLE,
+            value_max DOUBLE
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tender_cube_hist (
+            country VARCHAR,
+            cpv_code VARCHAR,
+            published_date DATE,
+            cpv_description VARCHAR,
+            bin INTEGER,
+            tenders BIGINT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tender_cube_day ON tender_cube (published_date)")
+    return not exists
+
+
+def _insert_cells(cursor: duckdb.DuckDBPyConnection, cells_where: str,
+                  tenders_where: str = '', params: Optional[List] = None):
+    keys = ', '.join(CELL_KEYS)
+    cursor.execute(f"""
+        INSERT INTO tender_cube
+        SELECT {keys}, any_value(country_name),
+               count(*), count(value_eur), coalesce(sum(value_eur), 0),
+               min(value_eur), max(value_eur)
+        FROM (SELECT {CELL_SELECT}, country_name, value_eur FROM tenders{tenders_where}) c
+        {cells_where}
+        GROUP BY {keys}
+    """, params or [])
+    hist_where = f"{tenders_where} AND value_eur IS NOT NULL" if tenders_where else " WHERE value_eur IS NOT NULL"
+    cursor.execute(f"""
+        INSERT INTO tender_cube_hist
+        SELECT {keys}, bin, count(*)
+        FROM (SELECT {CELL_SELECT}, {value_bin_sql('value_eur')} AS bin
+              FROM tenders{hist_where}) c
+        {cells_where}
+        GROUP BY {keys}, bin
+    """, params or [])
+
+
+def rebuild(cursor: duckdb.DuckDBPyConnection):
+    """Recompute every cell from the tenders table"""
+    cursor.execute("DELETE FROM tender_cube")
+    cursor.execute("DELETE FROM tender_cube_hist")
+    _insert_cells(cursor, '')
+
+
+def affected_cells(cursor: duckdb.DuckDBPyConnection, incoming: str):
+    """
+    Stage the cube changes an upsert of the incoming relation will make
+
+    Must run before the upsert. It copies the incoming rows, typed as
+    tenders columns, and records the cells that replaced rows currently
+    sit in ("lost" cells), so amendments that move a tender to another
+    country, division or day are subtracted from the old cell.
+    """
+    columns = 'country, cpv_code, published_date, cpv_description, country_name, value_eur'
+    cursor.execute(f"CREATE OR REPLACE TEMP TABLE cube_incoming AS SELECT {columns} FROM tenders LIMIT 0")
+    cursor.execute(f"INSERT INTO cube_incoming SELECT {columns} FROM {incoming}")
+    cursor.execute(f"""
+        CREATE OR REPLACE TEMP TABLE cube_lost AS
+        SELECT DISTINCT {CELL_SELECT} FROM tenders
+        WHERE tender_id IN (SELECT tender_id FROM {incoming})
+    """)
+
+
+def refresh_affected(cursor: duckdb.DuckDBPyConnection):
+    """
+    Apply the changes staged by affected_cells, after the upsert
+
+    Cells that only gained rows get the incoming rows' counts, sums,
+    min/max and histogram bins added in place, so a batch of new notices
+    costs time in the batch size, not the store size. Only lost cells,
+    whose min/max cannot be subtracted, are recomputed from tenders, and
+    that scan is bounded to their publication days so DuckDB's zone maps
+    skip the rest of the table.
+    """
+    lost = f"EXISTS (SELECT 1 FROM cube_lost a WHERE {CELL_MATCH})"
+    first, last, lost_cells, undated = cursor.execute("""
+        SELECT min(published_date), max(published_date), count(*), bool_or(published_date IS NULL)
+        FROM cube_lost
+    """).fetchone()
+    if lost_cells:
+        cursor.execute(f"DELETE FROM tender_cube c WHERE {lost}")
+        cursor.execute(f"DELETE FROM tender_cube_hist c WHERE {lost}")
+        days = ["published_date BETWEEN ? AND ?"] if first is not None else []
+        if undated:
+            days.append("published_date IS NULL")
+        params = [first, last] if first is not None else []
+        _insert_cells(cursor, f"WHERE {lost}", f" WHERE {' OR '.join(days)}", params)
+
+    keys = ', '.join(CELL_KEYS)
+    delta_match = ' AND '.join(f'c.{key} IS NOT DISTINCT FROM d.{key}' for key in CELL_KEYS)
+    gained = f"FROM (SELECT {CELL_SELECT}, country_name, value_eur FROM cube_incoming) c WHERE NOT {lost}"
+    cursor.execute(f"""
+        CREATE OR REPLACE TEMP TABLE cube_delta AS
+        SELECT {keys}, any_value(country_name) AS country_name,
+               count(*) AS tenders, count(value_eur) AS valued, coalesce(sum(value_eur), 0) AS value_sum,
+               min(value_eur) AS value_min, max(value_eur) AS value_max
+        {gained}
+        GROUP BY {keys}
+    """)
+    # least/greatest skip NULLs, so cells without values stay NULL
+    cursor.execute(f"""
+        UPDATE tender_cube c
+        SET tenders = c.tenders + d.tenders, valued = c.valued + d.valued,
+            value_sum = c.value_sum + d.value_sum,
+            value_min = least(c.value_min, d.value_min), value_max = greatest(c.value_max, d.value_max)
+        FROM cube_delta d WHERE {delta_match}
+    """)
+    cursor.execute(f"""
+        INSERT INTO tender_cube
+        SELECT {keys}, country_name, tenders, valued, value_sum, value_min, value_max FROM cube_delta d
+        WHERE NOT EXISTS (SELECT 1 FROM tender_cube c WHERE {delta_match})
+    """)
+
+    cursor.execute(f"""
+        CREATE OR REPLACE TEMP TABLE cube_delta_hist AS
+        SELECT {keys}, {value_bin_sql('value_eur')} AS bin, count(*) AS tenders
+        {gained} AND value_eur IS NOT NULL
+        GROUP BY ALL
+    """)
+    cursor.execute(f"""
+        UPDATE tender_cube_hist c SET tenders = c.tenders + d.tenders
+        FROM cube_delta_hist d WHERE {delta_match} AND c.bin = d.bin
+    """)
+    cursor.execute(f"""
+        INSERT INTO tender_cube_hist
+        SELECT {keys}, bin, tenders FROM cube_delta_hist d
+        WHERE NOT EXISTS (SELECT 1 FROM tender_cube_hist c WHERE {delta_match} AND c.bin = d.bin)
+    """)
+    for table in ('cube_incoming', 'cube_lost', 'cube_delta', 'cube_delta_hist'):
+        cursor.execute(f"DROP TABLE {table}")
+
+
+def answerable(predicates: List[Predicate]) -> bool:
+    """Whether the cube's granularity is fine enough for every predicate"""
+    for predicate in predicates:
+        if isinstance(predicate, In) and predicate.column == 'country':
+            continue
+        if isinstance(predicate, Prefix) and predicate.column == 'cpv_code' \
+                and all(len(prefix) <= 2 for prefix in predicate.prefixes):
+            continue
+        if isinstance(predicate, Range) and predicate.column == 'published_date':
+            continue
+        return False
+    return True
+
+
+def query(cursor: duckdb.DuckDBPyConnection, predicates: List[Predicate]) -> TenderAggregates:
+    """Roll matching cells up into TenderAggregates (see answerable)"""
+    where, params = compile_sql(predicates)
+    rows = cursor.execute(f"""
+        SELECT country_name, cpv_description, published_date,
+               GROUPING(country_name, cpv_description, published_date) AS grouping_id,
+               sum(tenders), sum(value_sum), sum(valued), min(value_min), max(value_max),
+               count(DISTINCT country)
+        FROM tender_cube{where}
+        GROUP BY GROUPING SETS ((country_name), (cpv_description), (published_date), ())
+    """, params).fetchall()
+
+    result = TenderAggregates()
+    grouped = {'country_name': [], 'cpv_description': [], 'published_date': []}
+    for row in rows:
+        keys, grouping_id = row[:3], row[3]
+        count, total, valued, minimum, maximum, countries = row[4:]
+        if grouping_id == 0b111:
+            if count:
+                result = TenderAggregates(
+                    total_tenders=int(count), total_value=float(total or 0), valued_tenders=int(valued),
+                    min_value=float('nan') if minimum is None else float(minimum),
+                    max_value=float('nan') if maximum is None else float(maximum),
+                    countries=int(countries)
+                )
+            continue
+        for position, dimension in enumerate(grouped):
+            if not grouping_id & (1 << (2 - position)) and keys[position] is not None:
+                grouped[dimension].append((keys[position], int(count), float(total or 0)))
+
+    if not result.total_tenders:
+        return result
+
+    result.groups = {
+        # Sorted by key so equal data always yields equal frames
+        dimension: pd.DataFrame(sorted(entries, key=lambda e: str(e[0])), columns=[dimension, 'count', 'value'])
+        for dimension, entries in grouped.items()
+    }
+    result.groups['published_date'] = fold_days(result.groups['published_date'])
+
+    counts = np.zeros(VALUE_BINS, dtype=np.int64)
+    for bin_index, count in cursor.execute(
+        f"SELECT bin, sum(tenders) FROM tender_cube_hist{where} GROUP BY bin", params
+    ).fetchall():
+        counts[bin_index] = count
+    result.histogram = histogram_frame(counts)
+    return result
+
+
+def count(cursor: duckdb.DuckDBPyConnection, predicates: List[Predicate]) -> int:
+    """Number of tenders in matching cells"""
+    where, params = compile_sql(predicates)
+    return int(cursor.execute(f"SELECT coalesce(sum(tenders), 0) FROM tender_cube{where}", params).fetchone()[0])
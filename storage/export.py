@@ -0,0 +1,101 @@
+"""
+Streaming tender export
+Encodes Arrow record batches as NDJSON, CSV or Arrow IPC chunk by chunk
+"""
+import io
+from typing import Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow'),
+}
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only sink whose buffered bytes are drained after each batch"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _dates_as_text(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """ISO date strings, matching the connector schema used by the JSON API"""
+    columns = [
+        pc.strftime(column, '%Y-%m-%d') if pa.types.is_date(column.type) else column
+        for column in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def _ndjson(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    for batch in batches:
+        frame = _dates_as_text(batch).to_pandas()
+        yield frame.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8')
+
+
+def _csv(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    sink, writer = _Chunks(), None
+    for batch in batches:
+        batch = _dates_as_text(batch)
+        if writer is None:
+            writer = pa_csv.CSVWriter(sink, batch.schema)
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def _arrow(batches: Iterable[pa.RecordBatch], schema: pa.Schema = None) -> Iterator[bytes]:
+    sink, writer = _Chunks(), None
+    for batch in batches:
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is None and schema is not None:
+        # Still emit a valid (empty) stream so readers get the schema
+        writer = pa.ipc.new_stream(sink, schema)
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def iter_export(batches: Iterable[pa.RecordBatch], fmt: str, schema: pa.Schema = None) -> Iterator[bytes]:
+    """
+    Encode record batches in an export format, one chunk per batch
+
+    Args:
+        batches: Record batches, e.g. from TenderStore.iter_batches
+        fmt: One of EXPORT_FORMATS
+        schema: Schema for an empty Arrow stream when nothing matches
+
+    Returns:
+        Iterator of encoded byte chunks, suitable for a StreamingResponse
+    """
+    if fmt == 'ndjson':
+        return _ndjson(batches)
+    if fmt == 'csv':
+        return _csv(batches)
+    if fmt == 'arrow':
+        return _arrow(batches, schema)
+    raise ValueError(f"Unknown export format: {fmt}")
@@ -0,0 +1,125 @@
+"""
+Persistent favorite tenders per user
+One row per (user, tender), shared by every worker process
+"""
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .sqlite import SQLitePool
+
+
+class FavoriteStore(ABC):
+    """Favorites repository the API talks to; emails are case-insensitive"""
+
+    @abstractmethod
+    def update(self, email: str, add: Iterable[Dict] = (), remove: Iterable[str] = ()) -> Tuple[int, int]:
+        """
+        Apply a batch of changes atomically
+
+        Args:
+            email: Owner of the favorites
+            add: Tender dicts to save, each with an 'id'
+            remove: Tender ids to drop; applied before add
+
+        Returns:
+            (added, removed): tenders that were not saved yet, and saved
+            tenders that were dropped
+        """
+
+    @abstractmethod
+    def list(self, email: str) -> List[Dict]:
+        """Saved tenders, oldest first"""
+
+    @abstractmethod
+    def ids(self, email: str) -> Set[str]:
+        """Saved tender ids, for O(1) membership checks across a page of tenders"""
+
+    def contains(self, email: str, tender_id: str) -> bool:
+        return tender_id in self.ids(email)
+
+    def add(self, email: str, tender: Dict) -> bool:
+        """Save one tender, returning False if it already was"""
+        return self.update(email, add=[tender])[0] == 1
+
+    def remove(self, email: str, tender_id: str) -> bool:
+        """Drop one tender, returning False if it was not saved"""
+        return self.update(email, remove=[tender_id])[1] == 1
+
+    def close(self):
+        pass
+
+
+INSERT_FAVORITE = """
+    INSERT INTO favorites (email, tender_id, tender, added_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT (email, tender_id) DO NOTHING
+"""
+DELETE_FAVORITE = "DELETE FROM favorites WHERE email = ? AND tender_id = ?"
+SELECT_FAVORITES = "SELECT tender FROM favorites WHERE email = ? ORDER BY added_at, rowid"
+SELECT_FAVORITE_IDS = "SELECT tender_id FROM favorites WHERE email = ?"
+SELECT_FAVORITE = "SELECT 1 FROM favorites WHERE email = ? AND tender_id = ?"
+
+
+class SQLiteFavoriteStore(FavoriteStore):
+    """
+    Favorites in a SQLite file, keyed by (email, tender_id)
+
+    The composite primary key makes saving the same tender twice a no-op
+    and serves membership lookups from the index. A batch is coalesced
+    before it is written: repeated ids collapse to one change, and all
+    changes land in one transaction with one prepared statement each.
+    """
+
+    def __init__(self, path: str = "data/users.sqlite3", pool_size: int = 4):
+        """
+        Args:
+            path: Database file; may be the user store's
+            pool_size: Connections shared by concurrent callers
+        """
+        self._pool = SQLitePool(path, pool_size)
+        with self._pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS favorites (
+                    email TEXT NOT NULL COLLATE NOCASE,
+                    tender_id TEXT NOT NULL,
+                    tender TEXT NOT NULL,
+                    added_at TEXT NOT NULL,
+                    PRIMARY KEY (email, tender_id)
+                )
+            """)
+
+    def update(self, email: str, add: Iterable[Dict] = (), remove: Iterable[str] = ()) -> Tuple[int, int]:
+        # Last copy of each tender wins; dropping an id twice drops it once
+        additions = {}
+        for tender in add:
+            if not isinstance(tender, dict) or not tender.get('id'):
+                raise ValueError("Every favorite needs an 'id'")
+            additions[str(tender['id'])] = tender
+        removals = {str(tender_id) for tender_id in remove}
+        if not additions and not removals:
+            return 0, 0
+
+        added_at = datetime.now().isoformat()
+        with self._pool.transaction() as conn:
+            removed = conn.executemany(DELETE_FAVORITE, [(email, tender_id) for tender_id in removals]).rowcount
+            added = conn.executemany(INSERT_FAVORITE, [
+                (email, tender_id, json.dumps(tender), added_at) for tender_id, tender in additions.items()
+            ]).rowcount
+        return max(added, 0), max(removed, 0)
+
+    def list(self, email: str) -> List[Dict]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(SELECT_FAVORITES, (email,)).fetchall()
+        return [json.loads(tender) for tender, in rows]
+
+    def ids(self, email: str) -> Set[str]:
+        with self._pool.connection() as conn:
+            return {tender_id for tender_id, in conn.execute(SELECT_FAVORITE_IDS, (email,))}
+
+    def contains(self, email: str, tender_id: str) -> bool:
+        with self._pool.connection() as conn:
+            return conn.execute(SELECT_FAVORITE, (email, tender_id)).fetchone() is not None
+
+    def close(self):
+        self._pool.close()
@@ -0,0 +1,118 @@
+"""
+Advisory file locks shared by every worker process
+Readers/writer locking for the DuckDB warehouse and sync leadership
+"""
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(fd: int, exclusive: bool) -> bool:
+    """Take the lock on fd without blocking, returning whether it was granted"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        else:
+            # msvcrt has no shared mode, so readers exclude each other too
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Lock on a file that any process on the host can take
+
+    hold() is a readers/writer lock: shared holders run alongside each
+    other, an exclusive holder runs alone, and a waiting writer keeps new
+    readers out (through <path>.gate). Every hold() opens its own
+    descriptors, so threads of one process exclude each other as well.
+    acquire_nowait()/release() keep an exclusive lock for as long as the
+    process wants it; the OS drops it if the process dies.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Args:
+            path: Lock file, created if missing
+            timeout: Seconds hold() waits before raising TimeoutError
+        """
+        self.path = str(path)
+        self.timeout = timeout
+        self._held: Optional[int] = None
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+    def _open(self) -> int:
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _wait(self, fd: int, exclusive: bool, deadline: float):
+        delay = 0.005
+        while not _try_lock(fd, exclusive):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out after {self.timeout}s waiting for {self.path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    @contextmanager
+    def hold(self, exclusive: bool = False) -> Iterator[None]:
+        """Wait for the lock, shared or exclusive, for the duration of the block"""
+        deadline = time.monotonic() + self.timeout
+        gate, fd = os.open(self.path + '.gate', os.O_RDWR | os.O_CREAT, 0o644), self._open()
+        try:
+            # A writer holds the gate while it waits, so a steady stream
+            # of readers cannot starve it; readers only pass through
+            self._wait(gate, exclusive, deadline)
+            try:
+                self._wait(fd, exclusive, deadline)
+            finally:
+                if not exclusive:
+                    _unlock(gate)
+            try:
+                yield
+            finally:
+                _unlock(fd)
+                if exclusive:
+                    _unlock(gate)
+        finally:
+            os.close(fd)
+            os.close(gate)
+
+    @property
+    def held(self) -> bool:
+        """Whether this process holds the lock through acquire_nowait()"""
+        return self._held is not None
+
+    def acquire_nowait(self) -> bool:
+        """Take the lock exclusively if no other process has it; True if held"""
+        if self._held is not None:
+            return True
+        fd = self._open()
+        if not _try_lock(fd, exclusive=True):
+            os.close(fd)
+            return False
+        self._held = fd
+        return True
+
+    def release(self):
+        """Give up a lock taken with acquire_nowait()"""
+        if self._held is not None:
+            fd, self._held = self._held, None
+            _unlock(fd)
+            os.close(fd)
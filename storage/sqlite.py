@@ -0,0 +1,69 @@
+"""
+Pooled SQLite connections for the account stores
+WAL journaling, so every worker process can share one database file
+"""
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class SQLitePool:
+    """
+    Fixed set of connections to one SQLite file
+
+    WAL journaling lets readers in any process proceed while one writes;
+    writers wait up to busy_timeout for each other. Connections run in
+    autocommit mode; use transaction() to group writes.
+    """
+
+    def __init__(self, path: str, size: int = 4, busy_timeout: float = 5.0):
+        """
+        Args:
+            path: Database file (':memory:' keeps a single private connection)
+            size: Connections shared by concurrent callers
+            busy_timeout: Seconds to wait for another writer's lock
+        """
+        self.path = str(path)
+        if self.path == ':memory:':
+            size = 1
+        else:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connections: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        for _ in range(size):
+            self._connections.put(self._connect(busy_timeout))
+
+    def _connect(self, busy_timeout: float) -> sqlite3.Connection:
+        # Statements are cached per connection, so constant SQL stays prepared
+        conn = sqlite3.connect(self.path, timeout=busy_timeout, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        if self.path != ':memory:':
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use"""
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection inside one write transaction, committed on success"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
@@ -0,0 +1,308 @@
+"""
+Local tender warehouse backed by DuckDB
+Answers searches and statistics with SQL instead of re-fetching upstream
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+from analytics import TenderAggregates, aggregate_sql, as_datetimes, tender_table
+from connectors.query import compile_sql, parse_filters
+from . import cube
+from .locks import FileLock
+
+
+TENDER_COLUMNS = {
+    'tender_id': 'VARCHAR PRIMARY KEY',
+    'title': 'VARCHAR',
+    'country': 'VARCHAR',
+    'country_name': 'VARCHAR',
+    'cpv_code': 'VARCHAR',
+    'cpv_description': 'VARCHAR',
+    'value_eur': 'DOUBLE',
+    'currency': 'VARCHAR',
+    'published_date': 'DATE',
+    'deadline': 'DATE',
+    'buyer': 'VARCHAR',
+    'procedure_type': 'VARCHAR',
+    'source': 'VARCHAR',
+    'url': 'VARCHAR',
+}
+
+INDEXED_COLUMNS = ['country', 'cpv_code', 'published_date', 'deadline']
+
+
+def _arrow_reader(result: duckdb.DuckDBPyConnection, batch_size: int = 50_000) -> pa.RecordBatchReader:
+    """Streaming Arrow reader over a query result"""
+    # Newer DuckDB renamed fetch_record_batch to to_arrow_reader
+    reader = getattr(result, 'to_arrow_reader', None) or result.fetch_record_batch
+    return reader(batch_size)
+
+
+class TenderStore:
+    """
+    DuckDB file holding every tender the connectors have returned
+
+    Tenders are upserted by tender_id. The columns used for filtering
+    (country, cpv_code, published_date, deadline) are indexed, and
+    DuckDB's per-row-group min/max zone maps prune date ranges.
+
+    A rollup cube (see storage.cube) is updated in the same transaction
+    as every upsert. Counts and aggregates whose filters only touch
+    country, CPV division and publication date are answered from it
+    without scanning tenders.
+
+    DuckDB lets only one process hold a file open for writing, and none
+    may read it meanwhile, so every worker opens its own connection per
+    call: read-only under a shared lock on <path>.lock, read-write under
+    an exclusive one. Readers in all workers run together; a write waits
+    for them and holds them off until it commits. ':memory:' stores keep
+    one private connection instead.
+    """
+
+    def __init__(self, path: str = "data/tenders.duckdb", busy_timeout: float = 30.0):
+        """
+        Args:
+            path: DuckDB file, or ':memory:' for a private in-process store
+            busy_timeout: Seconds a call waits for other processes' locks
+        """
+        self.path = str(path)
+        self.busy_timeout = busy_timeout
+        self._write_lock = threading.Lock()
+        if self.path == ':memory:':
+            self._conn = duckdb.connect(self.path)
+            self._file_lock = None
+        else:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = None
+            self._file_lock = FileLock(self.path + '.lock', timeout=busy_timeout)
+        with self._connection(write=True) as conn:
+            self._create_schema(conn)
+
+    def _connect(self, read_only: bool) -> duckdb.DuckDBPyConnection:
+        """Open the file, retrying while a process outside our lock holds it"""
+        deadline = time.monotonic() + self.busy_timeout
+        delay = 0.01
+        while True:
+            try:
+                return duckdb.connect(self.path, read_only=read_only)
+            except duckdb.IOException as e:
+                if 'lock' not in str(e).lower() or time.monotonic() >= deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    @contextmanager
+    def _connection(self, write: bool = False) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Connection for one call, closed (and its lock released) afterwards
+
+        Args:
+            write: Open read-write and exclude every other reader and writer
+        """
+        if self._conn is not None:
+            # Per-call cursor so the store can be shared across threads
+            with self._write_lock if write else nullcontext():
+                cursor = self._conn.cursor()
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+            return
+
+        with self._file_lock.hold(exclusive=write):
+            conn = self._connect(read_only=not write)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _create_schema(conn: duckdb.DuckDBPyConnection):
+        columns = ',\n    '.join(f'{name} {sql_type}' for name, sql_type in TENDER_COLUMNS.items())
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS tenders (
+                {columns},
+                ingested_at TIMESTAMP DEFAULT current_timestamp
+            )
+        """)
+        for column in INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_tenders_{column} ON tenders ({column})")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source VARCHAR PRIMARY KEY,
+                last_published DATE,
+                last_notice_id VARCHAR,
+                last_synced_at TIMESTAMP,
+                rows_synced BIGINT DEFAULT 0
+            )
+        """)
+        if cube.create(conn):
+            # Backfill a store created before the cube existed
+            cube.rebuild(conn)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+    def ingest(self, tenders: pd.DataFrame) -> int:
+        """Upsert a tender frame, returning the number of rows written"""
+        if tenders is None or len(tenders) == 0:
+            return 0
+
+        frame = pd.DataFrame({
+            column: tenders[column] if column in tenders.columns else None
+            for column in TENDER_COLUMNS
+        })
+        frame = frame.drop_duplicates('tender_id', keep='last')
+        frame['tender_id'] = frame['tender_id'].astype(str)
+        frame['value_eur'] = pd.to_numeric(frame['value_eur'], errors='coerce')
+        for column in ('published_date', 'deadline'):
+            frame[column] = as_datetimes(frame[column]).dt.date
+
+        columns = ', '.join(TENDER_COLUMNS)
+        with self._connection(write=True) as cursor:
+            cursor.register('incoming', frame)
+            cursor.begin()
+            try:
+                cube.affected_cells(cursor, 'incoming')
+                cursor.execute(f"INSERT OR REPLACE INTO tenders ({columns}) SELECT {columns} FROM incoming")
+                cube.refresh_affected(cursor)
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
+            finally:
+                cursor.unregister('incoming')
+
+        return len(frame)
+
+    @staticmethod
+    def _where(filters: Optional[Dict]) -> Tuple[str, List]:
+        """Build a parameterized WHERE clause from search filters"""
+        return compile_sql(parse_filters(filters))
+
+    def count(self, filters: Dict = None) -> int:
+        """Number of stored tenders matching filters"""
+        predicates = parse_filters(filters)
+        with self._connection() as conn:
+            if cube.answerable(predicates):
+                return cube.count(conn, predicates)
+            where, params = compile_sql(predicates)
+            return conn.execute(f"SELECT count(*) FROM tenders{where}", params).fetchone()[0]
+
+    def search(self, filters: Dict = None) -> pd.DataFrame:
+        """Return matching tenders, newest first, in the connector schema"""
+        filters = filters or {}
+        where, params = self._where(filters)
+        columns = ', '.join(
+            f"strftime({name}, '%Y-%m-%d') AS {name}" if name in ('published_date', 'deadline') else name
+            for name in TENDER_COLUMNS
+        )
+        sql = f"SELECT {columns} FROM tenders{where} ORDER BY published_date DESC, tender_id"
+        if filters.get('limit'):
+            sql += ' LIMIT ?'
+            params.append(int(filters['limit']))
+
+        with self._connection() as conn:
+            return conn.execute(sql, params).df()
+
+    def table(self, filters: Dict = None) -> pd.DataFrame:
+        """
+        Matching tenders, newest first, as a typed tender table
+
+        Dates come back as datetime64 straight from the DATE columns they
+        were parsed into at ingest, and dimensions as categoricals (see
+        analytics.tender_table), ready for dashboards to read.
+        """
+        filters = filters or {}
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(TENDER_COLUMNS)} FROM tenders{where} ORDER BY published_date DESC, tender_id"
+        if filters.get('limit'):
+            sql += ' LIMIT ?'
+            params.append(int(filters['limit']))
+
+        with self._connection() as conn:
+            return tender_table(conn.execute(sql, params).df())
+
+    def iter_batches(self, filters: Dict = None, batch_size: int = 50_000,
+                     ordered: bool = False) -> Iterator[pa.RecordBatch]:
+        """
+        Stream matching tenders as Arrow record batches
+
+        Rows are pulled from DuckDB batch_size at a time, so memory stays
+        flat however many tenders match. Dates keep their DATE type.
+
+        Args:
+            filters: Search filters; with a limit the newest rows are kept
+            batch_size: Rows per record batch
+            ordered: Newest first, like search(). A full sort has to hold
+                every matching row, so bulk exports skip it by default
+        """
+        filters = filters or {}
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(TENDER_COLUMNS)} FROM tenders{where}"
+        if ordered or filters.get('limit'):
+            # A LIMIT makes this a bounded top-N rather than a full sort
+            sql += ' ORDER BY published_date DESC, tender_id'
+        if filters.get('limit'):
+            sql += ' LIMIT ?'
+            params.append(int(filters['limit']))
+
+        # The read lock is held until the stream is drained or closed
+        with self._connection() as conn:
+            for batch in _arrow_reader(conn.execute(sql, params), batch_size):
+                yield batch
+
+    def arrow_schema(self) -> pa.Schema:
+        """Arrow schema of the batches iter_batches yields"""
+        with self._connection() as conn:
+            return _arrow_reader(conn.execute(f"SELECT {', '.join(TENDER_COLUMNS)} FROM tenders LIMIT 0")).schema
+
+    def aggregates(self, filters: Dict = None) -> TenderAggregates:
+        """
+        Totals, per-dimension groups and value histogram for matching tenders
+
+        Served from the rollup cube when the filters allow it (no
+        procedure_type groups then), otherwise one query over tenders.
+        """
+        predicates = parse_filters(filters)
+        with self._connection() as conn:
+            if cube.answerable(predicates):
+                return cube.query(conn, predicates)
+            where, params = compile_sql(predicates)
+            return aggregate_sql(conn, 'tenders', where, params)
+
+    def statistics(self, filters: Dict = None) -> Dict:
+        """Same summary as ProcurementConnector.compute_statistics, computed in SQL"""
+        return self.aggregates(filters).statistics()
+
+    def get_watermark(self, source: str) -> Optional[Dict]:
+        """High-water mark recorded by the last successful sync of a source"""
+        with self._connection() as conn:
+            row = conn.execute("""
+                SELECT last_published, last_notice_id, last_synced_at, rows_synced
+                FROM sync_state WHERE source = ?
+            """, [source]).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('last_published', 'last_notice_id', 'last_synced_at', 'rows_synced'), row))
+
+    def set_watermark(self, source: str, last_published, last_notice_id: Optional[str],
+                      synced_at, rows: int):
+        """Advance a source's high-water mark after a successful sync"""
+        with self._connection(write=True) as conn:
+            conn.execute("""
+                INSERT INTO sync_state VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source) DO UPDATE SET
+                    last_published = excluded.last_published,
+                    last_notice_id = excluded.last_notice_id,
+                    last_synced_at = excluded.last_synced_at,
+                    rows_synced = sync_state.rows_synced + excluded.rows_synced
+            """, [source, last_published, last_notice_id, synced_at, rows])
@@ -0,0 +1,94 @@
+"""
+Persistent user accounts
+SQLite by default, so every uvicorn worker process shares one account store
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .sqlite import SQLitePool
+
+
+@dataclass
+class User:
+    email: str
+    username: str
+    hashed_password: Optional[str] = None
+    provider: str = 'email'
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+class UserStore(ABC):
+    """Account repository the auth routes talk to; emails are case-insensitive"""
+
+    @abstractmethod
+    def get(self, email: str) -> Optional[User]:
+        """The account registered under email, if any"""
+
+    @abstractmethod
+    def create(self, user: User) -> bool:
+        """Register an account, returning False if the email is taken"""
+
+    @abstractmethod
+    def set_password_hash(self, email: str, hashed_password: str):
+        """Replace an account's password hash (e.g. after a cost change)"""
+
+    def close(self):
+        pass
+
+
+# Constant statements, so each pooled connection keeps them prepared
+SELECT_USER = "SELECT email, username, hashed_password, provider, created_at FROM users WHERE email = ?"
+INSERT_USER = """
+    INSERT INTO users (email, username, hashed_password, provider, created_at) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (email) DO NOTHING
+"""
+UPDATE_PASSWORD = "UPDATE users SET hashed_password = ? WHERE email = ?"
+
+
+class SQLiteUserStore(UserStore):
+    """
+    Accounts in one SQLite file shared by every worker process
+
+    The unique email index makes concurrent signups for the same address
+    race-free. Calls block; callers on the event loop should go through
+    asyncio.to_thread.
+    """
+
+    def __init__(self, path: str = "data/users.sqlite3", pool_size: int = 4):
+        """
+        Args:
+            path: Database file (':memory:' keeps a single private connection)
+            pool_size: Connections shared by concurrent callers
+        """
+        self._pool = SQLitePool(path, pool_size)
+        with self._pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    email TEXT NOT NULL COLLATE NOCASE,
+                    username TEXT NOT NULL,
+                    hashed_password TEXT,
+                    provider TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email)")
+
+    def get(self, email: str) -> Optional[User]:
+        with self._pool.connection() as conn:
+            row = conn.execute(SELECT_USER, (email,)).fetchone()
+        return User(*row) if row else None
+
+    def create(self, user: User) -> bool:
+        with self._pool.connection() as conn:
+            cursor = conn.execute(INSERT_USER, (user.email, user.username, user.hashed_password,
+                                                user.provider, user.created_at))
+        return cursor.rowcount == 1
+
+    def set_password_hash(self, email: str, hashed_password: str):
+        with self._pool.connection() as conn:
+            conn.execute(UPDATE_PASSWORD, (hashed_password, email))
+
+    def close(self):
+        self._pool.close()
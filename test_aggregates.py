@@ -0,0 +1,65 @@
+"""
+Aggregation engine tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import aggregate
+from connectors.synthetic import generate_tenders
+from storage.tender_store import TenderStore
+
+
+@pytest.fixture(scope='module')
+def tenders():
+    tenders = generate_tenders(3000)
+    tenders.loc[::50, 'value_eur'] = np.nan
+    return tenders
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'duckdb'])
+def test_groups_match_pandas(tenders, engine):
+    aggregates = aggregate(tenders, engine=engine)
+
+    for dimension in ('country_name', 'cpv_description', 'procedure_type'):
+        expected = tenders.groupby(dimension)['value_eur'].agg(['size', 'sum'])
+        got = aggregates.by(dimension).set_index(dimension).sort_index()
+        assert got['count'].tolist() == expected['size'].tolist()
+        assert np.allclose(got['value'], expected['sum'])
+
+    days = pd.to_datetime(tenders['published_date']).value_counts().sort_index()
+    timeline = aggregates.by('published_date', sort=None)
+    assert timeline['published_date'].tolist() == days.index.tolist()
+    assert timeline['count'].tolist() == days.tolist()
+
+
+def test_engines_and_store_agree(tenders):
+    store = TenderStore(':memory:')
+    store.ingest(tenders)
+
+    expected = aggregate(tenders).statistics()
+
+    for got in (aggregate(tenders, engine='duckdb').statistics(), store.statistics()):
+        assert got.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, dict):
+                assert list(got[key]) == list(value)
+                assert list(got[key].values()) == pytest.approx(list(value.values()))
+            else:
+                assert got[key] == pytest.approx(value)
+    assert expected['average_value'] == pytest.approx(tenders['value_eur'].mean())
+
+
+def test_categorical_input_is_not_modified(tenders):
+    categorical = tenders.astype({'country_name': 'category', 'procedure_type': 'category'})
+    before = categorical.copy()
+
+    aggregates = aggregate(categorical)
+
+    pd.testing.assert_frame_equal(categorical, before)
+    assert aggregates.by('country_name', top=1)['count'][0] == tenders['country_name'].value_counts().iloc[0]
+
+
+def test_empty_frame():
+    assert aggregate(generate_tenders(0)).statistics() == {}
+    assert aggregate(generate_tenders(0), engine='duckdb').statistics() == {}
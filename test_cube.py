@@ -0,0 +1,121 @@
+"""
+Rollup cube tests
+"""
+from datetime import date
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import aggregate_sql
+from connectors.query import parse_filters
+from connectors.synthetic import generate_tenders
+from storage import cube
+from storage.tender_store import TenderStore
+
+
+@pytest.fixture
+def tenders():
+    tenders = generate_tenders(2000, base_date=date(2024, 6, 30))
+    tenders.loc[::40, 'value_eur'] = np.nan
+    return tenders
+
+
+def scanned(store, filters=None):
+    """Aggregates computed straight from the tenders table, bypassing the cube"""
+    where, params = store._where(filters)
+    with store._connection() as conn:
+        return aggregate_sql(conn, 'tenders', where, params)
+
+
+def assert_same(got, expected):
+    assert got.total_tenders == expected.total_tenders
+    assert got.valued_tenders == expected.valued_tenders
+    assert got.countries == expected.countries
+    assert got.total_value == pytest.approx(expected.total_value)
+    assert got.min_value == pytest.approx(expected.min_value)
+    assert got.max_value == pytest.approx(expected.max_value)
+    assert got.histogram['count'].tolist() == expected.histogram['count'].tolist()
+    for dimension in ('country_name', 'cpv_description', 'published_date'):
+        pd.testing.assert_frame_equal(got.by(dimension), expected.by(dimension), check_dtype=False)
+
+
+@pytest.mark.parametrize('filters', [
+    None,
+    {'country': 'DE'},
+    {'country': 'FR,IT', 'cpv_code': '72'},
+    {'published_from': '2024-06-10', 'published_to': '2024-06-20'},
+])
+def test_cube_matches_scan(tenders, filters):
+    store = TenderStore(':memory:')
+    store.ingest(tenders)
+
+    assert cube.answerable(parse_filters(filters))
+    assert_same(store.aggregates(filters), scanned(store, filters))
+    assert store.count(filters) == scanned(store, filters).total_tenders
+
+
+def test_amendment_moves_tender_between_cells(tenders):
+    store = TenderStore(':memory:')
+    store.ingest(tenders)
+
+    amended = tenders.tail(50).copy()
+    amended['country'] = 'MT'
+    amended['country_name'] = 'Malta'
+    amended['cpv_code'] = '99000000'
+    amended['published_date'] = pd.Timestamp('2020-01-01')
+    amended['value_eur'] = 5e9
+    store.ingest(amended)
+    store.ingest(generate_tenders(100, seed=7))
+
+    assert_same(store.aggregates(), scanned(store))
+    assert store.aggregates({'country': 'MT'}).total_tenders == 50
+
+
+def test_incremental_updates_match_rebuild(tenders):
+    store = TenderStore(':memory:')
+    store.ingest(tenders.head(1000))
+    # New notices in existing and new cells, some without a value
+    extra = generate_tenders(500, seed=3, base_date=date(2024, 6, 30))
+    extra.loc[::7, 'value_eur'] = np.nan
+    store.ingest(pd.concat([tenders.iloc[1000:], extra]))
+    # Re-sent notices that stay in their cell, with changed values
+    resent = tenders.head(100).copy()
+    resent['value_eur'] = 12_345.0
+    store.ingest(resent)
+
+    order = 'ORDER BY ALL'
+    with store._connection(write=True) as cursor:
+        cells = cursor.execute(f"SELECT * EXCLUDE (country_name) FROM tender_cube {order}").fetchall()
+        bins = cursor.execute(f"SELECT * FROM tender_cube_hist {order}").fetchall()
+        cube.rebuild(cursor)
+        assert cursor.execute(f"SELECT * EXCLUDE (country_name) FROM tender_cube {order}").fetchall() == pytest.approx(cells)
+        assert cursor.execute(f"SELECT * FROM tender_cube_hist {order}").fetchall() == bins
+
+
+def test_unanswerable_filters_scan_tenders(tenders):
+    store = TenderStore(':memory:')
+    store.ingest(tenders)
+    filters = {'country': 'DE', 'min_value': 1_000_000, 'cpv_code': '7200'}
+
+    got = store.aggregates(filters)
+
+    assert got.total_tenders == scanned(store, filters).total_tenders
+    assert got.min_value >= 1_000_000
+    assert 'procedure_type' in got.groups
+
+
+def test_existing_store_is_backfilled(tmp_path, tenders):
+    path = str(tmp_path / 'tenders.duckdb')
+    store = TenderStore(path)
+    store.ingest(tenders)
+    store.close()
+
+    conn = duckdb.connect(path)
+    conn.execute("DROP TABLE tender_cube")
+    conn.execute("DROP TABLE tender_cube_hist")
+    conn.close()
+
+    store = TenderStore(path)
+    assert_same(store.aggregates(), scanned(store))
@@ -0,0 +1,81 @@
+"""
+Dashboard rendering tests
+"""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from connectors.synthetic import generate_tenders
+from dashboards.assets import PLOTLY_BUNDLE_PATH, PLOTLY_VERSION
+from dashboards.generator import DashboardGenerator
+from dashboards.powerbi_layout import TABS, PowerBIDashboard
+from dashboards.render_cache import RenderCache
+
+
+def test_charts_are_json_without_loaders():
+    dashboard = DashboardGenerator().create_tender_overview(generate_tenders(100))
+
+    for div_id, chart in dashboard['charts'].items():
+        assert 'cdn.plot.ly' not in chart and '<script src' not in chart
+        payload = re.search(r'\}\)\((\{.*\})\);</script>$', chart).group(1)
+        assert set(json.loads(payload)) >= {'data', 'layout'}
+        assert f'Plotly.newPlot("{div_id}"' in chart
+
+
+def test_payload_is_bounded_by_point_budget():
+    small, large = generate_tenders(2000), generate_tenders(50_000, seed=1)
+    for tenders in (small, large):
+        days = np.random.default_rng(0).integers(0, 5 * 365, len(tenders))
+        tenders['published_date'] = pd.Timestamp('2020-01-01') + pd.to_timedelta(days, unit='D')
+    generator = DashboardGenerator(max_points=200)
+
+    sizes = []
+    for tenders in (small, large):
+        charts = generator.create_tender_overview(tenders)['charts']
+        timeline = json.loads(re.search(r'\}\)\((\{.*\})\);</script>$', charts['timeline']).group(1))
+        assert len(timeline['data'][0]['x']) == 200
+        sizes.append(sum(len(chart) for chart in charts.values()))
+    assert sizes[1] < sizes[0] * 1.2
+
+
+def test_html_mode_is_standalone():
+    dashboard = DashboardGenerator(render_mode='html').create_tender_overview(generate_tenders(20))
+
+    assert 'cdn.plot.ly' in dashboard['charts']['timeline']
+
+
+def test_bundle_is_shipped_with_plotly():
+    assert PLOTLY_BUNDLE_PATH.exists()
+    assert PLOTLY_VERSION in PLOTLY_BUNDLE_PATH.read_text(encoding='utf-8')[:500]
+
+
+def test_lazy_tabs_render_only_the_active_tab():
+    tenders = generate_tenders(300)
+    dashboard = PowerBIDashboard()
+
+    html = dashboard.create_tab_dashboard(tenders, active='value', tab_url='/tabs/{tab}')
+
+    assert re.findall(r'drawTab\("(\w+)"', html) == ['value']
+    assert sorted(re.findall(r'data-src="/tabs/(\w+)"', html)) == sorted(set(TABS) - {'value'})
+    eager = dashboard.create_tab_dashboard(tenders)
+    assert re.findall(r'drawTab\("(\w+)"', eager) == list(TABS)
+
+
+def test_tab_payloads_are_cached_figures():
+    cache = RenderCache()
+    dashboard = PowerBIDashboard(cache=cache)
+    tenders = generate_tenders(300)
+
+    for tab in TABS:
+        payload = json.loads(dashboard.create_tab(tenders, tab))
+        assert payload['tab'] == tab and payload['charts']
+        assert all(set(chart) >= {'data', 'layout'} for chart in payload['charts'])
+    dashboard.create_tab(generate_tenders(300), 'overview')
+
+    assert cache.status()['hits'] == 1
+    assert json.loads(dashboard.create_tab(tenders.iloc[:0], 'geography'))['charts'] == []
+    with pytest.raises(ValueError):
+        dashboard.create_tab(tenders, 'missing')
@@ -0,0 +1,39 @@
+"""
+Timeline downsampling tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import downsample
+from analytics.downsample import lttb, min_max
+
+
+@pytest.fixture
+def series():
+    days = pd.date_range('2019-01-01', periods=2000, freq='D')
+    counts = np.random.default_rng(0).poisson(20, len(days)).astype(float)
+    counts[1234] = 400
+    return pd.DataFrame({'published_date': days, 'count': counts})
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_budget_and_extremes_are_kept(series, method):
+    reduced = downsample(series, 'published_date', 'count', 300, method=method)
+
+    assert len(reduced) <= 300
+    assert reduced['published_date'].is_monotonic_increasing
+    assert reduced['count'].max() == 400
+    if method == 'lttb':
+        assert len(reduced) == 300
+        assert reduced['published_date'].iloc[[0, -1]].tolist() == series['published_date'].iloc[[0, -1]].tolist()
+    else:
+        assert reduced['count'].min() == series['count'].min()
+
+
+def test_short_series_pass_through(series):
+    assert len(downsample(series.head(50), 'published_date', 'count', 300)) == 50
+    assert lttb(np.arange(10), np.arange(10), 2).tolist() == [0, 9]
+    assert min_max(np.arange(10), 1).tolist() == [0]
+    with pytest.raises(ValueError):
+        downsample(series, 'published_date', 'count', 10, method='mean')
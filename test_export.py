@@ -0,0 +1,62 @@
+"""
+Streaming export tests
+"""
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from connectors.synthetic import generate_tenders
+from storage.export import iter_export
+from storage.tender_store import TenderStore
+
+
+@pytest.fixture
+def store():
+    store = TenderStore(':memory:')
+    store.ingest(generate_tenders(2000))
+    return store
+
+
+def test_batches_match_search(store):
+    filters = {'country': 'DE,FR', 'min_value': 500_000}
+
+    batches = list(store.iter_batches(filters, batch_size=100, ordered=True))
+
+    assert len(batches) > 1
+    assert max(b.num_rows for b in batches) <= 100
+    exported = pa.Table.from_batches(batches).column('tender_id').to_pylist()
+    assert exported == store.search(filters)['tender_id'].tolist()
+
+
+def test_ndjson_is_one_record_per_line(store):
+    data = b''.join(iter_export(store.iter_batches(batch_size=300, ordered=True), 'ndjson'))
+    records = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+    assert len(records) == 2000
+    assert records[0] == json.loads(store.search({'limit': 1}).to_json(orient='records'))[0]
+
+
+def test_csv_has_a_single_header(store):
+    chunks = list(iter_export(store.iter_batches(batch_size=300), 'csv'))
+    frame = pd.read_csv(io.BytesIO(b''.join(chunks)))
+
+    assert len(chunks) > 1
+    assert len(frame) == 2000
+    assert frame['published_date'].str.match(r'^\d{4}-\d{2}-\d{2}$').all()
+
+
+def test_arrow_stream_round_trips(store):
+    data = b''.join(iter_export(store.iter_batches(batch_size=300), 'arrow'))
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.num_rows == 2000
+    assert pa.types.is_date(table.schema.field('deadline').type)
+
+
+def test_empty_arrow_export_keeps_schema(store):
+    data = b''.join(iter_export(store.iter_batches({'country': 'ZZ'}), 'arrow', schema=store.arrow_schema()))
+
+    assert pa.ipc.open_stream(data).read_all().schema.names == store.arrow_schema().names
@@ -0,0 +1,67 @@
+"""
+Favorites store tests
+"""
+import multiprocessing
+
+import pytest
+
+from storage.favorites import SQLiteFavoriteStore
+
+
+def tender(tender_id, title='Cloud services'):
+    return {'id': tender_id, 'title': title, 'value': 1000}
+
+
+def test_batches_are_coalesced_and_durable(tmp_path):
+    path = tmp_path / 'users.sqlite3'
+    store = SQLiteFavoriteStore(path)
+
+    assert store.update('ana@example.eu', add=[tender('T1'), tender('T2'), tender('T2', 'Amended')]) == (2, 0)
+    assert store.update('ANA@example.eu', add=[tender('T2'), tender('T3')], remove=['T1', 'T1', 'T9']) == (1, 1)
+    store.close()
+
+    other_worker = SQLiteFavoriteStore(path)
+    assert [f['id'] for f in other_worker.list('ana@example.eu')] == ['T2', 'T3']
+    assert other_worker.list('ana@example.eu')[0]['title'] == 'Amended'
+    assert other_worker.ids('ana@example.eu') == {'T2', 'T3'}
+    assert other_worker.contains('ana@example.eu', 'T3') and not other_worker.contains('ana@example.eu', 'T1')
+    assert other_worker.list('bob@example.eu') == []
+    other_worker.close()
+
+
+def test_single_changes_and_validation(tmp_path):
+    store = SQLiteFavoriteStore(tmp_path / 'users.sqlite3')
+
+    assert store.add('ana@example.eu', tender('T1'))
+    assert not store.add('ana@example.eu', tender('T1'))
+    assert store.remove('ana@example.eu', 'T1')
+    assert not store.remove('ana@example.eu', 'T1')
+    assert store.update('ana@example.eu') == (0, 0)
+    with pytest.raises(ValueError):
+        store.update('ana@example.eu', add=[tender('T2'), {'title': 'no id'}])
+    assert store.ids('ana@example.eu') == set()
+    store.close()
+
+
+def add_favorites(path, prefix):
+    """Worker process: add a batch of favorites, then single ones"""
+    store = SQLiteFavoriteStore(path)
+    store.update('ana@example.eu', add=[tender(f'{prefix}{n}') for n in range(20)])
+    for n in range(20, 25):
+        store.add('ana@example.eu', tender(f'{prefix}{n}'))
+    store.close()
+
+
+def test_favorites_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'users.sqlite3')
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=add_favorites, args=(path, prefix)) for prefix in 'AB']
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    store = SQLiteFavoriteStore(path)
+    assert store.ids('ana@example.eu') == {f'{prefix}{n}' for prefix in 'AB' for n in range(25)}
+    store.close()
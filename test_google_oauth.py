@@ -0,0 +1,88 @@
+"""
+Google OAuth and shared HTTP client tests against the local stub server
+"""
+import asyncio
+
+import pytest
+
+from auth.google import GoogleOAuth, GoogleOAuthError
+from connectors.http import create_http_client
+from connectors.registry import ConnectorRegistry
+from connectors.ted_eu import TEDConnector
+
+
+def make_oauth(stub):
+    return GoogleOAuth('client-id', 'client-secret', 'http://localhost/callback',
+                       token_url=stub.token_url, userinfo_url=stub.userinfo_url)
+
+
+def test_fetch_user_exchanges_code_for_profile(google_stub):
+    oauth = make_oauth(google_stub)
+
+    async def run():
+        async with create_http_client() as client:
+            return await oauth.fetch_user(client, 'ana')
+
+    assert asyncio.run(run()) == {'email': 'ana@example.com', 'name': 'User ana'}
+    assert [(method, path) for method, path, _ in google_stub.requests] == [('POST', '/token'), ('GET', '/userinfo')]
+
+
+@pytest.mark.parametrize('path, reason', [('/token', 'token_exchange_failed'), ('/userinfo', 'user_info_failed')])
+def test_fetch_user_reports_failed_step(google_stub, path, reason):
+    oauth = make_oauth(google_stub)
+    google_stub.fail(path, 400)
+
+    async def run():
+        async with create_http_client() as client:
+            return await oauth.fetch_user(client, 'ana')
+
+    with pytest.raises(GoogleOAuthError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.reason == reason
+
+
+def test_unreachable_google_is_a_token_exchange_failure(google_stub):
+    oauth = make_oauth(google_stub)
+    oauth.token_url = 'http://127.0.0.1:9/token'
+
+    async def run():
+        async with create_http_client(connect_timeout=1.0) as client:
+            return await oauth.fetch_user(client, 'ana')
+
+    with pytest.raises(GoogleOAuthError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.reason == 'token_exchange_failed'
+    assert not GoogleOAuth(None, None, 'http://localhost/callback').configured
+
+
+def test_shared_client_reuses_connections_across_logins(google_stub):
+    oauth = make_oauth(google_stub)
+
+    async def run():
+        async with create_http_client() as client:
+            for n in range(5):
+                await oauth.fetch_user(client, f'user{n}')
+
+    asyncio.run(run())
+    assert len(google_stub.requests) == 10
+    assert len(google_stub.client_ports) == 1
+
+
+def test_registry_connectors_use_the_shared_client(ted_stub):
+    connector = TEDConnector(live=True)
+    connector.base_url = ted_stub.url
+    registry = ConnectorRegistry({'TED': connector})
+
+    async def run():
+        client = create_http_client()
+        registry.use_client(client)
+        tenders = await connector.asearch_tenders({'limit': 10})
+        assert await connector._get_client() is client
+        # The application, not the registry, closes the shared client
+        await registry.aclose()
+        assert not client.is_closed
+        await client.aclose()
+        return tenders
+
+    assert len(asyncio.run(run())) == 10
+
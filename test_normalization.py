@@ -0,0 +1,79 @@
+"""
+Batch normalization tests
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from connectors.base import ProcurementConnector
+from connectors.ted_eu import TEDConnector
+
+
+def test_values_match_scalar_normalizer():
+    raw = ['€1,234.50', '$ 12', 99, 7.5, '2,000,000', '1.5e6']
+    values, errors = ProcurementConnector.normalize_values(raw)
+
+    connector = TEDConnector()
+    assert values.tolist() == [connector.normalize_value(v) for v in raw]
+    assert values.dtype == np.float64
+    assert not errors.any()
+    # Currency codes are handled too, unlike the scalar helper
+    assert ProcurementConnector.normalize_values(['2,000 EUR'])[0][0] == 2000.0
+
+
+def test_values_flag_garbage_but_not_missing():
+    values, errors = ProcurementConnector.normalize_values(pa.array(['n/a', None, '10']))
+
+    assert np.isnan(values[0]) and np.isnan(values[1])
+    assert values[2] == 10.0
+    assert errors.tolist() == [True, False, False]
+
+
+def test_dates_use_fixed_format_then_fallback():
+    dates, errors = ProcurementConnector.normalize_dates(
+        pd.Series(['2026-01-15', '2026-01-16+01:00', '17 Jan 2026', None, 'soon'])
+    )
+
+    assert pd.api.types.is_datetime64_any_dtype(dates)
+    assert dates[:3].dt.day.tolist() == [15, 16, 17]
+    assert dates[3:].isna().all()
+    assert errors.tolist() == [False, False, False, False, True]
+
+
+def test_compact_round_trip():
+    tenders = TEDConnector()._get_sample_tenders({'limit': 200})
+    tenders.loc[0, 'deadline'] = None
+    tenders['value_eur'] = tenders['value_eur'].round(-2)
+
+    compact = ProcurementConnector.to_compact(tenders)
+
+    assert compact['country'].dtype == 'category' and compact['buyer'].dtype == 'category'
+    assert compact['published_date'].dtype == 'Int32' and compact['value_eur'].dtype == np.float32
+    assert compact['published_date'][1] == (pd.Timestamp(tenders['published_date'][1]) - pd.Timestamp(0)).days
+    assert compact.memory_usage(deep=True).sum() < tenders.memory_usage(deep=True).sum()
+    back = ProcurementConnector.from_compact(compact)
+    assert back.isna().equals(tenders.isna())
+    pd.testing.assert_frame_equal(back.fillna(0), tenders.fillna(0), check_dtype=False)
+
+
+def test_compact_arrow_and_consumers():
+    from analytics import aggregate
+    from storage.tender_store import TenderStore
+
+    tenders = TEDConnector()._get_sample_tenders({'limit': 300})
+    compact = ProcurementConnector.to_compact(tenders)
+
+    table = ProcurementConnector.to_compact_arrow(tenders)
+    assert pa.types.is_dictionary(table.schema.field('country').type)
+    assert table.schema.field('deadline').type == pa.date32()
+    assert ProcurementConnector.to_compact_arrow(compact).equals(table)
+
+    expected = aggregate(tenders)
+    got = aggregate(compact)
+    assert got.by('published_date', sort=None)['count'].tolist() == expected.by('published_date', sort=None)['count'].tolist()
+    assert got.by('country_name')['count'].tolist() == expected.by('country_name')['count'].tolist()
+
+    store = TenderStore(':memory:')
+    store.ingest(compact)
+    assert store.search({'limit': 5})['published_date'].tolist() == \
+        tenders.sort_values(['published_date', 'tender_id'], ascending=[False, True])['published_date'].head(5).tolist()
@@ -0,0 +1,54 @@
+"""
+Page template and static asset tests
+"""
+import re
+
+import pytest
+
+from dashboards.assets import STATIC_DIR, StaticAssets, page_environment
+
+
+@pytest.fixture
+def assets():
+    return StaticAssets(STATIC_DIR)
+
+
+def test_fingerprinted_urls_resolve(assets):
+    url = assets.url('css/dashboard.css')
+
+    assert re.fullmatch(r'/static/css/dashboard\.[0-9a-f]{12}\.css', url)
+    assert assets.resolve(url.removeprefix('/static/')) == (STATIC_DIR / 'css' / 'dashboard.css').resolve()
+    assert assets.resolve('css/dashboard.000000000000.css') is None
+    assert assets.resolve('css/dashboard.css') is None
+    assert assets.resolve('../app.000000000000.py') is None
+
+
+def test_dashboard_template_shares_layout(assets):
+    env = page_environment(assets)
+    chart = '<div id="timeline"></div><script>Plotly.newPlot("timeline", {});</script>'
+
+    html = env.get_template('dashboard.html').render(
+        title='IT Tenders', heading='💻 IT Tenders', subtitle='Software & IT',
+        kpis=[(12, 'IT Tenders')], charts=[chart]
+    )
+
+    assert chart in html
+    assert 'Software &amp; IT' in html
+    assert assets.url('css/dashboard.css') in html and '<style>' not in html
+    assert env.get_template('dashboard.html') is env.get_template('dashboard.html')
+    empty = env.get_template('dashboard.html').render(title='x', heading='x', subtitle='', kpis=[], charts=[])
+    assert 'No tenders found' in empty
+
+
+def test_user_pages_escape_their_context(assets):
+    env = page_environment(assets)
+    tender = {'id': '<script>x</script>', 'title': 'Cloud', 'description': '', 'value': 145000,
+              'country': 'DE', 'deadline': '', 'published': '', 'cpv_code': '48', 'cpv_description': '',
+              'contracting_authority': '', 'procedure_type': '', 'documents': ['Spec.pdf']}
+
+    report = env.get_template('report.html').render(tender=tender, back_url='/user/dashboard?token=t')
+    settings = env.get_template('settings.html').render(username='<b>', email='a@b.c', back_url='/user/dashboard')
+
+    assert '<script>x</script>' not in report and '&lt;script&gt;x&lt;/script&gt;' in report
+    assert '€145,000' in report and assets.url('js/report.js') in report
+    assert 'value="&lt;b&gt;"' in settings
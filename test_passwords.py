@@ -0,0 +1,51 @@
+"""
+Password hasher tests
+"""
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from auth import ClientThrottled, HasherBusy, PasswordHasher
+
+
+def test_hash_verify_and_rehash_on_cost_change():
+    old = PasswordHasher(rounds=4)
+    hashed = asyncio.run(old.hash('Correct-horse-1'))
+
+    assert asyncio.run(old.verify('Correct-horse-1', hashed)) == (True, None)
+    assert asyncio.run(old.verify('wrong', hashed)) == (False, None)
+    assert asyncio.run(old.verify('Correct-horse-1', 'not-a-hash')) == (False, None)
+
+    new = PasswordHasher(rounds=5)
+    valid, new_hash = asyncio.run(new.verify('Correct-horse-1', hashed))
+    assert valid and new_hash.startswith('$2b$05$')
+    assert bcrypt.checkpw(b'Correct-horse-1', new_hash.encode())
+    assert asyncio.run(new.verify('wrong', hashed)) == (False, None)
+    assert new.status()['rehashed'] == 1
+
+
+def test_admission_per_client_and_overall():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=3, per_client=2)
+    release = threading.Event()
+    # Occupy the only thread so later operations stay pending
+    hasher._executor.submit(release.wait)
+
+    async def main():
+        pending = [asyncio.create_task(hasher.hash('pw', client='10.0.0.1')) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ClientThrottled):
+            await hasher.hash('pw', client='10.0.0.1')
+        pending.append(asyncio.create_task(hasher.hash('pw', client='10.0.0.2')))
+        await asyncio.sleep(0)
+        with pytest.raises(HasherBusy):
+            await hasher.hash('pw', client='10.0.0.3')
+        release.set()
+        return await asyncio.gather(*pending)
+
+    assert len(asyncio.run(main())) == 3
+    status = hasher.status()
+    assert status['pending'] == 0 and status['clients'] == 0
+    assert status['throttled'] == 1 and status['rejected'] == 1
+    hasher.shutdown()
@@ -0,0 +1,36 @@
+"""
+Client address resolution tests
+"""
+from starlette.requests import Request
+
+from auth import TrustedProxies
+
+PRIVATE = ['10.0.0.0/8', '127.0.0.1/32']
+
+
+def make_request(peer, forwarded_for=None):
+    headers = [(b'x-forwarded-for', forwarded_for.encode())] if forwarded_for else []
+    return Request({'type': 'http', 'headers': headers, 'client': (peer, 40000)})
+
+
+def test_forwarded_for_is_read_from_trusted_proxies_only():
+    proxies = TrustedProxies(PRIVATE)
+
+    assert proxies.client_address(make_request('10.1.2.3', '203.0.113.7')) == '203.0.113.7'
+    # Chained trusted proxies are skipped
+    assert proxies.client_address(make_request('10.1.2.3', '203.0.113.7, 10.9.9.9')) == '203.0.113.7'
+    # A direct client can't claim another address
+    assert proxies.client_address(make_request('198.51.100.1', '203.0.113.7')) == '198.51.100.1'
+
+
+def test_client_written_entries_are_ignored():
+    proxies = TrustedProxies(PRIVATE)
+
+    spoofed = make_request('10.1.2.3', '1.1.1.1, 203.0.113.7')
+    assert proxies.client_address(spoofed) == '203.0.113.7'
+    assert proxies.client_address(make_request('10.1.2.3')) == '10.1.2.3'
+    assert proxies.client_address(make_request('10.1.2.3', 'garbage')) == 'garbage'
+
+
+def test_no_trusted_proxies_uses_the_peer():
+    assert TrustedProxies().client_address(make_request('10.1.2.3', '203.0.113.7')) == '10.1.2.3'
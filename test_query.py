@@ -0,0 +1,83 @@
+"""
+Filter AST and compiler tests
+"""
+import duckdb
+import pandas as pd
+import pytest
+
+from connectors.query import Contains, In, Prefix, Range, apply_local, compile_sql, compile_ted, parse_filters
+from connectors.synthetic import generate_tenders
+from storage import TenderStore
+
+
+def test_pushes_everything_ted_can_express():
+    query, residual = compile_ted(parse_filters({
+        'country': 'DE,FR', 'cpv_code': ['48', '72'], 'min_value': 1_000_000,
+        'max_value': 5e6, 'published_from': '2026-01-01', 'published_to': '2026-01-31',
+        'keywords': 'cloud', 'limit': 10
+    }))
+
+    assert query == (
+        'buyer-country IN (DEU FRA) AND classification-cpv IN (48* 72*)'
+        ' AND estimated-value-lot>=1000000 AND estimated-value-lot<=5000000'
+        ' AND publication-date>=20260101 AND publication-date<=20260131'
+        ' AND FT~"cloud"'
+    )
+    assert residual == []
+
+
+def test_unexpressible_predicates_stay_local():
+    query, residual = compile_ted(parse_filters({'country': 'XX', 'procedure_type': 'Open'}))
+
+    assert query is None
+    assert residual == [In('country', ('XX',)), In('procedure_type', ('Open',))]
+
+
+def test_apply_local_matches_sql():
+    tenders = generate_tenders(500, {'published_from': '2026-01-01', 'published_to': '2026-03-31'})
+    filters = {'country': 'DE,PL', 'cpv_code': '48,45', 'min_value': 500_000,
+               'published_from': '2026-02-01', 'procedure_type': 'Open'}
+    store = TenderStore(':memory:')
+    store.ingest(tenders)
+
+    local = apply_local(tenders, parse_filters(filters))
+
+    assert len(local) > 0
+    assert sorted(local['tender_id']) == sorted(store.search(filters)['tender_id'])
+
+
+@pytest.mark.parametrize('predicate', [
+    In('procedure_type', ('open',)),
+    In('procedure_type', ('Open', 'RESTRICTED')),
+    Contains('title', '50%'),
+    Contains('title', 'e_procurement'),
+    Contains('title', 'back\\slash'),
+    Contains('title', 'CLOUD'),
+])
+def test_compile_sql_matches_apply_local(predicate):
+    tenders = pd.DataFrame({
+        'tender_id': ['T1', 'T2', 'T3', 'T4', 'T5', 'T6'],
+        'procedure_type': ['Open', 'open', 'OPEN', 'Restricted', 'Negotiated', 'Open'],
+        'title': ['50% discount', '500 units', 'e_procurement', 'eXprocurement', 'back\\slash', 'Cloud hosting'],
+    })
+    where, params = compile_sql([predicate])
+
+    in_sql = duckdb.connect().execute(f"SELECT tender_id FROM tenders{where}", params).df()
+
+    local = apply_local(tenders, [predicate])
+    assert len(local) > 0
+    assert sorted(in_sql['tender_id']) == sorted(local['tender_id'])
+
+
+def test_compile_sql_is_parameterized():
+    where, params = compile_sql([Prefix('cpv_code', ('48', '72')), Range('value_eur', low=10.0)])
+
+    assert where == ' WHERE (starts_with(cpv_code, ?) OR starts_with(cpv_code, ?)) AND value_eur >= ?'
+    assert params == ['48', '72', 10.0]
+
+
+def test_sample_data_honours_multiple_values():
+    tenders = generate_tenders(200, {'country': ['FR', 'IT'], 'cpv_code': '45,90'})
+
+    assert set(tenders['country']) == {'FR', 'IT'}
+    assert set(tenders['cpv_code'].str[:2]) == {'45', '90'}
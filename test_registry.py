@@ -0,0 +1,72 @@
+"""
+Connector registry and federated search tests
+"""
+import asyncio
+import time
+
+import pandas as pd
+
+from connectors.registry import ConnectorRegistry, FederatedConnector, CONNECTOR_CLASSES
+from connectors.cache import CachedConnector
+from connectors.ted_eu import TEDConnector
+
+
+class SlowConnector(TEDConnector):
+    def __init__(self, delay, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.fail = fail
+
+    async def asearch_tenders(self, filters=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('upstream down')
+        return self._get_sample_tenders({**filters, 'country': self.source_name})
+
+
+def test_from_config_builds_enabled_sources_only(tmp_path):
+    config = {
+        'sources': {
+            'ted_eu': {'enabled': True, 'cache_hours': 1, 'api_url': 'http://ted.test/v3'},
+            'sam_gov': {'enabled': True},
+            'other': {'enabled': False},
+        },
+        'cache': {'enabled': True, 'directory': 'cache'},
+    }
+
+    registry = ConnectorRegistry.from_config(config, base_dir=tmp_path)
+
+    assert list(registry) == ['ted_eu']
+    assert isinstance(registry['ted_eu'], CachedConnector)
+    assert registry.sources['ted_eu'].base_url == 'http://ted.test/v3'
+    assert 'sam_gov' not in CONNECTOR_CLASSES
+
+
+def test_fan_out_is_concurrent_with_partial_results():
+    sources = {}
+    for name, delay, fail in (('DE', 0.3, False), ('FR', 0.3, False), ('IT', 5, False), ('ES', 0, True)):
+        sources[name] = SlowConnector(delay, fail)
+        sources[name].source_name = name
+    registry = ConnectorRegistry(sources, timeouts={name: 1.0 for name in sources})
+    federated = FederatedConnector(registry)
+
+    started = time.perf_counter()
+    tenders, status = asyncio.run(federated.asearch_with_status({'limit': 10}))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 2
+    assert status['DE'] == {'status': 'ok', 'rows': 10, 'elapsed_ms': status['DE']['elapsed_ms']}
+    assert status['IT']['status'] == 'timeout'
+    assert status['ES']['status'] == 'error'
+    assert sorted(tenders['country'].unique()) == ['DE', 'FR']
+    assert len(tenders) == 20
+
+
+def test_merge_aligns_schema():
+    merged = FederatedConnector.merge([
+        pd.DataFrame({'tender_id': ['a'], 'title': ['A'], 'extra': [1]}),
+        pd.DataFrame({'tender_id': ['a', 'b'], 'value_eur': [1.0, 2.0]}),
+    ])
+
+    assert 'extra' not in merged.columns
+    assert merged['tender_id'].tolist() == ['a', 'b']
@@ -0,0 +1,50 @@
+"""
+Render cache tests
+"""
+from connectors.synthetic import generate_tenders
+from dashboards.generator import DashboardGenerator
+from dashboards.render_cache import RenderCache, fingerprint
+
+
+def test_fingerprint_follows_content():
+    tenders = generate_tenders(100)
+
+    assert fingerprint(tenders, 'page') == fingerprint(tenders.copy(), 'page')
+    assert fingerprint(tenders, 'page') != fingerprint(tenders, 'other')
+    changed = tenders.copy()
+    changed.loc[5, 'value_eur'] += 1
+    assert fingerprint(changed, 'page') != fingerprint(tenders, 'page')
+
+
+def test_lru_eviction_by_bytes():
+    cache = RenderCache(max_bytes=250)
+    cache.put('a', 'x' * 100)
+    cache.put('b', 'x' * 100)
+    cache.get('a')
+    cache.put('c', 'x' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.bytes == 200
+    assert cache.status()['evictions'] == 1
+
+
+def test_oversized_values_are_not_cached():
+    cache = RenderCache(max_bytes=10)
+    cache.put('big', 'x' * 100)
+
+    assert cache.get('big') is None
+    assert cache.bytes == 0
+
+
+def test_generator_renders_identical_data_once():
+    cache = RenderCache()
+    generator = DashboardGenerator(cache=cache)
+    tenders = generate_tenders(100)
+
+    first = generator.create_tender_overview(tenders.copy())
+    second = generator.create_tender_overview(tenders.copy())
+
+    assert second is first
+    assert cache.status()['hits'] == 1
+    assert generator.create_tender_overview(generate_tenders(50)) is not first
@@ -0,0 +1,60 @@
+"""
+Render pool tests
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dashboards.render_pool import RenderPool, RenderRejected, RenderTimeout
+
+
+def test_renders_run_off_the_event_loop():
+    pool = RenderPool(workers=2)
+
+    async def main():
+        loop_thread = threading.current_thread()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        threads = await asyncio.gather(*(pool.run(lambda: time.sleep(0.2) or threading.current_thread())
+                                         for _ in range(2)))
+        task.cancel()
+        assert loop_thread not in threads
+        return ticks
+
+    # The loop kept ticking while both renders slept in parallel
+    assert asyncio.run(main()) >= 5
+    assert pool.status()['completed'] == 2
+    pool.shutdown()
+
+
+def test_full_queue_rejects_and_slow_render_times_out():
+    pool = RenderPool(workers=1, max_queue=1, timeout=0.1)
+    release = threading.Event()
+
+    async def main():
+        busy = asyncio.create_task(pool.run(release.wait, timeout=5))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(pool.run(lambda: 'late'))
+        await asyncio.sleep(0)
+        with pytest.raises(RenderRejected):
+            await pool.run(lambda: 'rejected')
+        with pytest.raises(RenderTimeout):
+            await waiting
+        release.set()
+        await busy
+
+    asyncio.run(main())
+    status = pool.status()
+    # The timed-out render was still queued, so it was dropped unrun
+    assert status['queued'] == 0 and status['completed'] == 1
+    assert status['rejected'] == 1 and status['timeouts'] == 1
+    pool.shutdown()
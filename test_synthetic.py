@@ -0,0 +1,67 @@
+"""
+Synthetic tender generator tests
+"""
+from datetime import date
+
+import pandas as pd
+
+from connectors.synthetic import generate_table, generate_tenders, write_parquet
+
+FILTERS = {
+    'country': 'FR', 'cpv_code': '72', 'min_value': 50_000, 'max_value': 200_000,
+    'published_from': '2026-03-01', 'published_to': '2026-03-31',
+    'deadline_to': '2026-05-15',
+}
+
+
+def test_output_is_deterministic():
+    a = generate_tenders(1000, FILTERS, seed=7, base_date=date(2026, 4, 1))
+    b = generate_tenders(1000, FILTERS, seed=7, base_date=date(2026, 4, 1))
+    pd.testing.assert_frame_equal(a, b)
+
+
+def test_filters_are_honored_at_generation_time():
+    tenders = generate_tenders(5000, FILTERS)
+
+    assert len(tenders) == 5000
+    assert (tenders['country'] == 'FR').all()
+    assert tenders['cpv_code'].str.startswith('72').all()
+    assert tenders['value_eur'].between(50_000, 200_000).all()
+    assert tenders['published_date'].between('2026-03-01', '2026-03-31').all()
+    assert (tenders['deadline'] <= '2026-05-15').all()
+    assert (pd.to_datetime(tenders['deadline']) - pd.to_datetime(tenders['published_date'])).dt.days.min() >= 30
+    assert tenders['tender_id'].is_unique
+
+
+def test_different_filters_do_not_share_ids():
+    de = generate_tenders(10, {'country': 'DE'})
+    fr = generate_tenders(10, {'country': 'FR'})
+    assert not set(de['tender_id']) & set(fr['tender_id'])
+
+
+def test_daily_windows_get_disjoint_ids():
+    days = pd.date_range('2026-01-01', periods=365).strftime('%Y-%m-%d')
+    ids = [set(generate_tenders(5, {'published_from': day, 'published_to': day})['tender_id']) for day in days]
+    assert len(set().union(*ids)) == 5 * 365
+
+
+def test_same_id_is_the_same_row_for_any_limit():
+    small = generate_tenders(10, FILTERS, base_date=date(2026, 4, 1)).set_index('tender_id')
+    large = generate_tenders(20_000, FILTERS, base_date=date(2026, 4, 1)).set_index('tender_id')
+    pd.testing.assert_frame_equal(small, large.loc[small.index])
+    # Also across generator blocks and chunk boundaries
+    chunked = pd.concat([
+        generate_table(9000, FILTERS, base_date=date(2026, 4, 1), id_offset=offset).to_pandas()
+        for offset in (0, 9000)
+    ]).set_index('tender_id')
+    pd.testing.assert_frame_equal(chunked, large.iloc[:18_000])
+
+
+def test_write_parquet_in_chunks(tmp_path):
+    path = tmp_path / 'tenders.parquet'
+
+    assert write_parquet(path, 2500, seed=1, chunk_size=1000) == 2500
+
+    tenders = pd.read_parquet(path)
+    assert len(tenders) == 2500
+    assert tenders['tender_id'].is_unique
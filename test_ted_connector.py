@@ -0,0 +1,97 @@
+"""
+TED connector tests against the local stub server
+"""
+import asyncio
+
+from connectors.ted_eu import TEDConnector
+
+
+def make_connector(stub, **kwargs):
+    connector = TEDConnector(live=True, **kwargs)
+    connector.base_url = stub.url
+    return connector
+
+
+def test_fetch_requests_every_page(ted_stub):
+    connector = make_connector(ted_stub, page_size=100)
+
+    tenders = connector.search_tenders({'limit': 1000})
+
+    assert len(tenders) == 1000
+    assert sorted(int(r['pageNum'][0]) for r in ted_stub.requests) == list(range(1, 11))
+    # Pages are reassembled in order
+    assert tenders['tender_id'].iloc[0] == '00000000-2026'
+    assert tenders['tender_id'].iloc[-1] == '00000999-2026'
+    assert tenders['value_eur'].iloc[1] == 100001.0
+
+
+def test_fetch_trims_to_limit_and_short_results(ted_stub):
+    ted_stub.total_notices = 150
+    connector = make_connector(ted_stub, page_size=100)
+
+    assert len(connector.search_tenders({'limit': 120})) == 120
+    assert len(connector.search_tenders({'limit': 500})) == 150
+
+
+def test_filters_are_sent_as_query(ted_stub):
+    connector = make_connector(ted_stub)
+
+    connector.search_tenders({'country': 'DE', 'cpv_code': '48', 'limit': 10})
+
+    assert ted_stub.requests[0]['q'] == ['buyer-country IN (DEU) AND classification-cpv IN (48*)']
+
+
+def test_pages_are_fetched_concurrently(ted_stub):
+    ted_stub.latency = 0.2
+    connector = make_connector(ted_stub, page_size=100, max_concurrency=5)
+
+    tenders = connector.search_tenders({'limit': 1000})
+
+    assert len(tenders) == 1000
+    assert 1 < ted_stub.max_in_flight <= 5
+
+
+def test_local_filters_keep_paging_until_limit(ted_stub):
+    connector = make_connector(ted_stub, page_size=100)
+
+    # Every fourth stub notice is restricted; TED can't filter on it
+    tenders = connector.search_tenders({'procedure_type': 'restricted', 'limit': 100})
+
+    assert len(tenders) == 100
+    assert (tenders['procedure_type'] == 'restricted').all()
+    assert tenders['tender_id'].is_monotonic_increasing
+    assert len(ted_stub.requests) == 4
+
+    ted_stub.requests.clear()
+    assert len(connector.search_tenders({'procedure_type': 'restricted', 'limit': 300})) == 250
+    assert len(ted_stub.requests) == 10
+
+
+def test_sample_data_fills_limit_after_local_filters():
+    tenders = TEDConnector().search_tenders({'procedure_type': 'Restricted', 'limit': 100})
+
+    assert len(tenders) == 100
+    assert (tenders['procedure_type'] == 'Restricted').all()
+
+
+def test_blocking_search_works_inside_event_loop(ted_stub):
+    connector = make_connector(ted_stub)
+
+    async def handler():
+        return connector.search_tenders({'limit': 10})
+
+    assert len(asyncio.run(handler())) == 10
+
+
+def test_shared_client_is_reused(ted_stub):
+    connector = make_connector(ted_stub)
+
+    async def run():
+        await connector.asearch_tenders({'limit': 100})
+        client = connector._client
+        await connector.asearch_tenders({'limit': 100})
+        assert connector._client is client
+        await connector.aclose()
+
+    asyncio.run(run())
+
@@ -0,0 +1,109 @@
+"""
+On-disk tender cache tests
+"""
+import os
+import time
+
+import pandas as pd
+
+from connectors.cache import TenderCache, CachedConnector
+from connectors.ted_eu import TEDConnector
+
+
+class CountingConnector(TEDConnector):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def search_tenders(self, filters=None):
+        self.calls += 1
+        return self._get_sample_tenders(filters or {})
+
+
+def age(cache, key, seconds):
+    path = cache._path(key)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_key_ignores_order_and_empty_values():
+    a = TenderCache.make_key('TED', {'country': 'de', 'limit': 10, 'cpv_code': None})
+    b = TenderCache.make_key('TED', {'limit': 10, 'country': 'DE'})
+    assert a == b
+    assert a != TenderCache.make_key('TED', {'limit': 20, 'country': 'DE'})
+
+
+def test_hit_skips_upstream(tmp_path):
+    connector = CountingConnector()
+    cached = CachedConnector(connector, TenderCache(tmp_path))
+
+    first = cached.search_tenders({'limit': 10})
+    second = cached.search_tenders({'limit': 10})
+
+    assert connector.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_stale_entry_is_served_then_refreshed(tmp_path):
+    connector = CountingConnector()
+    cache = TenderCache(tmp_path, ttl_hours=1, max_age_hours=24)
+    cached = CachedConnector(connector, cache)
+    cached.search_tenders({'limit': 10})
+    key = cache.make_key(cached.source_name, {'limit': 10})
+    age(cache, key, 2 * 3600)
+
+    assert cache.get(key)[1] == 'stale'
+    assert len(cached.search_tenders({'limit': 10})) == 10
+
+    deadline = time.time() + 5
+    while cache.get(key)[1] != 'fresh' and time.time() < deadline:
+        time.sleep(0.01)
+    assert connector.calls == 2
+    assert cache.get(key)[1] == 'fresh'
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = TenderCache(tmp_path, ttl_hours=1, max_age_hours=2)
+    cache.put('k', pd.DataFrame({'a': [1]}))
+    age(cache, 'k', 3 * 3600)
+
+    assert cache.get('k') == (None, 'miss')
+    assert cache.get('k', allow_expired=True)[1] == 'expired'
+
+
+def test_lru_eviction_keeps_recently_read(tmp_path):
+    frame = pd.DataFrame({'a': range(1000)})
+    cache = TenderCache(tmp_path, max_size_mb=1)
+    cache.put('old', frame)
+    cache.put('new', frame)
+    size = cache._path('old').stat().st_size
+    cache.max_size = int(size * 2.5)
+
+    os.utime(cache._path('new'), (time.time() - 100, time.time()))
+    cache.get('old')
+    cache.put('third', frame)
+
+    assert cache.get('old')[0] is not None
+    assert cache.get('new') == (None, 'miss')
+
+
+def test_lru_without_fd_utime_never_touches_write_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, 'supports_fd', set())
+    frame = pd.DataFrame({'a': range(1000)})
+    cache = TenderCache(tmp_path, max_size_mb=1)
+    cache.put('old', frame)
+    cache.put('new', frame)
+    cache.max_size = int(cache._path('old').stat().st_size * 2.5)
+    age(cache, 'old', 3600)
+    written = cache._path('old').stat().st_mtime
+
+    os.utime(cache._path('new'), (time.time() - 100, time.time()))
+    touched = []
+    monkeypatch.setattr(os, 'utime', lambda *args, **kwargs: touched.append(args))
+    cache.get('old')
+    cache.put('third', frame)
+
+    assert touched == []
+    assert cache._path('old').stat().st_mtime == written
+    assert cache.get('old')[0] is not None
+    assert cache.get('new') == (None, 'miss')
@@ -0,0 +1,99 @@
+"""
+DuckDB tender store tests
+"""
+import multiprocessing
+
+import pandas as pd
+
+from connectors.ted_eu import TEDConnector
+from storage.tender_store import TenderStore
+
+
+def sample(n=200):
+    return TEDConnector()._get_sample_tenders({'limit': n})
+
+
+def test_ingest_upserts_by_tender_id():
+    store = TenderStore(':memory:')
+    tenders = sample(50)
+
+    assert store.ingest(tenders) == 50
+    tenders.loc[0, 'title'] = 'Amended'
+    store.ingest(tenders.head(1))
+
+    assert store.count() == 50
+    assert store.search({'keywords': 'amended'})['tender_id'].tolist() == [tenders.loc[0, 'tender_id']]
+
+
+def test_search_matches_dataframe_filters():
+    store = TenderStore(':memory:')
+    tenders = sample()
+    store.ingest(tenders)
+
+    result = store.search({'country': 'de', 'cpv_code': '48', 'min_value': 1_000_000})
+
+    expected = tenders[
+        (tenders['country'] == 'DE')
+        & tenders['cpv_code'].str.startswith('48')
+        & (tenders['value_eur'] >= 1_000_000)
+    ]
+    assert sorted(result['tender_id']) == sorted(expected['tender_id'])
+    assert list(result.columns) == list(tenders.columns)
+
+
+def test_statistics_match_connector_summary():
+    store = TenderStore(':memory:')
+    tenders = sample()
+    store.ingest(tenders)
+
+    stats = store.statistics()
+    expected = TEDConnector.compute_statistics(tenders)
+
+    assert stats['total_tenders'] == expected['total_tenders']
+    assert stats['total_value'] == expected['total_value']
+    assert stats['countries'] == expected['countries']
+    assert stats['top_countries'] == expected['top_countries']
+    assert store.statistics({'country': 'XX'}) == {}
+
+
+def test_connector_statistics_use_store():
+    store = TenderStore(':memory:')
+    store.ingest(pd.DataFrame([{
+        'tender_id': 'T-1', 'country': 'DE', 'country_name': 'Germany',
+        'cpv_description': 'Software', 'value_eur': 10.0,
+        'published_date': '2026-01-01', 'deadline': '2026-02-01',
+    }]))
+    connector = TEDConnector(store=store)
+
+    assert connector.get_statistics({'country': 'DE'})['total_value'] == 10.0
+
+
+def ingest_in_batches(path, prefix, batches):
+    """Worker process: write batches of renamed sample tenders, reading in between"""
+    store = TenderStore(path)
+    tenders = sample(50)
+    for n in range(batches):
+        batch = tenders.copy()
+        batch['tender_id'] = [f'{prefix}-{n}-{i}' for i in range(len(batch))]
+        store.ingest(batch)
+        store.aggregates()
+    store.close()
+
+
+def test_store_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'tenders.duckdb')
+    store = TenderStore(path)
+    context = multiprocessing.get_context('spawn')
+    writers = [context.Process(target=ingest_in_batches, args=(path, prefix, 5)) for prefix in 'AB']
+    for writer in writers:
+        writer.start()
+
+    # Reads here interleave with both writers instead of failing on DuckDB's file lock
+    while any(writer.is_alive() for writer in writers):
+        assert store.count() % 50 == 0
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    assert store.count() == 2 * 5 * 50
+    assert store.statistics()['total_tenders'] == 500
@@ -0,0 +1,131 @@
+"""
+Delta sync tests
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pandas as pd
+
+from connectors.ted_eu import TEDConnector
+from connectors.sync import TenderSync
+from storage.locks import FileLock
+from storage.tender_store import TenderStore
+
+
+class FeedConnector(TEDConnector):
+    """Serves a fixed set of notices and records the requested windows"""
+
+    def __init__(self, notices, max_results=None):
+        super().__init__()
+        self.notices = notices
+        self.max_results = max_results
+        self.windows = []
+        self.limits = []
+
+    async def asearch_tenders(self, filters=None):
+        self.windows.append((filters['published_from'], filters['published_to']))
+        self.limits.append(filters['limit'])
+        published = self.notices['published_date']
+        return self.notices[
+            (published >= filters['published_from']) & (published <= filters['published_to'])
+        ].head(min(filters['limit'], self.max_results or filters['limit']))
+
+
+def notice(tender_id, days_ago, title='Notice'):
+    return {
+        'tender_id': tender_id, 'title': title, 'country': 'DE',
+        'published_date': (date.today() - timedelta(days=days_ago)).isoformat(),
+        'value_eur': 1.0,
+    }
+
+
+def test_first_run_backfills_then_only_fetches_since_watermark():
+    store = TenderStore(':memory:')
+    connector = FeedConnector(pd.DataFrame([notice('A', 5), notice('B', 2)]))
+    sync = TenderSync(connector, store, initial_days=7, overlap_days=1)
+
+    result = asyncio.run(sync.run_once())
+    assert result['rows'] == 2
+    assert len(connector.windows) == 8
+    assert store.get_watermark(sync.source)['last_published'] == date.today() - timedelta(days=2)
+
+    connector.windows.clear()
+    connector.notices = pd.DataFrame([notice('B', 2, 'Amended'), notice('C', 0)])
+    asyncio.run(sync.run_once())
+
+    # Overlap day, watermark day .. today
+    assert connector.windows[0][0] == (date.today() - timedelta(days=3)).isoformat()
+    assert len(connector.windows) == 4
+    assert store.count() == 3
+    assert store.search({'keywords': 'amended'})['tender_id'].tolist() == ['B']
+
+    status = sync.status()
+    assert status['rows_synced'] == 4
+    assert status['data_lag_days'] == 0
+    assert status['sync_lag_seconds'] >= 0
+
+
+def busy_day(count, days_ago):
+    return [notice(f'D{days_ago}-{n}', days_ago) for n in range(count)]
+
+
+def test_day_filling_batch_limit_is_read_in_full():
+    store = TenderStore(':memory:')
+    connector = FeedConnector(pd.DataFrame(busy_day(3, 1) + busy_day(7, 0)))
+    sync = TenderSync(connector, store, initial_days=1, batch_limit=3)
+
+    result = asyncio.run(sync.run_once())
+
+    assert result['rows'] == 10 and result['truncated_days'] == []
+    # Exactly batch_limit rows could be a truncated day, so it is re-read
+    assert connector.limits == [3, 12, 3, 12]
+    assert store.get_watermark(sync.source)['last_published'] == date.today()
+    assert sync.last_error is None
+
+
+def test_truncated_day_holds_the_watermark():
+    store = TenderStore(':memory:')
+    connector = FeedConnector(pd.DataFrame(busy_day(2, 3) + busy_day(9, 2) + busy_day(1, 1)), max_results=8)
+    sync = TenderSync(connector, store, initial_days=3, batch_limit=2)
+
+    result = asyncio.run(sync.run_once())
+
+    truncated = (date.today() - timedelta(days=2)).isoformat()
+    assert result['truncated_days'] == [truncated]
+    assert store.count() == 2 + 8 + 1
+    # Held before the truncated day, so the next run reads it again
+    assert store.get_watermark(sync.source)['last_published'] == date.today() - timedelta(days=3)
+    assert store.get_watermark(sync.source)['last_notice_id'] == 'D3-1'
+    status = sync.status()
+    assert status['truncated_days'] == [truncated]
+    assert truncated in status['last_error']
+
+    connector.windows.clear()
+    asyncio.run(sync.run_once())
+    assert (truncated, truncated) in connector.windows
+
+
+def test_only_the_lock_holder_syncs(tmp_path):
+    store = TenderStore(':memory:')
+    lock_path = tmp_path / 'sync.lock'
+    connectors = [FeedConnector(pd.DataFrame([notice('A', 0)])) for _ in range(2)]
+    # Separate FileLocks on one file, as each worker process builds its own
+    syncs = [TenderSync(connector, store, initial_days=0, leader_lock=FileLock(lock_path))
+             for connector in connectors]
+
+    async def run():
+        for sync in syncs:
+            sync.start()
+        await asyncio.sleep(0.1)
+        assert [sync.status()['leader'] for sync in syncs] == [True, False]
+        assert [len(connector.windows) for connector in connectors] == [1, 0]
+
+        # The standby takes over once the leader stops
+        await syncs[0].stop()
+        await syncs[1].stop()
+        syncs[1].start()
+        await asyncio.sleep(0.1)
+        assert syncs[1].leading and connectors[1].windows
+        await syncs[1].stop()
+
+    asyncio.run(run())
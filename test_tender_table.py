@@ -0,0 +1,70 @@
+"""
+Typed tender table tests
+"""
+import pandas as pd
+
+from analytics import days_until, tender_table
+from connectors.synthetic import generate_tenders
+from dashboards.generator import DashboardGenerator
+from dashboards.powerbi_layout import PowerBIDashboard
+from storage.tender_store import TenderStore
+
+
+def test_typing_is_idempotent_and_leaves_input_alone():
+    tenders = generate_tenders(500)
+    tenders.loc[3, 'deadline'] = None
+    before = tenders.copy()
+
+    table = tender_table(tenders)
+
+    pd.testing.assert_frame_equal(tenders, before)
+    assert pd.api.types.is_datetime64_any_dtype(table['published_date'])
+    assert isinstance(table['country'].dtype, pd.CategoricalDtype)
+    assert pd.isna(table.loc[3, 'deadline'])
+    assert table['published_date'].dt.strftime('%Y-%m-%d').tolist() == tenders['published_date'].tolist()
+
+    assert tender_table(table) is table
+
+
+def test_derived_tables_and_input_are_isolated():
+    tenders = generate_tenders(100)
+    before = tenders.copy()
+
+    table = tender_table(tenders)
+    table.loc[0, 'title'] = 'Changed'
+    table['buyer'] = table['buyer'].str.upper()
+    derived = table.iloc[10:20]
+    derived.loc[15, 'title'] = 'Changed again'
+
+    pd.testing.assert_frame_equal(tenders, before)
+    assert table.loc[15, 'title'] == before.loc[15, 'title']
+
+    tenders.loc[1, 'title'] = 'Changed at source'
+    assert table.loc[1, 'title'] == before.loc[1, 'title']
+
+
+def test_store_serves_typed_table():
+    store = TenderStore(':memory:')
+    tenders = generate_tenders(300)
+    store.ingest(tenders)
+
+    table = store.table({'country': 'DE', 'limit': 20})
+
+    assert len(table) == 20 and set(table['country']) == {'DE'}
+    assert isinstance(table['cpv_description'].dtype, pd.CategoricalDtype)
+    assert table['published_date'].is_monotonic_decreasing
+
+
+def test_chart_builders_only_read():
+    for tenders in (generate_tenders(400), tender_table(generate_tenders(400))):
+        before = tenders.copy()
+        generator = DashboardGenerator()
+        generator.create_tender_overview(tenders)
+        generator.create_market_intelligence(tenders)
+        PowerBIDashboard().create_tab_dashboard(tenders)
+        pd.testing.assert_frame_equal(tenders, before)
+
+
+def test_days_until():
+    dates = pd.Series(['2026-01-10', '2026-01-01', None])
+    assert days_until(dates, today='2026-01-03').tolist()[:2] == [7, -2]
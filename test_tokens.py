@@ -0,0 +1,68 @@
+"""
+Session token tests
+"""
+from datetime import timedelta
+
+import jwt
+import pytest
+from starlette.requests import Request
+
+from auth import InvalidToken, TokenVerifier, request_token
+
+SECRET = 'test-secret-' + 'x' * 32
+
+
+def make_request(headers=None):
+    return Request({'type': 'http', 'headers': [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]})
+
+
+def test_verified_tokens_are_cached():
+    verifier = TokenVerifier(SECRET)
+    token = verifier.issue('ana@example.eu')
+
+    first = verifier.verify(token)
+    assert verifier.verify(token) is first
+    assert (first.email, first.username) == ('ana@example.eu', 'ana')
+    assert verifier.status()['hits'] == 1 and verifier.status()['misses'] == 1
+
+
+def test_cache_never_outlives_the_token():
+    verifier = TokenVerifier(SECRET, lifetime=timedelta(seconds=-1))
+    token = verifier.issue('ana@example.eu')
+    with pytest.raises(InvalidToken) as error:
+        verifier.verify(token)
+    assert error.value.reason == 'expired'
+
+    verifier = TokenVerifier(SECRET, cache_seconds=0)
+    token = verifier.issue('ana@example.eu')
+    verifier.verify(token)
+    verifier.verify(token)
+    assert verifier.status()['hits'] == 0
+
+
+@pytest.mark.parametrize('token, reason', [
+    (None, 'missing'),
+    ('not-a-jwt', 'invalid'),
+    (jwt.encode({'email': 'ana@example.eu'}, 'other-' + SECRET, algorithm='HS256'), 'invalid'),
+    (jwt.encode({'username': 'ana'}, SECRET, algorithm='HS256'), 'invalid'),
+])
+def test_rejected_tokens(token, reason):
+    verifier = TokenVerifier(SECRET)
+    with pytest.raises(InvalidToken) as error:
+        verifier.verify(token)
+    assert error.value.reason == reason
+    assert verifier.status()['entries'] == 0
+
+
+def test_lru_is_bounded():
+    verifier = TokenVerifier(SECRET, max_entries=2)
+    for name in ('a', 'b', 'c'):
+        verifier.verify(verifier.issue(f'{name}@example.eu'))
+    assert verifier.status()['entries'] == 2
+
+
+def test_request_token_sources():
+    assert request_token(make_request(), 'from-query') == 'from-query'
+    assert request_token(make_request({'Authorization': 'Bearer abc'})) == 'abc'
+    assert request_token(make_request({'Authorization': 'Basic abc'})) is None
+    assert request_token(make_request()) is None
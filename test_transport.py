@@ -0,0 +1,116 @@
+"""
+Resilient transport tests against the local stub server
+"""
+import time
+
+import pytest
+
+from connectors.cache import TenderCache, CachedConnector
+from connectors.ted_eu import TEDConnector
+from connectors.transport import CircuitOpenError, ResilientTransport, TokenBucket, UpstreamError, UpstreamRejected
+
+
+def make_connector(stub, **kwargs):
+    transport = ResilientTransport(**{'backoff_base': 0.01, **kwargs})
+    connector = TEDConnector(live=True, transport=transport)
+    connector.base_url = stub.url
+    return connector
+
+
+def test_transient_errors_are_retried(ted_stub):
+    ted_stub.fail(503, times=2)
+    connector = make_connector(ted_stub, max_attempts=3)
+
+    assert len(connector.search_tenders({'limit': 10})) == 10
+    assert len(ted_stub.requests) == 3
+    assert connector.transport.breaker(ted_stub.url).state == 'closed'
+
+
+def test_retry_after_is_honoured(ted_stub):
+    ted_stub.fail(429, headers={'Retry-After': '1'})
+    connector = make_connector(ted_stub)
+
+    started = time.perf_counter()
+    connector.search_tenders({'limit': 10})
+
+    assert time.perf_counter() - started >= 1.0
+    assert len(ted_stub.requests) == 2
+
+
+def test_long_retry_after_fails_fast(ted_stub):
+    ted_stub.fail(429, headers={'Retry-After': '120'})
+    connector = make_connector(ted_stub, max_retry_after=5)
+
+    started = time.perf_counter()
+    with pytest.raises(UpstreamError):
+        connector.search_tenders({'limit': 10})
+
+    assert time.perf_counter() - started < 1.0
+    assert len(ted_stub.requests) == 1
+
+
+def test_open_circuit_rejects_without_calling_upstream(ted_stub):
+    ted_stub.fail(503, times=10)
+    connector = make_connector(ted_stub, max_attempts=2, failure_threshold=2, reset_seconds=60)
+
+    with pytest.raises(UpstreamError):
+        connector.search_tenders({'limit': 10})
+    with pytest.raises(CircuitOpenError):
+        connector.search_tenders({'limit': 10})
+
+    assert len(ted_stub.requests) == 2
+    assert connector.transport.status()[ted_stub.url.split('/')[2]]['rejected'] == 1
+
+
+def test_half_open_probe_closes_circuit(ted_stub):
+    ted_stub.fail(503, times=2)
+    connector = make_connector(ted_stub, max_attempts=2, failure_threshold=2, reset_seconds=0.1)
+
+    with pytest.raises(UpstreamError):
+        connector.search_tenders({'limit': 10})
+    time.sleep(0.15)
+
+    assert len(connector.search_tenders({'limit': 10})) == 10
+    assert connector.transport.breaker(ted_stub.url).state == 'closed'
+
+
+def test_cache_serves_last_result_while_upstream_is_down(ted_stub, tmp_path):
+    connector = make_connector(ted_stub, max_attempts=1, failure_threshold=1)
+    cache = TenderCache(tmp_path, ttl_hours=0, max_age_hours=0)
+    cached = CachedConnector(connector, cache)
+    first = cached.search_tenders({'limit': 10})
+
+    ted_stub.fail(503)
+    again = cached.search_tenders({'limit': 10})
+
+    assert again['tender_id'].tolist() == first['tender_id'].tolist()
+    with pytest.raises(CircuitOpenError):
+        cached.search_tenders({'limit': 20})
+
+
+def test_rejected_request_falls_back_to_cache(ted_stub, tmp_path):
+    connector = make_connector(ted_stub)
+    cache = TenderCache(tmp_path, ttl_hours=0, max_age_hours=0)
+    cached = CachedConnector(connector, cache)
+    first = cached.search_tenders({'limit': 10})
+
+    ted_stub.fail(400)
+    again = cached.search_tenders({'limit': 10})
+
+    assert again['tender_id'].tolist() == first['tender_id'].tolist()
+    # Not retried, and a refusal is not an outage
+    assert len(ted_stub.requests) == 2
+    assert connector.transport.breaker(ted_stub.url).state == 'closed'
+    ted_stub.fail(404)
+    with pytest.raises(UpstreamRejected) as excinfo:
+        cached.search_tenders({'limit': 20})
+    assert excinfo.value.response.status_code == 404
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    waits = [bucket.reserve() for _ in range(6)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[-1] == pytest.approx(0.2, abs=0.02)
@@ -0,0 +1,64 @@
+"""
+User store tests
+"""
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.users import SQLiteUserStore, User
+
+
+def test_accounts_survive_reopening(tmp_path):
+    path = tmp_path / 'users.sqlite3'
+    store = SQLiteUserStore(path)
+    assert store.create(User('Ana@Example.eu', 'ana', hashed_password='$2b$04$hash'))
+    store.close()
+
+    store = SQLiteUserStore(path)
+    user = store.get('ana@example.eu')
+    assert (user.email, user.username, user.provider) == ('Ana@Example.eu', 'ana', 'email')
+
+    store.set_password_hash('ANA@example.eu', '$2b$12$new')
+    assert store.get('ana@example.eu').hashed_password == '$2b$12$new'
+    assert store.get('bob@example.eu') is None
+    store.close()
+
+
+def test_email_is_unique_across_connections(tmp_path):
+    stores = [SQLiteUserStore(tmp_path / 'users.sqlite3', pool_size=2) for _ in range(2)]
+
+    emails = ('ana@example.eu', 'ANA@example.eu')
+
+    with ThreadPoolExecutor(8) as pool:
+        created = list(pool.map(lambda n: stores[n % 2].create(User(emails[n % 2], f'ana{n}')), range(16)))
+
+    assert created.count(True) == 1
+    assert not stores[1].create(User('ANA@example.eu', 'other', provider='google'))
+    for store in stores:
+        store.close()
+
+
+def sign_up(path, username, ready):
+    """Worker process: open the shared store and create one account"""
+    store = SQLiteUserStore(path)
+    ready.wait()
+    created = store.create(User('ana@example.eu', username))
+    store.close()
+    raise SystemExit(0 if created else 1)
+
+
+def test_accounts_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'users.sqlite3')
+    context = multiprocessing.get_context('spawn')
+    ready = context.Event()
+    workers = [context.Process(target=sign_up, args=(path, f'ana{n}', ready)) for n in range(2)]
+    for worker in workers:
+        worker.start()
+    ready.set()
+    for worker in workers:
+        worker.join()
+
+    # Both workers raced for one email; exactly one got it, and this process sees it
+    assert sorted(worker.exitcode for worker in workers) == [0, 1]
+    store = SQLiteUserStore(path)
+    assert store.get('ana@example.eu').username in ('ana0', 'ana1')
+    store.close()
@@ -6,19 +6,17 @@ from fastapi.responses import HTMLResponse
 import json
 from pathlib import Path
 
-# In-memory storage (replace with database)
-user_favorites = {}
-user_preferences = {}
-
 class UserDashboard:
     """Manage user personal dashboards and favorites"""
     
     @staticmethod
-    def get_user_dashboard_html(user_email: str):
-        """Generate personalized dashboard for logged-in user"""
+    def get_user_dashboard_html(user_email: str, favorites=()):
+        """
+        Generate personalized dashboard for logged-in user
         
-        favorites = user_favorites.get(user_email, [])
-        prefs = user_preferences.get(user_email, {})
+        Args:
+            favorites: The user's saved tenders (storage.favorites)
+        """
         
         html = f'''
         <!DOCTYPE html>
@@ -462,29 +460,3 @@ class UserDashboard:
             '''
         
         return html
-
-# API endpoints for favorites
-def add_favorite(user_email: str, tender_data: dict):
-    """Add tender to user favorites"""
-    if user_email not in user_favorites:
-        user_favorites[user_email] = []
-    
-    # Check if already exists
-    if not any(f['id'] == tender_data['id'] for f in user_favorites[user_email]):
-        user_favorites[user_email].append(tender_data)
-        return True
-    return False
-
-def remove_favorite(user_email: str, tender_id: str):
-    """Remove tender from favorites"""
-    if user_email in user_favorites:
-        user_favorites[user_email] = [
-            f for f in user_favorites[user_email] 
-            if f['id'] != tender_id
-        ]
-        return True
-    return False
-
-def get_favorites(user_email: str):
-    """Get user's favorites"""
-    return user_favorites.get(user_email, [])